@@ -19,10 +19,7 @@ import json
 from webob import Response
 
 from ryu.base import app_manager
-from ryu.controller import ofp_event
 from ryu.controller import dpset
-from ryu.controller.handler import MAIN_DISPATCHER
-from ryu.controller.handler import set_ev_cls
 from ryu.ofproto import ofproto_v1_0
 from ryu.ofproto import ofproto_v1_3
 from ryu.lib import ofctl_v1_0
@@ -48,6 +45,12 @@ LOG = logging.getLogger('ryu.app.ofctl_rest')
 # get ports stats of the switch
 # GET /stats/port/<dpid>
 #
+# get groups stats of the switch (OpenFlow 1.3 only)
+# GET /stats/group/<dpid>
+#
+# the flows, ports and groups stats of an OpenFlow 1.3 switch are sent
+# as they are received from the switch.
+#
 ## Update the switch stats
 #
 # add a flow entry
@@ -64,11 +67,21 @@ LOG = logging.getLogger('ryu.app.ofctl_rest')
 #
 
 
+def _stream_json(dpid, entries):
+    # yield the json of {"<dpid>": [entry, ...]} an entry at a time, so
+    # that the stats of a large switch are never in memory at once
+    yield '{%s: [' % json.dumps(str(dpid))
+    sep = ''
+    for entry in entries:
+        yield sep + json.dumps(entry)
+        sep = ', '
+    yield ']}'
+
+
 class StatsController(ControllerBase):
     def __init__(self, req, link, data, **config):
         super(StatsController, self).__init__(req, link, data, **config)
         self.dpset = data['dpset']
-        self.waiters = data['waiters']
 
     def get_dpids(self, req, **_kwargs):
         dps = self.dpset.dps.keys()
@@ -81,9 +94,9 @@ class StatsController(ControllerBase):
             return Response(status=404)
 
         if dp.ofproto.OFP_VERSION == ofproto_v1_0.OFP_VERSION:
-            desc = ofctl_v1_0.get_desc_stats(dp, self.waiters)
+            desc = ofctl_v1_0.get_desc_stats(dp)
         elif dp.ofproto.OFP_VERSION == ofproto_v1_3.OFP_VERSION:
-            desc = ofctl_v1_3.get_desc_stats(dp, self.waiters)
+            desc = ofctl_v1_3.get_desc_stats(dp)
         else:
             LOG.debug('Unsupported OF protocol')
             return Response(status=501)
@@ -97,9 +110,11 @@ class StatsController(ControllerBase):
             return Response(status=404)
 
         if dp.ofproto.OFP_VERSION == ofproto_v1_0.OFP_VERSION:
-            flows = ofctl_v1_0.get_flow_stats(dp, self.waiters)
+            flows = ofctl_v1_0.get_flow_stats(dp)
         elif dp.ofproto.OFP_VERSION == ofproto_v1_3.OFP_VERSION:
-            flows = ofctl_v1_3.get_flow_stats(dp, self.waiters)
+            flows = ofctl_v1_3.iter_flow_stats(dp)
+            return Response(content_type='application/json',
+                            app_iter=_stream_json(dp.id, flows))
         else:
             LOG.debug('Unsupported OF protocol')
             return Response(status=501)
@@ -113,9 +128,11 @@ class StatsController(ControllerBase):
             return Response(status=404)
 
         if dp.ofproto.OFP_VERSION == ofproto_v1_0.OFP_VERSION:
-            ports = ofctl_v1_0.get_port_stats(dp, self.waiters)
+            ports = ofctl_v1_0.get_port_stats(dp)
         elif dp.ofproto.OFP_VERSION == ofproto_v1_3.OFP_VERSION:
-            ports = ofctl_v1_3.get_port_stats(dp, self.waiters)
+            ports = ofctl_v1_3.iter_port_stats(dp)
+            return Response(content_type='application/json',
+                            app_iter=_stream_json(dp.id, ports))
         else:
             LOG.debug('Unsupported OF protocol')
             return Response(status=501)
@@ -123,6 +140,20 @@ class StatsController(ControllerBase):
         body = json.dumps(ports)
         return (Response(content_type='application/json', body=body))
 
+    def get_group_stats(self, req, dpid, **_kwargs):
+        dp = self.dpset.get(int(dpid))
+        if dp is None:
+            return Response(status=404)
+
+        if dp.ofproto.OFP_VERSION == ofproto_v1_3.OFP_VERSION:
+            groups = ofctl_v1_3.iter_group_stats(dp)
+        else:
+            LOG.debug('Unsupported OF protocol')
+            return Response(status=501)
+
+        return Response(content_type='application/json',
+                        app_iter=_stream_json(dp.id, groups))
+
     def mod_flow_entry(self, req, cmd, **_kwargs):
         try:
             flow = eval(req.body)
@@ -182,10 +213,8 @@ class RestStatsApi(app_manager.RyuApp):
         super(RestStatsApi, self).__init__(*args, **kwargs)
         self.dpset = kwargs['dpset']
         wsgi = kwargs['wsgi']
-        self.waiters = {}
         self.data = {}
         self.data['dpset'] = self.dpset
-        self.data['waiters'] = self.waiters
         mapper = wsgi.mapper
 
         wsgi.registory['StatsController'] = self.data
@@ -210,6 +239,11 @@ class RestStatsApi(app_manager.RyuApp):
                        controller=StatsController, action='get_port_stats',
                        conditions=dict(method=['GET']))
 
+        uri = path + '/group/{dpid}'
+        mapper.connect('stats', uri,
+                       controller=StatsController, action='get_group_stats',
+                       conditions=dict(method=['GET']))
+
         uri = path + '/flowentry/{cmd}'
         mapper.connect('stats', uri,
                        controller=StatsController, action='mod_flow_entry',
@@ -219,37 +253,3 @@ class RestStatsApi(app_manager.RyuApp):
         mapper.connect('stats', uri,
                        controller=StatsController, action='delete_flow_entry',
                        conditions=dict(method=['DELETE']))
-
-    def stats_reply_handler(self, ev):
-        msg = ev.msg
-        dp = msg.datapath
-
-        if dp.id not in self.waiters:
-            return
-        if msg.xid not in self.waiters[dp.id]:
-            return
-        lock, msgs = self.waiters[dp.id][msg.xid]
-        msgs.append(msg)
-
-        flags = 0
-        if dp.ofproto.OFP_VERSION == ofproto_v1_0.OFP_VERSION:
-            flags = dp.ofproto.OFPSF_REPLY_MORE
-        elif dp.ofproto.OFP_VERSION == ofproto_v1_3.OFP_VERSION:
-            flags = dp.ofproto.OFPMPF_REPLY_MORE
-
-        if msg.flags & flags:
-            return
-        del self.waiters[dp.id][msg.xid]
-        lock.set()
-
-    @set_ev_cls(ofp_event.EventOFPDescStatsReply, MAIN_DISPATCHER)
-    def desc_stats_reply_handler(self, ev):
-        self.stats_reply_handler(ev)
-
-    @set_ev_cls(ofp_event.EventOFPFlowStatsReply, MAIN_DISPATCHER)
-    def flow_stats_reply_handler(self, ev):
-        self.stats_reply_handler(ev)
-
-    @set_ev_cls(ofp_event.EventOFPPortStatsReply, MAIN_DISPATCHER)
-    def port_stats_reply_handler(self, ev):
-        self.stats_reply_handler(ev)
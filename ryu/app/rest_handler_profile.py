@@ -0,0 +1,99 @@
+# Copyright (C) 2013 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from webob import Response
+
+from ryu.app.wsgi import ControllerBase, WSGIApplication
+from ryu.base import app_manager
+
+# REST API for the latency profile of the event handlers
+#
+# get the profiles of all the applications
+# GET /v1.0/profiler/handlers
+#
+# get the profile of the application
+# GET /v1.0/profiler/handlers/<app>
+#
+# enable or disable profiling of all the applications
+# PUT /v1.0/profiler/handlers
+#
+# enable or disable profiling of the application
+# PUT /v1.0/profiler/handlers/<app>
+#
+# where
+# <app>: application name
+#
+# the body of PUT is {"enabled": true} or {"enabled": false}
+
+
+class HandlerProfileController(ControllerBase):
+    def _bricks(self, kwargs):
+        if 'app' not in kwargs:
+            return app_manager.SERVICE_BRICKS.items()
+        brick = app_manager.lookup_service_brick(kwargs['app'])
+        if brick is None:
+            return None
+        return [(kwargs['app'], brick)]
+
+    def get_profile(self, req, **kwargs):
+        bricks = self._bricks(kwargs)
+        if bricks is None:
+            return Response(status=404)
+        body = json.dumps(dict((name, brick.get_handler_stats())
+                               for name, brick in bricks))
+        return Response(content_type='application/json', body=body)
+
+    def set_profile(self, req, **kwargs):
+        bricks = self._bricks(kwargs)
+        if bricks is None:
+            return Response(status=404)
+        try:
+            enabled = json.loads(req.body)['enabled']
+        except (ValueError, KeyError, TypeError):
+            return Response(status=400)
+        for _name, brick in bricks:
+            brick.set_handler_profile(bool(enabled))
+        return Response(status=200)
+
+
+class HandlerProfileAPI(app_manager.RyuApp):
+    _CONTEXTS = {
+        'wsgi': WSGIApplication
+    }
+
+    def __init__(self, *args, **kwargs):
+        super(HandlerProfileAPI, self).__init__(*args, **kwargs)
+        wsgi = kwargs['wsgi']
+        mapper = wsgi.mapper
+
+        controller = HandlerProfileController
+        route_name = 'handler_profile'
+
+        uri = '/v1.0/profiler/handlers'
+        mapper.connect(route_name, uri, controller=controller,
+                       action='get_profile',
+                       conditions=dict(method=['GET']))
+        mapper.connect(route_name, uri, controller=controller,
+                       action='set_profile',
+                       conditions=dict(method=['PUT']))
+
+        uri = '/v1.0/profiler/handlers/{app}'
+        mapper.connect(route_name, uri, controller=controller,
+                       action='get_profile',
+                       conditions=dict(method=['GET']))
+        mapper.connect(route_name, uri, controller=controller,
+                       action='set_profile',
+                       conditions=dict(method=['PUT']))
@@ -23,7 +23,6 @@ from ryu.controller.handler import MAIN_DISPATCHER
 from ryu.controller.handler import set_ev_cls
 from ryu.ofproto import ofproto_v1_0
 from ryu.lib.mac import haddr_to_bin
-from ryu.lib.packet import packet
 from ryu.lib.packet import ethernet
 
 
@@ -53,7 +52,7 @@ class SimpleSwitch(app_manager.RyuApp):
         datapath = msg.datapath
         ofproto = datapath.ofproto
 
-        pkt = packet.Packet(msg.data)
+        pkt = ev.packet
         eth = pkt.get_protocol(ethernet.ethernet)
 
         dst = eth.dst
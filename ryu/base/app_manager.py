@@ -14,22 +14,67 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
 import inspect
 import itertools
 import logging
 import sys
+import time
+
+from oslo.config import cfg
 
 from ryu import utils
 from ryu.controller.handler import register_instance, get_dependent_services
 from ryu.controller.controller import Datapath
 from ryu.controller import event
+from ryu.controller import ofp_event
 from ryu.controller.event import EventRequestBase, EventReplyBase
 from ryu.lib import hub
+from ryu.lib.handler_profiler import HandlerProfiler
 
 LOG = logging.getLogger('ryu.base.app_manager')
 
+CONF = cfg.CONF
+CONF.register_cli_opts([
+    cfg.IntOpt('app-event-queue-size', default=128,
+               help='max number of events queued for an application'),
+    cfg.StrOpt('app-event-queue-policy', default='block',
+               help='what to do when the event queue of an application is '
+                    'full: block, drop-new or drop-oldest'),
+    cfg.BoolOpt('handler-profile', default=False,
+                help='profile the latency of the event handlers'),
+    cfg.FloatOpt('handler-slow-threshold', default=0.1,
+                 help='log the event handlers taking longer than this '
+                      'seconds while profiling (0 to disable)'),
+    cfg.ListOpt('remote-apps', default=[],
+                help='application module names, among the ones to run, to run '
+                     'in child processes'),
+])
+
 SERVICE_BRICKS = {}
 
+# priorities of the events in the event queue of an application.
+# the events of a higher priority are handled first.
+EVENT_PRIORITY_HIGH = 0
+EVENT_PRIORITY_NORMAL = 1
+EVENT_PRIORITY_LOW = 2
+_EVENT_PRIORITY_NUM = 3
+
+# the priorities of the events for which an application doesn't specify
+# one.  a change of the state of datapaths and ports can invalidate the
+# packet-ins queued before it, so it goes first.
+DEFAULT_EVENT_PRIORITIES = {
+    ofp_event.EventOFPStateChange: EVENT_PRIORITY_HIGH,
+    ofp_event.EventOFPPortStatus: EVENT_PRIORITY_HIGH,
+    ofp_event.EventOFPPacketIn: EVENT_PRIORITY_LOW,
+}
+
+EVENT_QUEUE_BLOCK = 'block'              # wait until the queue has room
+EVENT_QUEUE_DROP_NEW = 'drop-new'        # discard the event being sent
+EVENT_QUEUE_DROP_OLDEST = 'drop-oldest'  # discard the oldest queued event
+EVENT_QUEUE_POLICIES = [EVENT_QUEUE_BLOCK, EVENT_QUEUE_DROP_NEW,
+                        EVENT_QUEUE_DROP_OLDEST]
+
 
 def lookup_service_brick(name):
     return SERVICE_BRICKS.get(name)
@@ -40,18 +85,134 @@ def register_app(app):
     assert not app.name in SERVICE_BRICKS
     SERVICE_BRICKS[app.name] = app
     register_instance(app)
+    _flush_observer_bricks()
 
 
 def unregister_app(app):
     SERVICE_BRICKS.pop(app.name)
+    _flush_observer_bricks()
+
+
+def get_handler_stats():
+    """
+    Return a dict of application name -> the handler latency profile of
+    the application.  See RyuApp.get_handler_stats().
+    """
+    return dict((name, brick.get_handler_stats())
+                for name, brick in SERVICE_BRICKS.items())
+
+
+def _flush_observer_bricks():
+    # the observer tables refer to the bricks directly
+    for brick in SERVICE_BRICKS.values():
+        brick._observer_bricks_table.clear()
+
+
+class EventQueue(object):
+    """
+    Bounded queue of (event, state, enqueued time) of an application,
+    which returns the events of a higher priority first and the events
+    of the same priority in the order they are put.
+    """
+
+    def __init__(self, maxsize):
+        super(EventQueue, self).__init__()
+        assert maxsize > 0
+        self.maxsize = maxsize
+        self.queues = [collections.deque()
+                       for _i in range(_EVENT_PRIORITY_NUM)]
+        self.size = 0
+        self._not_empty = hub.Event()
+        self._not_full = hub.Event()
+
+    def qsize(self):
+        return self.size
+
+    def empty(self):
+        return self.size == 0
+
+    def full(self):
+        return self.size >= self.maxsize
+
+    def put(self, item, priority=EVENT_PRIORITY_NORMAL,
+            policy=EVENT_QUEUE_BLOCK):
+        """
+        Queue an item.  If the queue is full, the policy decides what
+        happens.  Return the item which is discarded, or None.
+
+        drop-oldest discards the oldest item of the lowest priority which
+        isn't higher than the one of the new item.  If there isn't such
+        an item, the new one is discarded.
+        """
+        while self.full():
+            if policy == EVENT_QUEUE_DROP_NEW:
+                return item
+            elif policy == EVENT_QUEUE_DROP_OLDEST:
+                for q in reversed(self.queues[priority:]):
+                    if q:
+                        self.queues[priority].append(item)
+                        return q.popleft()
+                return item
+            self._not_full.clear()
+            self._not_full.wait()
+
+        self.queues[priority].append(item)
+        self.size += 1
+        if self.size == 1:
+            self._not_empty.set()
+        return None
+
+    def get(self):
+        while not self.size:
+            self._not_empty.clear()
+            self._not_empty.wait()
+
+        for q in self.queues:
+            if q:
+                item = q.popleft()
+                break
+        self.size -= 1
+        if self.size == self.maxsize - 1:
+            self._not_full.set()
+        return item
 
 
 class RyuApp(object):
     """
     Base class for Ryu network application
+
+    The events sent to an application are queued until its event loop
+    handles them.  The following class attributes can override how the
+    queue treats them.  Both are keyed on event classes, and an entry
+    applies to the subclasses of its event class too.
+
+    ===================== ===============================================
+    Attribute             Description
+    ===================== ===============================================
+    _EVENT_QUEUE_SIZE     Max number of events in the queue.  Defaults
+                          to CONF.app_event_queue_size.
+    _EVENT_PRIORITIES     Event class -> EVENT_PRIORITY_*.
+                          DEFAULT_EVENT_PRIORITIES applies to the event
+                          classes which aren't listed, and
+                          EVENT_PRIORITY_NORMAL to the rest.
+    _EVENT_QUEUE_POLICIES Event class -> EVENT_QUEUE_* applied when the
+                          queue is full.  Defaults to
+                          CONF.app_event_queue_policy.
+    ===================== ===============================================
+
+    By default a single greenthread runs all the handlers of an
+    application in the order of the events.  An application which sets
+    _EVENT_WORKERS to N > 0 gets N worker greenthreads instead, and
+    event_partition_key() decides which worker handles an event.  The
+    events of the same key are handled in order, and the events of
+    different keys can be handled concurrently.
     """
     _CONTEXTS = {}
     _EVENTS = []  # list of events to be generated in app
+    _EVENT_QUEUE_SIZE = None
+    _EVENT_PRIORITIES = {}
+    _EVENT_QUEUE_POLICIES = {}
+    _EVENT_WORKERS = 0
 
     @classmethod
     def context_iteritems(cls):
@@ -65,10 +226,27 @@ class RyuApp(object):
         self.name = self.__class__.__name__
         self.event_handlers = {}        # ev_cls -> handlers:list
         self.observers = {}     # ev_cls -> observer-name -> states:set
+        # dispatch tables compiled from the above on demand.
+        # they are flushed whenever handlers or observers change.
+        # (ev_cls, state) -> (handlers:list, filtered:bool, ev_filter)
+        self._handlers_table = {}
+        self._observers_table = {}  # (ev_cls, state) -> observer-names:list
+        # (ev_cls, state) -> (brick, ev_filter):list
+        self._observer_bricks_table = {}
+        self._event_queue_table = {}  # ev_cls -> (priority, policy)
         self.threads = []
-        self.events = hub.Queue(128)
-        self.replies = hub.Queue()
+        self.events = EventQueue(self._EVENT_QUEUE_SIZE or
+                                 CONF.app_event_queue_size)
+        self.events_dropped = {}  # ev_cls name -> number of dropped events
+        self._worker_queues = [hub.Queue(self.events.maxsize)
+                               for _i in range(self._EVENT_WORKERS)]
+        self.requests = {}  # req_id -> hub.AsyncResult
+        self._request_timers = {}  # req_id -> timeout timer
+        self._req_ids = itertools.count(1)
         self.logger = logging.getLogger(self.name)
+        self.profiler = HandlerProfiler(self.name,
+                                        CONF.handler_slow_threshold)
+        self.profiler.enabled = CONF.handler_profile
 
         # prevent accidental creation of instances of this class outside RyuApp
         class _EventThreadStop(event.EventBase):
@@ -80,87 +258,303 @@ class RyuApp(object):
         """
         Hook that is called after startup initialization is done.
         """
+        for q in self._worker_queues:
+            self.threads.append(hub.spawn(self._event_worker, q))
         self.threads.append(hub.spawn(self._event_loop))
 
     def stop(self):
         self.is_active = False
-        self._send_event(self._event_stop, None)
+        self.events.put((self._event_stop, None, None), EVENT_PRIORITY_LOW)
         hub.joinall(self.threads)
 
+    def _event_queue_params(self, ev_cls):
+        params = self._event_queue_table.get(ev_cls)
+        if params is None:
+            priority = EVENT_PRIORITY_NORMAL
+            policy = CONF.app_event_queue_policy
+            for cls in reversed(ev_cls.__mro__):
+                priority = DEFAULT_EVENT_PRIORITIES.get(cls, priority)
+                priority = self._EVENT_PRIORITIES.get(cls, priority)
+                policy = self._EVENT_QUEUE_POLICIES.get(cls, policy)
+            assert policy in EVENT_QUEUE_POLICIES, \
+                'unknown event queue policy %s' % policy
+            params = (priority, policy)
+            self._event_queue_table[ev_cls] = params
+        return params
+
+    def get_event_queue_stats(self):
+        """
+        Return a dict of the statistics of the event queue.
+
+        ======= ===========================================================
+        Key     Description
+        ======= ===========================================================
+        qsize   Number of the queued events
+        maxsize Max number of the queued events
+        dropped Dict of event class name -> number of the dropped events
+        ======= ===========================================================
+        """
+        return {
+            'qsize': self.events.qsize(),
+            'maxsize': self.events.maxsize,
+            'dropped': dict(self.events_dropped),
+        }
+
+    def get_handler_stats(self):
+        """
+        Return a dict of the handler latency profile.  The latencies are
+        in seconds and the histograms count them in the buckets of
+        ryu.lib.handler_profiler.LATENCY_BUCKETS.
+
+        =========== =======================================================
+        Key         Description
+        =========== =======================================================
+        enabled     True if profiling is enabled
+        handlers    Dict of handler name -> latency of the handler
+        queue_waits Dict of event class name -> time from enqueue to
+                    dispatch
+        =========== =======================================================
+        """
+        return self.profiler.to_dict()
+
+    def set_handler_profile(self, enabled):
+        """
+        Enable or disable profiling of the handlers.  The collected
+        profile is reset on enabling.
+        """
+        if enabled and not self.profiler.enabled:
+            self.profiler.reset()
+        self.profiler.enabled = enabled
+
     def register_handler(self, ev_cls, handler):
         assert callable(handler)
         self.event_handlers.setdefault(ev_cls, [])
         self.event_handlers[ev_cls].append(handler)
+        self._handlers_table.clear()
+        # the event filters of this app are compiled into the tables of
+        # the senders
+        _flush_observer_bricks()
 
     def register_observer(self, ev_cls, name, states=None):
         states = states or set()
         ev_cls_observers = self.observers.setdefault(ev_cls, {})
         ev_cls_observers.setdefault(name, set()).update(states)
+        self._flush_observers_table()
 
     def unregister_observer(self, ev_cls, name):
         observers = self.observers.get(ev_cls, {})
         observers.pop(name)
+        self._flush_observers_table()
 
     def unregister_observer_all_event(self, name):
         for observers in self.observers.values():
             observers.pop(name, None)
+        self._flush_observers_table()
+
+    def _flush_observers_table(self):
+        self._observers_table.clear()
+        self._observer_bricks_table.clear()
+
+    def _get_handlers_entry(self, ev_cls, state):
+        key = (ev_cls, state)
+        entry = self._handlers_table.get(key)
+        if entry is None:
+            handlers = self.event_handlers.get(ev_cls, [])
+            if state is not None:
+                handlers = [handler for handler in handlers
+                            if not handler.dispatchers or
+                            state in handler.dispatchers]
+            filters = [getattr(handler, 'ev_filter', None)
+                       for handler in handlers]
+            filtered = any(filters)
+            if not filters or None in filters:
+                # some handler takes every event
+                ev_filter = None
+            elif len(filters) == 1:
+                ev_filter = filters[0]
+            else:
+                ev_filter = lambda ev: any(f(ev) for f in filters)
+            entry = (handlers, filtered, ev_filter)
+            self._handlers_table[key] = entry
+        return entry
 
     def get_handlers(self, ev, state=None):
-        handlers = self.event_handlers.get(ev.__class__, [])
-        if state is None:
+        handlers, filtered, _ev_filter = self._get_handlers_entry(
+            ev.__class__, state)
+        if not filtered:
             return handlers
-
         return [handler for handler in handlers
-                if not handler.dispatchers or state in handler.dispatchers]
+                if getattr(handler, 'ev_filter', None) is None or
+                handler.ev_filter(ev)]
 
-    def get_observers(self, ev, state):
-        observers = []
-        for k, v in self.observers.get(ev.__class__, {}).iteritems():
-            if not state or not v or state in v:
-                observers.append(k)
+    def get_event_filter(self, ev_cls, state=None):
+        """
+        Return the predicate of the events of ev_cls which any handler of
+        this app takes in state, or None if some handler takes all.
+        """
+        return self._get_handlers_entry(ev_cls, state)[2]
 
-        return observers
+    def get_observers(self, ev, state):
+        key = (ev.__class__, state)
+        table = self._observers_table.get(key)
+        if table is None:
+            table = []
+            for k, v in self.observers.get(ev.__class__, {}).iteritems():
+                if not state or not v or state in v:
+                    table.append(k)
+            self._observers_table[key] = table
+        return table
 
     def send_reply(self, rep):
         assert isinstance(rep, EventReplyBase)
-        SERVICE_BRICKS[rep.dst].replies.put(rep)
+        brick = SERVICE_BRICKS.get(rep.dst)
+        future = brick and brick._pop_request(rep.req_id)
+        if future is None:
+            # the requester has gone or given up
+            LOG.debug("REPLY LOST %s->%s %s",
+                      self.name, rep.dst, rep.__class__.__name__)
+            return
+        future.set(rep)
+
+    def _pop_request(self, req_id):
+        # forget the request and cancel its timeout.
+        # returns None if it has already gone.
+        timer = self._request_timers.pop(req_id, None)
+        if timer is not None:
+            timer.cancel()
+        return self.requests.pop(req_id, None)
+
+    def send_request_async(self, req, timeout=None):
+        """
+        Send a request and return a hub.AsyncResult which is set to the
+        reply.  If the reply doesn't arrive in ``timeout`` seconds, the
+        future fails with hub.Timeout.
 
-    def send_request(self, req):
+        Each request gets its own id and future, so any number of
+        requests can be outstanding at once.
+        """
         assert isinstance(req, EventRequestBase)
         req.sync = True
-        self.send_event(req.dst, req)
-        # going to sleep for the reply
-        return self.replies.get()
+        req.req_id = next(self._req_ids)
+        future = hub.AsyncResult()
+        self.requests[req.req_id] = future
+        if timeout is not None:
+            def _expire():
+                self._request_timers.pop(req.req_id, None)
+                if self.requests.pop(req.req_id, None) is future:
+                    future.set_exception(hub.Timeout())
+            self._request_timers[req.req_id] = hub.call_after(timeout,
+                                                              _expire)
+        try:
+            self.send_event(req.dst, req)
+        except:
+            self._pop_request(req.req_id)
+            raise
+        return future
+
+    def send_request(self, req, timeout=None):
+        """
+        Send a request and wait for its reply.  See send_request_async().
+        """
+        return self.send_request_async(req, timeout).get()
+
+    def event_partition_key(self, ev):
+        """
+        Return the key which decides the worker handling ev when
+        _EVENT_WORKERS is set.  Defaults to the datapath id of the event,
+        or None for the events which aren't bound to a datapath.
+        """
+        datapath = getattr(ev, 'datapath', None)
+        if datapath is None:
+            datapath = getattr(getattr(ev, 'msg', None), 'datapath', None)
+        return getattr(datapath, 'id', None)
+
+    def _handle_event(self, ev, state, enqueued):
+        handlers = self.get_handlers(ev, state)
+        profiler = self.profiler
+        if not profiler.enabled:
+            for handler in handlers:
+                handler(ev)
+            return
+
+        if enqueued is not None:
+            profiler.queue_wait(ev, enqueued)
+        for handler in handlers:
+            profiler.call(handler, ev)
 
     def _event_loop(self):
+        workers = self._worker_queues
         while self.is_active or not self.events.empty():
-            ev, state = self.events.get()
+            item = self.events.get()
+            ev = item[0]
             if ev == self._event_stop:
                 continue
-            handlers = self.get_handlers(ev, state)
-            for handler in handlers:
-                handler(ev)
+            if workers:
+                key = self.event_partition_key(ev)
+                workers[hash(key) % len(workers)].put(item)
+            else:
+                self._handle_event(*item)
+
+        # let the workers finish the events queued to them
+        for q in workers:
+            q.put((self._event_stop, None, None))
+
+    def _event_worker(self, q):
+        while True:
+            item = q.get()
+            if item[0] == self._event_stop:
+                break
+            self._handle_event(*item)
 
     def _send_event(self, ev, state):
-        self.events.put((ev, state))
+        priority, policy = self._event_queue_params(ev.__class__)
+        enqueued = time.time() if self.profiler.enabled else None
+        dropped = self.events.put((ev, state, enqueued), priority, policy)
+        if dropped is not None:
+            name = dropped[0].__class__.__name__
+            self.events_dropped[name] = self.events_dropped.get(name, 0) + 1
+            LOG.debug("EVENT DROPPED %s %s", self.name, name)
 
     def send_event(self, name, ev, state=None):
         if name in SERVICE_BRICKS:
             if isinstance(ev, EventRequestBase):
                 ev.src = self.name
-            LOG.debug("EVENT %s->%s %s" %
-                      (self.name, name, ev.__class__.__name__))
+            LOG.debug("EVENT %s->%s %s",
+                      self.name, name, ev.__class__.__name__)
             SERVICE_BRICKS[name]._send_event(ev, state)
         else:
-            LOG.debug("EVENT LOST %s->%s %s" %
-                      (self.name, name, ev.__class__.__name__))
+            LOG.debug("EVENT LOST %s->%s %s",
+                      self.name, name, ev.__class__.__name__)
 
     def send_event_to_observers(self, ev, state=None):
-        for observer in self.get_observers(ev, state):
-            self.send_event(observer, ev, state)
+        key = (ev.__class__, state)
+        bricks = self._observer_bricks_table.get(key)
+        if bricks is None:
+            bricks = []
+            for observer in self.get_observers(ev, state):
+                if observer in SERVICE_BRICKS:
+                    brick = SERVICE_BRICKS[observer]
+                    bricks.append(
+                        (brick, brick.get_event_filter(ev.__class__, state)))
+                else:
+                    LOG.debug("EVENT LOST %s->%s %s",
+                              self.name, observer, ev.__class__.__name__)
+            self._observer_bricks_table[key] = bricks
+
+        if isinstance(ev, EventRequestBase):
+            ev.src = self.name
+        debug = LOG.isEnabledFor(logging.DEBUG)
+        for brick, ev_filter in bricks:
+            if ev_filter is not None and not ev_filter(ev):
+                continue
+            if debug:
+                LOG.debug("EVENT %s->%s %s",
+                          self.name, brick.name, ev.__class__.__name__)
+            brick._send_event(ev, state)
 
     def reply_to_request(self, req, rep):
         rep.dst = req.src
+        rep.req_id = req.req_id
         if req.sync:
             self.send_reply(rep)
         else:
@@ -211,7 +605,13 @@ class AppManager(object):
             if cls is None:
                 continue
 
-            self.applications_cls[app_cls_name] = cls
+            if app_cls_name in CONF.remote_apps:
+                # imported here as it depends on this module
+                from ryu.base import remote_app
+                self.applications_cls[app_cls_name] = \
+                    remote_app.remote_app_cls(app_cls_name, cls)
+            else:
+                self.applications_cls[app_cls_name] = cls
 
             services = []
             for key, context_cls in cls.context_iteritems():
@@ -238,8 +638,15 @@ class AppManager(object):
         return self.contexts
 
     def _update_bricks(self):
+        # ev_cls -> bricks listing it in _EVENTS
+        providers = {}
+        for brick in SERVICE_BRICKS.values():
+            for ev_cls in brick._EVENTS:
+                providers.setdefault(ev_cls, []).append(brick)
+
         for i in SERVICE_BRICKS.values():
-            for _k, m in inspect.getmembers(i, inspect.ismethod):
+            for m in itertools.chain.from_iterable(
+                    i.event_handlers.values()):
                 if not hasattr(m, 'observer'):
                     continue
 
@@ -250,10 +657,8 @@ class AppManager(object):
                     brick.register_observer(m.ev_cls, i.name, m.dispatchers)
 
                 # allow RyuApp and Event class are in different module
-                for brick in SERVICE_BRICKS.itervalues():
-                    if m.ev_cls in brick._EVENTS:
-                        brick.register_observer(m.ev_cls, i.name,
-                                                m.dispatchers)
+                for brick in providers.get(m.ev_cls, []):
+                    brick.register_observer(m.ev_cls, i.name, m.dispatchers)
 
     @staticmethod
     def _report_brick(name, app):
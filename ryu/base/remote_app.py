@@ -0,0 +1,388 @@
+# Copyright (C) 2013 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Run RyuApps in child processes.
+
+The parent process runs a RemoteApp in place of the application.  It
+subscribes to the same events as the application, so only the events
+the application handles cross the process boundary, and forwards them
+to the child over a socket pair in msgpack-rpc notifications.  The
+child process runs the application itself and sends its send_msg(),
+send_event(), send_event_to_observers() and send_reply() back to the
+parent in the same way.
+
+OpenFlow message events are sent as the raw messages and parsed again
+in the child.  The other events are pickled, and the datapaths they
+refer to are replaced with DatapathProxy in the child.  The modules
+they refer to, e.g. the ofproto module of a topology Port, are pickled
+by name.  An event which can't be pickled isn't sent to the child.
+
+The synchronous requests of the child, e.g. send_request(), are sent
+to the parent as events and the parent sends the replies back.
+
+The applications run in child processes can't have _CONTEXTS.
+"""
+
+import cPickle
+import cStringIO
+import inspect
+import logging
+import socket
+import subprocess
+import sys
+import types
+
+from oslo.config import cfg
+
+from ryu import ofproto
+from ryu import utils
+from ryu.base import app_manager
+from ryu.controller import event
+from ryu.controller import handler
+from ryu.controller import ofp_event
+from ryu.controller.controller import Datapath
+from ryu.lib import hub
+from ryu.lib import rpc
+from ryu.ofproto import ofproto_parser
+
+LOG = logging.getLogger('ryu.base.remote_app')
+
+CONF = cfg.CONF
+
+# notifications from the parent to the child
+_OFP_EVENT = 'ofp_event'
+_STATE_CHANGE = 'state_change'
+_EVENT = 'event'
+_REPLY = 'reply'
+# notifications from the child to the parent
+_SEND_MSG = 'send_msg'
+_SEND_EVENT = 'send_event'
+_SEND_EVENT_TO_OBSERVERS = 'send_event_to_observers'
+_SEND_REPLY = 'send_reply'
+
+_RECV_SIZE = 64 * 1024
+
+
+class DatapathProxy(object):
+    """
+    A datapath of the parent process seen from a child process.
+    """
+
+    def __init__(self, channel, dpid, version):
+        super(DatapathProxy, self).__init__()
+        self.channel = channel
+        self.id = dpid
+        self.ofproto, self.ofproto_parser = ofproto.get_ofp_module(version)
+        self.state = None
+        self.xid = 0
+
+    def set_xid(self, msg):
+        self.xid += 1
+        self.xid &= self.ofproto.MAX_XID
+        msg.set_xid(self.xid)
+        return self.xid
+
+    def send_msg(self, msg):
+        assert isinstance(msg, self.ofproto_parser.MsgBase)
+        if msg.xid is None:
+            self.set_xid(msg)
+        msg.serialize()
+        self.channel.notify(_SEND_MSG, [self.id, str(msg.buf)])
+
+
+class _Channel(object):
+    """
+    msgpack-rpc notifications over a socket.  The datapaths which the
+    events sent or received refer to are kept in datapaths, and
+    *make_datapath* creates the ones which aren't known yet.
+    """
+
+    def __init__(self, sock, dispatch, make_datapath=None):
+        super(_Channel, self).__init__()
+        self.sock = sock
+        self.dispatch = dispatch
+        self.make_datapath = make_datapath
+        self.datapaths = {}     # dpid -> Datapath or DatapathProxy
+        self.encoder = rpc.MessageEncoder()
+        self.table = {rpc.MessageType.NOTIFY: self._notified}
+
+    def notify(self, method, params):
+        self.sock.sendall(self.encoder.create_notification(method, params))
+
+    def serve(self):
+        while True:
+            data = self.sock.recv(_RECV_SIZE)
+            if not data:
+                break
+            self.encoder.get_and_dispatch_messages(data, self.table)
+
+    def _notified(self, m):
+        method, params = m
+        try:
+            self.dispatch(method, params)
+        except Exception:
+            LOG.exception('failed to handle %s', method)
+
+    def datapath(self, dpid, version):
+        dp = self.datapaths.get(dpid)
+        if dp is None and self.make_datapath is not None:
+            dp = self.datapaths[dpid] = self.make_datapath(dpid, version)
+        return dp
+
+    def dumps(self, obj):
+        def persistent_id(obj):
+            if isinstance(obj, (Datapath, DatapathProxy)):
+                self.datapaths[obj.id] = obj
+                return 'datapath %d %d' % (obj.id, obj.ofproto.OFP_VERSION)
+            if isinstance(obj, types.ModuleType):
+                return 'module %s' % obj.__name__
+            return None
+
+        f = cStringIO.StringIO()
+        pickler = cPickle.Pickler(f, cPickle.HIGHEST_PROTOCOL)
+        pickler.persistent_id = persistent_id
+        pickler.dump(obj)
+        return f.getvalue()
+
+    def loads(self, data):
+        def persistent_load(pid):
+            kind, arg = pid.split(' ', 1)
+            if kind == 'module':
+                return utils.import_module(arg)
+            dpid, version = [int(v) for v in arg.split()]
+            return self.datapath(dpid, version)
+
+        unpickler = cPickle.Unpickler(cStringIO.StringIO(data))
+        unpickler.persistent_load = persistent_load
+        return unpickler.load()
+
+
+class _ReplyForwarder(object):
+    """
+    The stand-in in RyuApp.requests of the parent for the future of a
+    synchronous request from the child.  RyuApp.send_reply() sets it to
+    the reply, which is sent to the child.
+    """
+
+    def __init__(self, channel):
+        super(_ReplyForwarder, self).__init__()
+        self.channel = channel
+
+    def set(self, rep):
+        self.channel.notify(_REPLY, [self.channel.dumps(rep)])
+
+
+class RemoteApp(app_manager.RyuApp):
+    """
+    The stand-in in the parent process for an application running in a
+    child process.  Use remote_app_cls() to create the class for an
+    application.
+    """
+    _APP_MODULE = None
+    _APP_CLS = None
+
+    def __init__(self, *args, **kwargs):
+        super(RemoteApp, self).__init__(*args, **kwargs)
+        self.channel = None
+        self.process = None
+        for _k, m in inspect.getmembers(self._APP_CLS, inspect.ismethod):
+            if handler._is_ev_cls(m):
+                self._subscribe(m)
+
+    def _subscribe(self, method):
+        def forward(ev):
+            self._forward(ev)
+        forward.ev_cls = method.ev_cls
+        forward.dispatchers = method.dispatchers
+        # the events are filtered before they are sent to the child
+        forward.ev_filter = getattr(method, 'ev_filter', None)
+        if hasattr(method, 'observer'):
+            forward.observer = method.observer
+        self.register_handler(method.ev_cls, forward)
+
+    def start(self):
+        parent_sock, child_sock = socket.socketpair()
+        args = [sys.executable, '-m', 'ryu.cmd.remote_app',
+                '--remote-app-fd', str(child_sock.fileno())]
+        for config_file in CONF.config_file:
+            args.extend(['--config-file', config_file])
+        args.append(self._APP_MODULE)
+        self.process = subprocess.Popen(args, close_fds=False)
+        child_sock.close()
+        self.channel = _Channel(parent_sock, self._dispatch)
+        self.threads.append(hub.spawn(self._serve))
+        super(RemoteApp, self).start()
+
+    def stop(self):
+        # the channel is closed by the exit of the child
+        if self.process is not None:
+            self.process.terminate()
+            self.process.wait()
+        super(RemoteApp, self).stop()
+
+    def _serve(self):
+        self.channel.serve()
+        LOG.info('remote app %s exited', self.name)
+
+    def _forward(self, ev):
+        if isinstance(ev, ofp_event.EventOFPMsgBase):
+            msg = ev.msg
+            dp = msg.datapath
+            if dp.id is None:
+                # not in the handshake yet
+                return
+            self.channel.datapaths[dp.id] = dp
+            self.channel.notify(_OFP_EVENT,
+                                [dp.id, dp.state, msg.version,
+                                 msg.msg_type, msg.msg_len, msg.xid,
+                                 str(msg.buf)])
+        elif isinstance(ev, ofp_event.EventOFPStateChange):
+            dp = ev.datapath
+            if dp.id is None:
+                # not in the handshake yet
+                return
+            if dp.state == handler.DEAD_DISPATCHER:
+                self.channel.datapaths.pop(dp.id, None)
+            else:
+                self.channel.datapaths[dp.id] = dp
+            self.channel.notify(_STATE_CHANGE,
+                                [dp.id, dp.state, dp.ofproto.OFP_VERSION])
+        else:
+            try:
+                data = self.channel.dumps(ev)
+            except (cPickle.PicklingError, TypeError):
+                LOG.exception('%s: failed to pickle %s',
+                              self.name, ev.__class__.__name__)
+                return
+            self.channel.notify(_EVENT, [data])
+
+    def _dispatch(self, method, params):
+        if method == _SEND_MSG:
+            dpid, buf = params
+            dp = self.channel.datapaths.get(dpid)
+            if dp is None:
+                LOG.debug('%s: datapath %s is gone', self.name, dpid)
+                return
+            dp.send(buf)
+        elif method == _SEND_EVENT:
+            name, data, state = params
+            ev = self.channel.loads(data)
+            if isinstance(ev, event.EventRequestBase) and ev.sync:
+                # the child waits for the reply with the same req_id
+                self.requests[ev.req_id] = _ReplyForwarder(self.channel)
+            self.send_event(name, ev, state)
+        elif method == _SEND_EVENT_TO_OBSERVERS:
+            data, state = params
+            self.send_event_to_observers(self.channel.loads(data), state)
+        elif method == _SEND_REPLY:
+            self.send_reply(self.channel.loads(params[0]))
+
+
+def remote_app_cls(module, cls):
+    """
+    Return a RemoteApp class standing in for the application *cls*
+    loaded from *module*.
+    """
+    assert not cls._CONTEXTS, \
+        '%s with _CONTEXTS can not run in a child process' % cls.__name__
+    attrs = {
+        '_APP_MODULE': module,
+        '_APP_CLS': cls,
+        '_EVENTS': cls._EVENTS,
+    }
+    if hasattr(cls, 'OFP_VERSIONS'):
+        attrs['OFP_VERSIONS'] = cls.OFP_VERSIONS
+    return type(cls.__name__, (RemoteApp,), attrs)
+
+
+class _ChildApp(object):
+    """
+    The mixin sending the outputs of an application running in a child
+    process to its RemoteApp in the parent.
+    """
+    channel = None
+
+    def send_event(self, name, ev, state=None):
+        if name in app_manager.SERVICE_BRICKS:
+            return super(_ChildApp, self).send_event(name, ev, state)
+        if isinstance(ev, event.EventRequestBase):
+            ev.src = self.name
+        self.channel.notify(_SEND_EVENT,
+                            [name, self.channel.dumps(ev), state])
+
+    def send_event_to_observers(self, ev, state=None):
+        if isinstance(ev, event.EventRequestBase):
+            ev.src = self.name
+        self.channel.notify(_SEND_EVENT_TO_OBSERVERS,
+                            [self.channel.dumps(ev), state])
+
+    def send_reply(self, rep):
+        self.channel.notify(_SEND_REPLY, [self.channel.dumps(rep)])
+
+
+class ChildRunner(object):
+    """
+    Run an application in a child process and serve its channel to the
+    parent.
+    """
+
+    def __init__(self, sock, cls):
+        super(ChildRunner, self).__init__()
+        self.channel = _Channel(sock, self._dispatch, self._make_datapath)
+        child_cls = type(cls.__name__, (_ChildApp, cls), {})
+        self.app = app_manager.AppManager.get_instance().instantiate(
+            child_cls)
+        self.app.channel = self.channel
+
+    def run(self):
+        self.app.start()
+        try:
+            self.channel.serve()
+        finally:
+            self.app.stop()
+
+    def _make_datapath(self, dpid, version):
+        return DatapathProxy(self.channel, dpid, version)
+
+    def _dispatch(self, method, params):
+        if method == _OFP_EVENT:
+            dpid, state, version, msg_type, msg_len, xid, buf = params
+            dp = self.channel.datapath(dpid, version)
+            dp.state = state
+            msg = ofproto_parser.msg(dp, version, msg_type, msg_len, xid,
+                                     buf)
+            if msg:
+                self.app._send_event(ofp_event.ofp_msg_to_ev(msg), state)
+        elif method == _STATE_CHANGE:
+            dpid, state, version = params
+            dp = self.channel.datapath(dpid, version)
+            dp.state = state
+            if state == handler.DEAD_DISPATCHER:
+                del self.channel.datapaths[dpid]
+            ev = ofp_event.EventOFPStateChange(dp)
+            ev.state = state
+            self.app._send_event(ev, state)
+        elif method == _EVENT:
+            self.app._send_event(self.channel.loads(params[0]), None)
+        elif method == _REPLY:
+            rep = self.channel.loads(params[0])
+            future = self.app._pop_request(rep.req_id)
+            if future is None:
+                # timed out
+                LOG.debug('REPLY LOST %s %s',
+                          self.app.name, rep.__class__.__name__)
+                return
+            future.set(rep)
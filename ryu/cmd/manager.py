@@ -16,9 +16,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import contextlib
 import logging
 import os
 import sys
+import time
+
+# taken before importing ryu modules so that the startup time includes
+# importing them
+_START_TIME = time.time()
 
 from oslo.config import cfg
 
@@ -59,6 +65,13 @@ CONF.register_cli_opts([
 ])
 
 
+@contextlib.contextmanager
+def _startup_phase(phase):
+    start = time.time()
+    yield
+    LOGGER.info('startup: %s took %.3f sec', phase, time.time() - start)
+
+
 def main():
     config_file = '/usr/local/etc/ryu/ryu.conf'
     try:
@@ -69,6 +82,8 @@ def main():
 
     log.init_log()
     LOGGER.info('config_file=%s', config_file)
+    LOGGER.info('startup: importing modules took %.3f sec',
+                time.time() - _START_TIME)
 
     app_lists = CONF.app_lists + CONF.app
     # keep old behaivor, run ofp if no application is specified.
@@ -76,15 +91,19 @@ def main():
         app_lists = ['ryu.controller.ofp_handler']
 
     app_mgr = AppManager.get_instance()
-    app_mgr.load_apps(app_lists)
-    contexts = app_mgr.create_contexts()
+    with _startup_phase('loading apps'):
+        app_mgr.load_apps(app_lists)
+    with _startup_phase('creating contexts'):
+        contexts = app_mgr.create_contexts()
     services = []
-    services.extend(app_mgr.instantiate_apps(**contexts))
+    with _startup_phase('instantiating apps'):
+        services.extend(app_mgr.instantiate_apps(**contexts))
 
     webapp = wsgi.start_service(app_mgr)
     if webapp:
         thr = hub.spawn(webapp)
         services.append(thr)
+    LOGGER.info('startup: total %.3f sec', time.time() - _START_TIME)
 
     try:
         hub.joinall(services)
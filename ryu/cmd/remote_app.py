@@ -0,0 +1,64 @@
+# Copyright (C) 2013 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# the child process running an application listed in --remote-apps of
+# ryu-manager.  it's started by ryu.base.remote_app.RemoteApp.
+
+import logging
+import os
+import socket
+import sys
+
+from oslo.config import cfg
+
+from ryu.lib import hub
+from ryu import log
+from ryu import version
+from ryu.base.app_manager import AppManager
+from ryu.base.remote_app import ChildRunner
+
+log.early_init_log(logging.DEBUG)
+hub.patch()
+
+LOGGER = logging.getLogger(__name__)
+
+CONF = cfg.CONF
+CONF.register_cli_opts([
+    cfg.IntOpt('remote-app-fd', default=None,
+               help='file descriptor of the socket to the parent'),
+    cfg.StrOpt('remote-app', positional=True,
+               help='application module name to run')
+])
+
+
+def main():
+    # the application is imported before the arguments are parsed, as
+    # the modules which it imports, e.g. ryu.topology.switches, may
+    # register command line options.  RemoteApp passes its module name
+    # as the last argument.
+    app = sys.argv[-1]
+    cls = AppManager.get_instance().load_app(app)
+    CONF(project='ryu', version='ryu-remote-app %s' % version)
+    log.init_log()
+
+    sock = socket.fromfd(CONF.remote_app_fd, socket.AF_UNIX,
+                         socket.SOCK_STREAM)
+    os.close(CONF.remote_app_fd)
+    LOGGER.info('running %s in process %d', app, os.getpid())
+    ChildRunner(sock, cls).run()
+
+
+if __name__ == "__main__":
+    main()
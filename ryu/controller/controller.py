@@ -22,9 +22,11 @@ from ryu.lib.hub import StreamServer
 import traceback
 import random
 import ssl
+import time
 
 import ryu.base.app_manager
 
+from ryu import exception
 from ryu.ofproto import ofproto_common
 from ryu.ofproto import ofproto_parser
 from ryu.ofproto import ofproto_v1_0
@@ -37,8 +39,11 @@ from ryu.ofproto import nx_match
 
 from ryu.controller import handler
 from ryu.controller import ofp_event
+from ryu.controller.flow_mod_cache import FlowModCache
+from ryu.controller.packet_in_coalescer import PacketInCoalescer
 
 from ryu.lib.dpid import dpid_to_str
+from ryu.lib.token_bucket import TokenBucket
 
 LOG = logging.getLogger('ryu.controller.controller')
 
@@ -51,9 +56,54 @@ CONF.register_cli_opts([
                help='openflow ssl listen port'),
     cfg.StrOpt('ctl-privkey', default=None, help='controller private key'),
     cfg.StrOpt('ctl-cert', default=None, help='controller certificate'),
-    cfg.StrOpt('ca-certs', default=None, help='CA certificates')
+    cfg.StrOpt('ca-certs', default=None, help='CA certificates'),
+    cfg.IntOpt('ofp-recv-buffer-size', default=128 * 1024,
+               help='size of the per-datapath receive buffer in bytes'),
+    cfg.IntOpt('ofp-send-batch-size', default=64 * 1024,
+               help='max bytes of queued messages written to a datapath '
+                    'in one go'),
+    cfg.IntOpt('ofp-send-queue-size', default=16,
+               help='max number of messages queued for a datapath'),
+    cfg.StrOpt('ofp-send-queue-policy', default='block',
+               help='what to do when the send queue of a datapath is full: '
+                    'block, drop-oldest or fail-fast'),
+    cfg.IntOpt('ofp-send-queue-high-watermark', default=None,
+               help='queue length at which EventOFPSendQueueCongested is '
+                    'generated (default: 3/4 of ofp-send-queue-size)'),
+    cfg.IntOpt('ofp-recv-msg-budget', default=256,
+               help='max number of messages handled for a datapath before '
+                    'yielding to the other datapaths'),
+    cfg.FloatOpt('ofp-recv-time-budget', default=0.01,
+                 help='max seconds spent on handling the messages of a '
+                      'datapath before yielding to the other datapaths'),
+    cfg.IntOpt('ofp-packet-in-rate', default=0,
+               help='max packet-ins per second accepted from a datapath '
+                    '(0: unlimited)'),
+    cfg.IntOpt('ofp-packet-in-burst', default=None,
+               help='max burst of packet-ins accepted from a datapath '
+                    '(default: ofp-packet-in-rate)'),
+    cfg.IntOpt('ofp-packet-in-port-rate', default=0,
+               help='max packet-ins per second accepted from a port of a '
+                    'datapath (0: unlimited)'),
+    cfg.IntOpt('ofp-packet-in-port-burst', default=None,
+               help='max burst of packet-ins accepted from a port of a '
+                    'datapath (default: ofp-packet-in-port-rate)'),
+    cfg.FloatOpt('ofp-packet-in-coalesce-window', default=0,
+                 help='seconds for which the table-miss packet-ins of a '
+                      'flow following the first one are held back and '
+                      'then returned to the switch (0: disabled)'),
+    cfg.IntOpt('ofp-flow-mod-cache-size', default=0,
+               help='max number of flow entries per datapath remembered '
+                    'to suppress duplicated flow mods (0: disabled)')
 ])
 
+# the policies for a full send queue
+SEND_QUEUE_BLOCK = 'block'            # wait until the queue has room
+SEND_QUEUE_DROP_OLDEST = 'drop-oldest'  # discard the oldest queued message
+SEND_QUEUE_FAIL_FAST = 'fail-fast'    # raise OFPSendQueueFull
+SEND_QUEUE_POLICIES = [SEND_QUEUE_BLOCK, SEND_QUEUE_DROP_OLDEST,
+                       SEND_QUEUE_FAIL_FAST]
+
 
 class OpenFlowController(object):
     def __init__(self):
@@ -100,6 +150,182 @@ def _deactivate(method):
     return deactivate
 
 
+class _Request(object):
+    # an outstanding request, which is in Datapath.requests under each of
+    # its xids until it's finished.  see Datapath.send_request.
+    def __init__(self, datapath):
+        self.datapath = datapath
+        self.xids = []
+        self.replies = []
+        self.future = hub.AsyncResult()
+        self.timer = None
+
+    def start(self, xids, timeout=None):
+        requests = self.datapath.requests
+        for xid in xids:
+            assert xid not in requests
+        self.xids = xids
+        for xid in xids:
+            requests[xid] = self
+        if timeout is not None:
+            self.timer = hub.call_after(timeout, self._expire)
+
+    def handle_reply(self, msg):
+        dp = self.datapath
+        if msg.msg_type == dp.ofproto.OFPT_ERROR:
+            self.finish(exception.OFPRequestError(
+                dpid=dp.id, xid=msg.xid, type=msg.type, code=msg.code,
+                error=msg))
+            return
+
+        self.replies.append(msg)
+        msg_type, flag = dp.reply_more
+        if msg.msg_type == msg_type and msg.flags & flag:
+            return
+        self.finish()
+
+    def result(self):
+        return self.replies
+
+    def finish(self, exc=None):
+        requests = self.datapath.requests
+        for xid in self.xids:
+            if requests.get(xid) is self:
+                del requests[xid]
+        if self.timer is not None:
+            self.timer.cancel()
+        if exc is None:
+            self.future.set(self.result())
+        else:
+            self.future.set_exception(exc)
+
+    def _expire(self):
+        if not self.future.ready():
+            self.finish(hub.Timeout())
+
+
+class _StreamRequest(_Request):
+    # a request whose replies are handed to the iterator as they arrive
+    # instead of being collected.  see Datapath.send_stream_request.
+    def __init__(self, datapath):
+        super(_StreamRequest, self).__init__(datapath)
+        self.queue = hub.Queue()
+        self.timeout = None
+
+    def start(self, xids, timeout=None):
+        self.timeout = timeout
+        super(_StreamRequest, self).start(xids, timeout)
+
+    def handle_reply(self, msg):
+        dp = self.datapath
+        if msg.msg_type == dp.ofproto.OFPT_ERROR:
+            super(_StreamRequest, self).handle_reply(msg)
+            return
+
+        self.queue.put((msg, None))
+        msg_type, flag = dp.reply_more
+        if msg.msg_type == msg_type and msg.flags & flag:
+            # the timeout is the one for each segment
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = hub.call_after(self.timeout, self._expire)
+            return
+        self.finish()
+
+    def finish(self, exc=None):
+        super(_StreamRequest, self).finish(exc)
+        self.queue.put((None, exc))
+
+    def __iter__(self):
+        while True:
+            msg, exc = self.queue.get()
+            if exc is not None:
+                raise exc
+            if msg is None:
+                return
+            yield msg
+
+
+class FlowBatch(_Request):
+    """Flow, group and meter mods which are sent to a switch at once.
+
+    The messages added to a batch are serialized into a single buffer,
+    followed by a barrier request, when the batch is sent.  ``future``
+    is set when the barrier reply is received, i.e. when the switch has
+    processed all of the messages, to the list of the error messages
+    the switch has sent for them.  It's empty when every message has
+    been applied successfully.
+
+    A batch can be used as a context manager which sends the batch on
+    exit unless an exception is raised.
+
+    Example::
+
+        with datapath.flow_batch() as batch:
+            for match in matches:
+                batch.add(parser.OFPFlowMod(datapath, match=match, ...))
+        errors = batch.future.get(timeout=5)
+    """
+
+    def __init__(self, datapath):
+        super(FlowBatch, self).__init__(datapath)
+        self.msgs = []
+        self.errors = []
+        self.barrier_xid = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.send()
+
+    def __len__(self):
+        return len(self.msgs)
+
+    def add(self, msg):
+        """Add a flow, group or meter mod message to the batch."""
+        assert self.barrier_xid is None
+        assert self.datapath.is_mod_msg(msg)
+        self.msgs.append(msg)
+
+    def send(self, timeout=None):
+        """Send the batch and return the future.
+
+        If ``timeout`` is specified and the barrier reply doesn't arrive
+        in ``timeout`` seconds, the future fails with hub.Timeout.
+        """
+        dp = self.datapath
+        assert self.barrier_xid is None
+        barrier = dp.ofproto_parser.OFPBarrierRequest(dp)
+        msgs = []
+        for msg in self.msgs + [barrier]:
+            if msg.xid is None:
+                dp.set_xid(msg)
+            msg.serialize()
+            if msg is barrier or not dp.suppress_mod_msg(msg):
+                msgs.append(msg)
+        self.barrier_xid = barrier.xid
+        self.start([msg.xid for msg in msgs], timeout)
+        try:
+            dp.send(bytearray().join(msg.buf for msg in msgs))
+        except Exception as e:
+            self.finish(e)
+            raise
+        return self.future
+
+    def handle_reply(self, msg):
+        dp = self.datapath
+        if msg.msg_type == dp.ofproto.OFPT_ERROR:
+            self.errors.append(msg)
+        # the switch may answer the barrier with an error, too
+        if msg.xid == self.barrier_xid:
+            self.finish()
+
+    def result(self):
+        return self.errors
+
+
 class Datapath(object):
     supported_ofp_version = {
         ofproto_v1_0.OFP_VERSION: (ofproto_v1_0,
@@ -117,9 +343,44 @@ class Datapath(object):
         self.address = address
         self.is_active = True
 
-        # The limit is arbitrary. We need to limit queue size to
-        # prevent it from eating memory up
-        self.send_q = hub.Queue(16)
+        # We need to limit queue size to prevent it from eating memory up.
+        # What to do when the queue is full is up to the policy.
+        self.send_q = hub.Queue(CONF.ofp_send_queue_size)
+        self.send_q_policy = None
+        self.send_q_high_watermark = None   # None: 3/4 of the queue size
+        self.send_q_congested = False
+        self.set_send_queue_policy(CONF.ofp_send_queue_policy,
+                                   high_watermark=(
+                                       CONF.ofp_send_queue_high_watermark))
+
+        # counters of the send loop
+        self.send_bytes = 0
+        self.send_msgs = 0
+        self.send_batches = 0
+        self.send_q_dropped = 0
+        self.send_q_failures = 0
+        self.send_q_congestions = 0
+
+        # outstanding requests sent by send_request, keyed by xid
+        self.requests = {}
+
+        # admission control of packet-ins. see _admit_packet_in.
+        self.packet_in_limited = False
+        self.packet_in_bucket = None
+        self.packet_in_port_rate = 0
+        self.packet_in_port_burst = None
+        self.packet_in_port_buckets = {}
+        self.packet_in_dropped = 0
+        self.packet_in_port_dropped = {}
+        self.packet_in_coalescer = PacketInCoalescer(self)
+        self.set_packet_in_limit(CONF.ofp_packet_in_rate,
+                                 CONF.ofp_packet_in_burst,
+                                 CONF.ofp_packet_in_port_rate,
+                                 CONF.ofp_packet_in_port_burst)
+        self.set_packet_in_coalesce_window(
+            CONF.ofp_packet_in_coalesce_window)
+
+        self.flow_mod_cache = FlowModCache(self, CONF.ofp_flow_mod_cache_size)
 
         self.set_version(max(self.supported_ofp_version))
         self.xid = random.randint(0, self.ofproto.MAX_XID)
@@ -141,57 +402,180 @@ class Datapath(object):
     def set_version(self, version):
         assert version in self.supported_ofp_version
         self.ofproto, self.ofproto_parser = self.supported_ofp_version[version]
+        # control plane messages which don't count against the message
+        # budget of the receive loop. see _recv_loop.
+        self.priority_msg_types = frozenset([
+            self.ofproto.OFPT_HELLO,
+            self.ofproto.OFPT_ECHO_REQUEST,
+            self.ofproto.OFPT_ECHO_REPLY,
+            self.ofproto.OFPT_FEATURES_REPLY,
+            self.ofproto.OFPT_BARRIER_REPLY,
+        ])
+        # the messages which are routed to the outstanding request of
+        # their xid. the ones sent by the switch on its own, e.g.
+        # packet-ins, may have the same xid by chance.
+        self.reply_msg_types = frozenset(
+            [self.ofproto.OFPT_ERROR] +
+            [getattr(self.ofproto, name) for name in dir(self.ofproto)
+             if name.startswith('OFPT_') and name.endswith('_REPLY')])
+        # a reply of this type with this flag set is followed by more
+        # replies to the same request. see _Request.handle_reply.
+        if version == ofproto_v1_3.OFP_VERSION:
+            self.reply_more = (self.ofproto.OFPT_MULTIPART_REPLY,
+                               self.ofproto.OFPMPF_REPLY_MORE)
+        else:
+            self.reply_more = (self.ofproto.OFPT_STATS_REPLY,
+                               self.ofproto.OFPSF_REPLY_MORE)
+        # flow, group and meter mods. see is_mod_msg.
+        self.mod_msg_types = frozenset(
+            getattr(self.ofproto, name) for name in
+            ['OFPT_FLOW_MOD', 'OFPT_GROUP_MOD', 'OFPT_METER_MOD']
+            if hasattr(self.ofproto, name))
+        self.nx_flow_mod_cls = getattr(self.ofproto_parser, 'NXTFlowMod',
+                                       ())
 
     # Low level socket handling layer
     @_deactivate
     def _recv_loop(self):
-        buf = bytearray()
+        # The receive buffer is allocated once and reused. Unparsed data
+        # lives in buf[head:tail]. Incoming data is read directly into the
+        # free space after tail, and the pending bytes are moved back to
+        # the front only when the next message wouldn't fit any more.
+        # Since the length of an OpenFlow message is 16 bits, the buffer
+        # always has the room for at least one whole message.
+        buf = bytearray(max(CONF.ofp_recv_buffer_size,
+                            ofproto_common.OFP_MAX_MSG_LEN))
+        view = memoryview(buf)
+        head = tail = 0
         required_len = ofproto_common.OFP_HEADER_SIZE
 
+        # All the datapaths are served by greenlets of a single thread.
+        # In order not to let a busy datapath starve the others, we yield
+        # once a round has used up either budget. A round starts when we
+        # yield or when all the received data has been handled, which is
+        # where recv can block and let the others run anyway.
+        # The control plane messages, e.g. echo and barrier replies,
+        # don't count against the message budget so that they are
+        # handled without being deferred to the next round. They do
+        # count against the time budget, so that a flood of them can't
+        # starve the others either.
+        msg_budget = CONF.ofp_recv_msg_budget
+        time_budget = CONF.ofp_recv_time_budget
         count = 0
+        round_start = time.time()
         while self.is_active:
-            ret = self.socket.recv(required_len)
-            if len(ret) == 0:
+            if head == tail:
+                head = tail = 0
+                count = 0
+                round_start = time.time()
+            elif head + required_len > len(buf):
+                buf[:tail - head] = buf[head:tail]
+                tail -= head
+                head = 0
+
+            ret = self.socket.recv_into(view[tail:])
+            if ret == 0:
                 self.is_active = False
                 break
-            buf += ret
-            while len(buf) >= required_len:
-                (version, msg_type, msg_len, xid) = ofproto_parser.header(buf)
+            tail += ret
+            while tail - head >= required_len:
+                (version, msg_type, msg_len, xid) = ofproto_parser.header(
+                    buf, head)
+                if msg_len < ofproto_common.OFP_HEADER_SIZE:
+                    LOG.error('malformed message length %d from %s',
+                              msg_len, self.address)
+                    self.is_active = False
+                    break
                 required_len = msg_len
-                if len(buf) < required_len:
+                if tail - head < required_len:
                     break
 
-                msg = ofproto_parser.msg(self,
-                                         version, msg_type, msg_len, xid, buf)
+                # Messages are queued to applications and may outlive this
+                # loop, so each message gets a private copy of its own
+                # bytes instead of a view into the reused buffer.
+                msg = ofproto_parser.msg(
+                    self, version, msg_type, msg_len, xid,
+                    view[head:head + msg_len].tobytes())
                 #LOG.debug('queue msg %s cls %s', msg, msg.__class__)
+                if msg:
+                    if (xid in self.requests and
+                            msg_type in self.reply_msg_types):
+                        self.requests[xid].handle_reply(msg)
+                    if (msg_type == self.ofproto.OFPT_FLOW_REMOVED and
+                            self.flow_mod_cache.size):
+                        self.flow_mod_cache.flow_removed(msg)
+                    elif (msg_type == self.ofproto.OFPT_ERROR and
+                            self.flow_mod_cache.xids):
+                        self.flow_mod_cache.error(msg)
+                    if (self.packet_in_filtered and
+                            msg_type == self.ofproto.OFPT_PACKET_IN and
+                            not self._filter_packet_in(msg)):
+                        # dropped before an event is generated for it
+                        msg = None
                 if msg:
                     ev = ofp_event.ofp_msg_to_ev(msg)
                     self.ofp_brick.send_event_to_observers(ev, self.state)
 
-                    handlers = [handler for handler in
-                                self.ofp_brick.get_handlers(ev) if
-                                self.state in handler.dispatchers]
+                    handlers = self.ofp_brick.get_handlers(ev, self.state)
+                    profiler = self.ofp_brick.profiler
+                    # there is no caller to handle OFPSendQueueFull of
+                    # the messages which the handlers send, e.g. the
+                    # echo replies, so it mustn't end this loop.
                     for handler in handlers:
-                        handler(ev)
+                        try:
+                            if profiler.enabled:
+                                profiler.call(handler, ev)
+                            else:
+                                handler(ev)
+                        except exception.OFPSendQueueFull as e:
+                            self._send_q_failed(e, ev)
 
-                buf = buf[required_len:]
+                head += msg_len
                 required_len = ofproto_common.OFP_HEADER_SIZE
 
-                # We need to schedule other greenlets. Otherwise, ryu
-                # can't accept new switches or handle the existing
-                # switches. The limit is arbitrary. We need the better
-                # approach in the future.
-                count += 1
-                if count > 2048:
-                    count = 0
+                if msg_type not in self.priority_msg_types:
+                    count += 1
+                if (count >= msg_budget or
+                        time.time() - round_start >= time_budget):
                     hub.sleep(0)
+                    count = 0
+                    round_start = time.time()
 
     @_deactivate
     def _send_loop(self):
+        # Messages which are already queued are written with a single
+        # sendall() rather than one by one, so that an application
+        # programming lots of flows doesn't cost a system call and
+        # a greenlet switch per message.
+        batch_size = CONF.ofp_send_batch_size
+        next_buf = None
         try:
             while self.is_active:
-                buf = self.send_q.get()
-                self.socket.sendall(buf)
+                if next_buf is None:
+                    next_buf = self.send_q.get()
+                bufs = [next_buf]
+                size = len(next_buf)
+                next_buf = None
+                while size < batch_size:
+                    try:
+                        buf = self.send_q.get(block=False)
+                    except hub.QueueEmpty:
+                        break
+                    if size + len(buf) > batch_size:
+                        next_buf = buf
+                        break
+                    bufs.append(buf)
+                    size += len(buf)
+                if self.send_q.empty():
+                    self.send_q_congested = False
+
+                if len(bufs) == 1:
+                    self.socket.sendall(bufs[0])
+                else:
+                    self.socket.sendall(bytearray().join(bufs))
+                self.send_bytes += size
+                self.send_msgs += len(bufs)
+                self.send_batches += 1
         finally:
             q = self.send_q
             # first, clear self.send_q to prevent new references.
@@ -204,9 +588,214 @@ class Datapath(object):
             except hub.QueueEmpty:
                 pass
 
+    def set_send_queue_policy(self, policy=None, maxsize=None,
+                              high_watermark=None):
+        """
+        Change how the messages queued for this datapath are handled.
+
+        ============== ==================================================
+        Argument       Description
+        ============== ==================================================
+        policy         What send() does when the queue is full.
+                       One of SEND_QUEUE_BLOCK, SEND_QUEUE_DROP_OLDEST
+                       and SEND_QUEUE_FAIL_FAST.
+        maxsize        Max number of messages in the queue.
+        high_watermark Queue length at which EventOFPSendQueueCongested
+                       is generated. Defaults to 3/4 of maxsize.
+        ============== ==================================================
+
+        None leaves the corresponding setting unchanged.
+        """
+        if policy is not None:
+            assert policy in SEND_QUEUE_POLICIES, \
+                'unknown send queue policy %s' % policy
+            self.send_q_policy = policy
+        if maxsize is not None:
+            assert maxsize > 0
+            if self.send_q:
+                self.send_q.resize(maxsize)
+        if high_watermark is not None:
+            self.send_q_high_watermark = high_watermark
+
+    def _send_q_congestion_threshold(self, q):
+        if self.send_q_high_watermark is not None:
+            return self.send_q_high_watermark
+        return (q.maxsize * 3 + 3) // 4
+
+    def _send_q_put(self, q, buf):
+        if q.full():
+            if self.send_q_policy == SEND_QUEUE_DROP_OLDEST:
+                try:
+                    q.get(block=False)
+                    self.send_q_dropped += 1
+                except hub.QueueEmpty:
+                    pass
+            elif self.send_q_policy == SEND_QUEUE_FAIL_FAST:
+                self.send_q_dropped += 1
+                raise exception.OFPSendQueueFull(dpid=self.id)
+        q.put(buf)
+
+        if (not self.send_q_congested and
+                q.qsize() >= self._send_q_congestion_threshold(q)):
+            self.send_q_congested = True
+            self.send_q_congestions += 1
+            LOG.debug('send queue of datapath %s is congested (%d/%d)',
+                      self.id, q.qsize(), q.maxsize)
+            # this only queues the event to the observers. their
+            # handlers run later in their own threads, so they can call
+            # send_msg() without re-entering this method.
+            ev = ofp_event.EventOFPSendQueueCongested(self, q.qsize())
+            self.ofp_brick.send_event_to_observers(ev, self.state)
+
+    def _send_q_failed(self, exc, what):
+        # OFPSendQueueFull raised to the controller itself, which can't
+        # do anything but drop the message
+        self.send_q_failures += 1
+        LOG.warning('datapath %s: dropped a message sent for %s: %s',
+                    self.id, what.__class__.__name__, exc)
+
     def send(self, buf):
-        if self.send_q:
-            self.send_q.put(buf)
+        q = self.send_q
+        if q:
+            self._send_q_put(q, buf)
+
+    def set_packet_in_limit(self, rate=0, burst=None, port_rate=0,
+                            port_burst=None):
+        """
+        Limit the packet-ins accepted from this datapath.
+
+        ``rate`` and ``burst`` limit the packet-ins of the datapath as a
+        whole, while ``port_rate`` and ``port_burst`` limit the ones of
+        each in_port.  The rates are in packets per second and 0 means
+        unlimited.  A burst is the number of packets accepted at once,
+        which is the rate by default.
+
+        The excess packet-ins are dropped in the receive loop before
+        any event is generated for them.
+        """
+        assert rate >= 0 and port_rate >= 0
+        self.packet_in_bucket = TokenBucket(rate, burst) if rate else None
+        self.packet_in_port_rate = port_rate
+        self.packet_in_port_burst = port_burst
+        self.packet_in_port_buckets.clear()
+        self.packet_in_limited = bool(rate or port_rate)
+        self._update_packet_in_filtered()
+
+    def set_packet_in_coalesce_window(self, window):
+        """
+        Hold back the table-miss packet-ins which follow the first one of
+        a flow for ``window`` seconds.  0 disables the coalescing.
+        See ryu.controller.packet_in_coalescer.
+        """
+        assert window >= 0
+        self.packet_in_coalescer.window = window
+        self._update_packet_in_filtered()
+
+    def _update_packet_in_filtered(self):
+        self.packet_in_filtered = bool(self.packet_in_limited or
+                                       self.packet_in_coalescer.window)
+
+    def _filter_packet_in(self, msg):
+        # Return False if the packet-in shouldn't be dispatched.
+        if self.packet_in_limited and not self._admit_packet_in(msg):
+            return False
+        coalescer = self.packet_in_coalescer
+        if coalescer.window and coalescer.hold(msg,
+                                               self._packet_in_port(msg)):
+            return False
+        return True
+
+    def _packet_in_port(self, msg):
+        if self.ofproto.OFP_VERSION == ofproto_v1_0.OFP_VERSION:
+            return msg.in_port
+        return msg.match.get('in_port')
+
+    def _admit_packet_in(self, msg):
+        # The per-port limit is checked first so that the packet-ins
+        # dropped for a flooding port don't use up the tokens of the
+        # datapath as a whole, which are shared with the other ports.
+        if self.packet_in_port_rate:
+            in_port = self._packet_in_port(msg)
+            buckets = self.packet_in_port_buckets
+            bucket = buckets.get(in_port)
+            if bucket is None:
+                bucket = TokenBucket(self.packet_in_port_rate,
+                                     self.packet_in_port_burst)
+                buckets[in_port] = bucket
+            if not bucket.consume():
+                self.packet_in_dropped += 1
+                dropped = self.packet_in_port_dropped
+                dropped[in_port] = dropped.get(in_port, 0) + 1
+                return False
+
+        if self.packet_in_bucket and not self.packet_in_bucket.consume():
+            self.packet_in_dropped += 1
+            return False
+        return True
+
+    def get_packet_in_stats(self):
+        """
+        Return a dict of the counters of the packet-in admission control
+        and coalescing.
+
+        ================= ===========================================
+        Key               Description
+        ================= ===========================================
+        dropped           Number of packet-ins dropped by either limit
+        port_dropped      Dict of in_port to the number of packet-ins
+                          dropped by the limit of the port
+        coalesced         Number of packet-ins held back as
+                          duplicates of a flow miss
+        coalesce_misses   Number of the first packet-ins of a flow
+                          miss, which are dispatched. The hit rate is
+                          coalesced / (coalesced + coalesce_misses).
+        coalesce_released Number of held packet-ins returned to the
+                          switch as packet-outs
+        coalesce_dropped  Number of packet-ins dropped because too
+                          many were held for a flow
+        ================= ===========================================
+        """
+        stats = {
+            'dropped': self.packet_in_dropped,
+            'port_dropped': dict(self.packet_in_port_dropped),
+        }
+        stats.update(self.packet_in_coalescer.get_stats())
+        return stats
+
+    def get_send_stats(self):
+        """
+        Return a dict of the counters of the messages sent to this
+        datapath.
+
+        =========== =================================================
+        Key         Description
+        =========== =================================================
+        bytes       Number of bytes written to the connection
+        msgs        Number of messages written to the connection
+        batches     Number of writes. msgs / batches is the average
+                    number of messages coalesced into a write.
+        queue_len   Number of messages in the send queue
+        queue_max   Max number of messages in the send queue
+        dropped     Number of messages discarded because the send
+                    queue was full
+        failures    Number of the dropped messages which were sent
+                    by the controller itself under SEND_QUEUE_FAIL_FAST,
+                    e.g. the echo replies of ofp_handler
+        congestions Number of times the queue length reached the
+                    high watermark
+        =========== =================================================
+        """
+        q = self.send_q
+        return {
+            'bytes': self.send_bytes,
+            'msgs': self.send_msgs,
+            'batches': self.send_batches,
+            'queue_len': q.qsize() if q else 0,
+            'queue_max': q.maxsize if q else 0,
+            'dropped': self.send_q_dropped,
+            'failures': self.send_q_failures,
+            'congestions': self.send_q_congestions,
+        }
 
     def set_xid(self, msg):
         self.xid += 1
@@ -215,13 +804,124 @@ class Datapath(object):
         return self.xid
 
     def send_msg(self, msg):
+        """
+        Queue msg to be sent to the datapath.
+
+        Under SEND_QUEUE_FAIL_FAST, OFPSendQueueFull is raised when the
+        send queue is full, and the callers must handle it.  The only
+        exceptions are the handlers run in the receive loop, i.e. the
+        ones of ofp_handler, and the packet-in coalescer, for which the
+        controller drops the message and counts it in the failures of
+        get_send_stats().
+        """
         assert isinstance(msg, self.ofproto_parser.MsgBase)
         if msg.xid is None:
             self.set_xid(msg)
         msg.serialize()
         # LOG.debug('send_msg %s', msg)
+        if self.suppress_mod_msg(msg):
+            return
         self.send(msg.buf)
 
+    def is_mod_msg(self, msg):
+        """Return True if msg is a flow, group or meter mod."""
+        return (msg.cls_msg_type in self.mod_msg_types or
+                isinstance(msg, self.nx_flow_mod_cls))
+
+    def suppress_mod_msg(self, msg):
+        # Return True if the serialized msg is a duplicated flow mod
+        # which shouldn't be sent. see flow_mod_cache.
+        return (self.flow_mod_cache.size != 0 and self.is_mod_msg(msg) and
+                self.flow_mod_cache.suppress(msg))
+
+    def set_flow_mod_cache_size(self, size):
+        """
+        Set the max number of the flow entries remembered to suppress
+        duplicated flow mods.  0 disables the cache and empties it.
+        See ryu.controller.flow_mod_cache.
+        """
+        self.flow_mod_cache.resize(size)
+
+    def get_flow_mod_cache_stats(self):
+        """
+        Return a dict of the counters of the flow mod cache.
+
+        ============= ==============================================
+        Key           Description
+        ============= ==============================================
+        size          Number of the cached flow entries
+        max_size      Max number of the cached flow entries
+        hits          Number of the suppressed flow mods
+        misses        Number of the flow mods sent while the cache
+                      is enabled
+        invalidations Number of the entries dropped because the
+                      flow entry may have changed
+        evictions     Number of the least recently used entries
+                      dropped because the cache was full
+        ============= ==============================================
+        """
+        return self.flow_mod_cache.get_stats()
+
+    def send_request(self, msg, timeout=None):
+        """Send a request and return a future of its replies.
+
+        The returned hub.AsyncResult is set to the list of the reply
+        messages whose xid is the one of the request.  A multipart
+        (stats) reply is collected until the one without the REPLY_MORE
+        flag is received.  If the switch answers with an error message,
+        the future fails with OFPRequestError whose ``error`` keyword
+        argument is the error message.  If no final reply arrives in
+        ``timeout`` seconds, or the datapath is disconnected, the future
+        fails with hub.Timeout or OFPRequestAborted respectively.
+
+        Each request is forgotten as soon as its future is resolved.
+        Note that a request which the switch never replies to, e.g. a
+        flow mod, is kept until the disconnection unless a timeout is
+        specified.
+        """
+        if msg.xid is None:
+            self.set_xid(msg)
+        req = _Request(self)
+        req.start([msg.xid], timeout)
+        try:
+            self.send_msg(msg)
+        except Exception as e:
+            req.finish(e)
+            raise
+        return req.future
+
+    def send_stream_request(self, msg, timeout=None):
+        """Send a request and return an iterator of its replies.
+
+        This is send_request() for the multipart (stats) requests whose
+        replies can be too large to be collected into a list, e.g. the
+        flow stats of a switch with a large flow table.  The iterator
+        yields each reply message as it arrives and stops after the one
+        without the REPLY_MORE flag.  It raises OFPRequestError,
+        hub.Timeout or OFPRequestAborted as the future of send_request()
+        fails.  ``timeout`` is the time to wait for each of the replies,
+        not the whole of them.
+        """
+        if msg.xid is None:
+            self.set_xid(msg)
+        req = _StreamRequest(self)
+        req.start([msg.xid], timeout)
+        try:
+            self.send_msg(msg)
+        except Exception as e:
+            req.finish(e)
+            raise
+        return iter(req)
+
+    def flow_batch(self):
+        """Return a new FlowBatch for this datapath."""
+        return FlowBatch(self)
+
+    def _abort_requests(self):
+        for req in set(self.requests.values()):
+            req.finish(exception.OFPRequestAborted(dpid=self.id,
+                                                   xid=req.xids[-1]))
+
     def serve(self):
         send_thr = hub.spawn(self._send_loop)
 
@@ -234,6 +934,7 @@ class Datapath(object):
         finally:
             hub.kill(send_thr)
             hub.joinall([send_thr])
+            self._abort_requests()
 
     #
     # Utility methods for convenience
@@ -16,8 +16,11 @@
 
 import logging
 
+from oslo.config import cfg
+
 from ryu.base import app_manager
 from ryu.controller import event
+from ryu.controller import event_coalescer
 from ryu.controller import handler
 from ryu.controller import ofp_event
 from ryu.controller.handler import set_ev_cls
@@ -27,6 +30,8 @@ from ryu.lib.dpid import dpid_to_str
 
 LOG = logging.getLogger('ryu.controller.dpset')
 
+CONF = cfg.CONF
+
 DPSET_EV_DISPATCHER = "dpset"
 
 
@@ -94,6 +99,11 @@ class DPSet(app_manager.RyuApp):
 
         self.dps = {}   # datapath_id => class Datapath
         self.port_state = {}  # datapath_id => ports
+        # the port events of a flapping port are coalesced if
+        # --port-event-coalesce-window is set
+        self.port_events = event_coalescer.EventCoalescer(
+            self._make_port_event, self.send_event_to_observers,
+            CONF.port_event_coalesce_window)
 
     def _register(self, dp):
         LOG.debug('DPSET: register datapath %s', dp)
@@ -159,6 +169,50 @@ class DPSet(app_manager.RyuApp):
         """
         return self.dps.items()
 
+    def get_send_stats(self):
+        """
+        This method returns a dict which maps a Datapath ID to the
+        counters and the send queue occupancy of the datapath.
+        See ryu.controller.controller.Datapath.get_send_stats.
+        """
+        return dict((dp_id, dp.get_send_stats())
+                    for dp_id, dp in self.dps.items())
+
+    def get_packet_in_stats(self):
+        """
+        This method returns a dict which maps a Datapath ID to the
+        counters of the packet-in admission control of the datapath.
+        See ryu.controller.controller.Datapath.get_packet_in_stats.
+        """
+        return dict((dp_id, dp.get_packet_in_stats())
+                    for dp_id, dp in self.dps.items())
+
+    def get_port_event_stats(self):
+        """
+        This method returns a dict of the counters of the port events.
+        'coalesced' is the number of the events which weren't sent
+        because they were coalesced into others.
+        """
+        return self.port_events.get_stats()
+
+    _PORT_EVENTS = {
+        event_coalescer.ADD: EventPortAdd,
+        event_coalescer.DELETE: EventPortDelete,
+        event_coalescer.MODIFY: EventPortModify,
+    }
+
+    def _make_port_event(self, kind, obj):
+        dpid, port = obj
+        datapath = self.dps.get(dpid)
+        if datapath is None:
+            # the datapath has left while the event was held
+            return None
+        return self._PORT_EVENTS[kind](datapath, port)
+
+    def _send_port_event(self, kind, datapath, port):
+        self.port_events.put((datapath.id, port.port_no), kind,
+                             (datapath.id, port), port)
+
     def _port_added(self, datapath, port):
         self.port_state[datapath.id].add(port.port_no, port)
 
@@ -196,20 +250,20 @@ class DPSet(app_manager.RyuApp):
                       '(datapath id = %s, port number = %s)',
                       dpid_to_str(datapath.id), port.port_no)
             self._port_added(datapath, port)
-            self.send_event_to_observers(EventPortAdd(datapath, port))
+            self._send_port_event(event_coalescer.ADD, datapath, port)
         elif reason == ofproto.OFPPR_DELETE:
             LOG.debug('DPSET: A port was deleted.' +
                       '(datapath id = %s, port number = %s)',
                       dpid_to_str(datapath.id), port.port_no)
             self._port_deleted(datapath, port)
-            self.send_event_to_observers(EventPortDelete(datapath, port))
+            self._send_port_event(event_coalescer.DELETE, datapath, port)
         else:
             assert reason == ofproto.OFPPR_MODIFY
             LOG.debug('DPSET: A port was modified.' +
                       '(datapath id = %s, port number = %s)',
                       dpid_to_str(datapath.id), port.port_no)
             self.port_state[datapath.id].modify(port.port_no, port)
-            self.send_event_to_observers(EventPortModify(datapath, port))
+            self._send_port_event(event_coalescer.MODIFY, datapath, port)
 
     def get_port(self, dpid, port_no):
         """
@@ -26,9 +26,11 @@ class EventRequestBase(EventBase):
         self.dst = None  # app.name of provide the event.
         self.src = None
         self.sync = False
+        self.req_id = None  # set by RyuApp.send_request_async
 
 
 class EventReplyBase(EventBase):
     def __init__(self, dst):
         super(EventReplyBase, self).__init__()
         self.dst = dst
+        self.req_id = None  # req_id of the request replied to
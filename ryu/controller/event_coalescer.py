@@ -0,0 +1,125 @@
+# Copyright (C) 2013 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Coalescing of the add, delete and modify events of an object.
+
+A flapping port or link produces a burst of events, each of which can
+trigger a recomputation in the applications observing them.
+
+EventCoalescer sends the first event of an object at once and holds the
+ones which follow within a window.  When the window closes, only the net
+change since the first event is sent, if any, and a new window starts.
+The window ends when it closes without any event.
+"""
+
+import time
+
+from oslo.config import cfg
+
+from ryu.lib import hub
+
+CONF = cfg.CONF
+CONF.register_cli_opts([
+    cfg.FloatOpt('port-event-coalesce-window', default=0,
+                 help='coalesce the port and link events of dpset and '
+                      'switches within this seconds (0 to disable)'),
+])
+
+ADD = 'add'
+DELETE = 'delete'
+MODIFY = 'modify'
+
+
+class EventCoalescer(object):
+    """
+    Coalesce the events of each key which are put within ``window``
+    seconds.
+
+    ``make_event(kind, obj)`` returns the event of ``kind`` for ``obj``,
+    or None to send nothing, and ``send(ev)`` sends it.  Events are
+    sent as they are put while ``window`` is 0.
+    """
+
+    def __init__(self, make_event, send, window=0):
+        super(EventCoalescer, self).__init__()
+        assert window >= 0
+        self.make_event = make_event
+        self.send = send
+        self.window = window
+        # key -> [obj seen by the observers or None, its state,
+        #         the last (kind, obj, state) held or None]
+        self.pending = {}
+        self.received = 0
+        self.sent = 0
+
+    def put(self, key, kind, obj, state=None):
+        """
+        Put the event of ``kind`` for ``obj``.  For DELETE, ``obj`` is
+        the deleted one.  ``state`` is compared to tell if MODIFY has
+        changed anything and defaults to ``obj``.
+        """
+        self.received += 1
+        if state is None:
+            state = obj
+
+        entry = self.pending.get(key)
+        if entry is not None:
+            entry[2] = (kind, obj, state)
+            return
+
+        self._send(kind, obj)
+        if not self.window:
+            return
+        if kind == DELETE:
+            self.pending[key] = [None, None, None]
+        else:
+            self.pending[key] = [obj, state, None]
+        hub.spawn(self._close, key, time.time() + self.window)
+
+    def _send(self, kind, obj):
+        ev = self.make_event(kind, obj)
+        if ev is not None:
+            self.sent += 1
+            self.send(ev)
+
+    def _close(self, key, deadline):
+        while True:
+            hub.sleep(max(deadline - time.time(), 0))
+            entry = self.pending[key]
+            base, base_state, last = entry
+            if last is None:
+                del self.pending[key]
+                return
+
+            kind, obj, state = last
+            if kind == DELETE:
+                if base is not None:
+                    self._send(DELETE, obj)
+                entry[:] = [None, None, None]
+            else:
+                if base is None:
+                    self._send(ADD, obj)
+                elif state != base_state:
+                    self._send(MODIFY, obj)
+                entry[:] = [obj, state, None]
+            deadline = time.time() + self.window
+
+    def get_stats(self):
+        return {
+            'received': self.received,
+            'sent': self.sent,
+            'coalesced': self.received - self.sent,
+        }
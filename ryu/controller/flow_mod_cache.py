@@ -0,0 +1,187 @@
+# Copyright (C) 2013 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Suppression of the flow mods which are identical to the ones which are
+already installed.
+
+FlowModCache remembers the flow mods (OFPFC_ADD) sent to a datapath,
+keyed on the flow entry they install, i.e. the table, the priority and
+the serialized match.  A flow mod whose serialized bytes are the same as
+the remembered ones, except for the xid, is a duplicate and isn't sent.
+
+An entry is forgotten when the flow entry may have gone away or
+changed:
+
+- an OFPFlowRemoved of the same table and priority is received
+- a modify or delete flow mod is sent.  A strict one drops the entries
+  of the same table and priority, the others drop all of them.
+- a group or meter is deleted, which can delete flow entries silently
+- the hard timeout of the flow entry elapses
+- the switch answers the flow mod with an error, e.g. its table is full
+
+A flow mod with an idle timeout is cached only if it has the
+OFPFF_SEND_FLOW_REM flag, since its lifetime is unknown otherwise.
+A flow mod with a buffer_id is never suppressed because it releases a
+buffered packet.  The cache is per datapath connection, so it's empty
+after a reconnection.
+"""
+
+import collections
+import struct
+import time
+
+from ryu.ofproto import ofproto_v1_0
+
+
+class FlowModCache(object):
+    """
+    LRU cache of the flow mods sent to a datapath, holding at most
+    ``size`` flow entries.  0 disables the cache.
+    """
+
+    def __init__(self, datapath, size=0):
+        super(FlowModCache, self).__init__()
+        self.datapath = datapath
+        self.size = 0
+        # (table_id, priority, match) -> (bytes, expiry, xid)
+        self.entries = collections.OrderedDict()
+        # xid of the flow mod sent -> key of its entry
+        self.xids = {}
+        # (table_id, priority) -> set of keys of entries
+        self.index = collections.defaultdict(set)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+        self.resize(size)
+
+    def resize(self, size):
+        assert size >= 0
+        self.size = size
+        while len(self.entries) > size:
+            self._evict()
+
+    def clear(self):
+        self.invalidations += len(self.entries)
+        self.entries.clear()
+        self.index.clear()
+        self.xids.clear()
+
+    def _match(self, buf):
+        ofproto = self.datapath.ofproto
+        if ofproto.OFP_VERSION == ofproto_v1_0.OFP_VERSION:
+            start = ofproto.OFP_HEADER_SIZE
+            return str(buf[start:start + ofproto.OFP_MATCH_SIZE])
+        start = ofproto.OFP_FLOW_MOD_SIZE - ofproto.OFP_MATCH_SIZE
+        (length,) = struct.unpack_from('!H', buf, start + 2)
+        return str(buf[start:start + length])
+
+    def _remove(self, key):
+        entry = self.entries.pop(key)
+        self.xids.pop(entry[2], None)
+        keys = self.index[key[:2]]
+        keys.discard(key)
+        if not keys:
+            del self.index[key[:2]]
+
+    def _evict(self):
+        key = next(self.entries.iterkeys())
+        self._remove(key)
+        self.evictions += 1
+
+    def _invalidate(self, table_id, priority):
+        keys = self.index.get((table_id, priority))
+        if not keys:
+            return
+        for key in list(keys):
+            self._remove(key)
+            self.invalidations += 1
+
+    def suppress(self, msg):
+        """
+        Check a serialized flow, group or meter mod which is about to be
+        sent.  Return True if it's a duplicate which should not be sent.
+        """
+        ofproto = self.datapath.ofproto
+        if msg.msg_type != ofproto.OFPT_FLOW_MOD:
+            if msg.msg_type in (getattr(ofproto, 'OFPT_GROUP_MOD', None),
+                                getattr(ofproto, 'OFPT_METER_MOD', None)):
+                # OFPGC_DELETE == OFPMC_DELETE
+                if msg.command == ofproto.OFPGC_DELETE:
+                    self.clear()
+            elif msg.command != ofproto.OFPFC_ADD:
+                # Nicira flow mods aren't cached but can change or
+                # delete the cached flow entries.
+                self.clear()
+            return False
+
+        table_id = getattr(msg, 'table_id', 0)
+        if msg.command in (ofproto.OFPFC_MODIFY_STRICT,
+                           ofproto.OFPFC_DELETE_STRICT):
+            self._invalidate(table_id, msg.priority)
+            return False
+        elif msg.command != ofproto.OFPFC_ADD:
+            self.clear()
+            return False
+
+        buf = msg.buf
+        key = (table_id, msg.priority, self._match(buf))
+        data = str(buf[:4]) + str(buf[8:])
+        now = time.time()
+        entry = self.entries.get(key)
+        if entry is not None:
+            if entry[0] == data and entry[1] > now:
+                self.entries[key] = self.entries.pop(key)
+                self.hits += 1
+                return True
+            self._remove(key)
+        self.misses += 1
+
+        if msg.buffer_id != ofproto.OFP_NO_BUFFER:
+            return False
+        with_flow_rem = msg.flags & ofproto.OFPFF_SEND_FLOW_REM
+        if msg.idle_timeout and not with_flow_rem:
+            return False
+        expiry = now + msg.hard_timeout if msg.hard_timeout else float('inf')
+        self.entries[key] = (data, expiry, msg.xid)
+        self.xids[msg.xid] = key
+        self.index[key[:2]].add(key)
+        if len(self.entries) > self.size:
+            self._evict()
+        return False
+
+    def flow_removed(self, msg):
+        """Forget the flow mods of the table and priority of an
+        OFPFlowRemoved message."""
+        self._invalidate(getattr(msg, 'table_id', 0), msg.priority)
+
+    def error(self, msg):
+        """Forget the flow mod which an OFPErrorMsg answers, since the
+        switch hasn't installed its flow entry."""
+        key = self.xids.get(msg.xid)
+        if key is not None:
+            self._remove(key)
+            self.invalidations += 1
+
+    def get_stats(self):
+        return {
+            'size': len(self.entries),
+            'max_size': self.size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'evictions': self.evictions,
+        }
@@ -16,6 +16,7 @@
 
 import inspect
 import logging
+import struct
 import sys
 
 LOG = logging.getLogger('ryu.controller.handler')
@@ -28,23 +29,96 @@ DEAD_DISPATCHER = "dead"
 
 
 # should be named something like 'observe_event'
-def set_ev_cls(ev_cls, dispatchers=None):
+def set_ev_cls(ev_cls, dispatchers=None, **filters):
+    """
+    Decorate a method of RyuApp as the handler of ev_cls.
+
+    The keyword arguments are the filters of the events.  The handler is
+    called only for the events which pass all of them, and the events
+    which pass none of the filters of the handlers of an application
+    aren't even sent to the application.  Each filter takes a value or
+    a list of values.
+
+    ========= ===========================================================
+    Filter    Description
+    ========= ===========================================================
+    dpid      Datapath id of msg.datapath or datapath
+    eth_type  Ethertype at offset 12 of msg.data (not behind VLAN tags)
+    cookie    msg.cookie
+    table_id  msg.table_id
+    ========= ===========================================================
+
+    Example::
+
+        @set_ev_cls(ofp_event.EventOFPPacketIn, MAIN_DISPATCHER,
+                    eth_type=ether.ETH_TYPE_LLDP)
+        def lldp_packet_in_handler(self, ev):
+            ...
+    """
     def _set_ev_cls_dec(handler):
         handler.ev_cls = ev_cls
         handler.dispatchers = _listify(dispatchers)
         handler.observer = ev_cls.__module__
+        handler.ev_filter = _compile_ev_filter(filters)
         return handler
     return _set_ev_cls_dec
 
 
-def set_ev_handler(ev_cls, dispatchers=None):
+def set_ev_handler(ev_cls, dispatchers=None, **filters):
     def _set_ev_cls_dec(handler):
         handler.ev_cls = ev_cls
         handler.dispatchers = _listify(dispatchers)
+        handler.ev_filter = _compile_ev_filter(filters)
         return handler
     return _set_ev_cls_dec
 
 
+def _ev_dpid(ev):
+    msg = getattr(ev, 'msg', None)
+    if msg is not None:
+        return msg.datapath.id
+    return ev.datapath.id
+
+
+def _ev_eth_type(ev):
+    data = ev.msg.data
+    if len(data) < 14:
+        return None
+    return struct.unpack_from('!H', data, 12)[0]
+
+
+_EV_FILTERS = {
+    'dpid': _ev_dpid,
+    'eth_type': _ev_eth_type,
+    'cookie': lambda ev: ev.msg.cookie,
+    'table_id': lambda ev: ev.msg.table_id,
+}
+
+
+def _compile_ev_filter(filters):
+    # returns a predicate of events, or None for no filter
+    if not filters:
+        return None
+
+    checks = []
+    for name, value in filters.items():
+        assert name in _EV_FILTERS, 'unknown event filter %s' % name
+        if not isinstance(value, (list, tuple, set, frozenset)):
+            value = [value]
+        checks.append((_EV_FILTERS[name], frozenset(value)))
+
+    def ev_filter(ev):
+        for get, values in checks:
+            try:
+                if get(ev) not in values:
+                    return False
+            except AttributeError:
+                # the event doesn't have the attribute
+                return False
+        return True
+    return ev_filter
+
+
 def _is_ev_cls(meth):
     return hasattr(meth, 'ev_cls')
 
@@ -19,6 +19,7 @@ import inspect
 from ryu.controller import handler
 from ryu import ofproto
 from ryu import utils
+from ryu.lib.packet import packet
 from . import event
 
 
@@ -28,12 +29,40 @@ class EventOFPMsgBase(event.EventBase):
         self.msg = msg
 
 
+class EventOFPPacketInBase(EventOFPMsgBase):
+    """
+    The base class of EventOFPPacketIn.
+
+    The same event instance is delivered to all the observers and
+    handlers of a packet-in, so the packet decoded by the first one of
+    them is shared by the rest through the packet attribute.  They must
+    not modify it.
+    """
+    def __init__(self, msg):
+        super(EventOFPPacketInBase, self).__init__(msg)
+        self._packet = None
+
+    @property
+    def packet(self):
+        """
+        The ryu.lib.packet.packet.Packet decoded from msg.data on demand.
+        """
+        if self._packet is None:
+            self._packet = packet.Packet(self.msg.data)
+        return self._packet
+
+
 #
 # Create ofp_event type corresponding to OFP Msg
 #
 
 _OFP_MSG_EVENTS = {}
 
+# msg class name -> base class of its event class
+_OFP_MSG_EVENT_BASES = {
+    'OFPPacketIn': EventOFPPacketInBase,
+}
+
 
 def _ofp_msg_name_to_ev_name(msg_name):
     return 'Event' + msg_name
@@ -51,21 +80,28 @@ def _create_ofp_msg_ev_class(msg_cls):
     if name in _OFP_MSG_EVENTS:
         return
 
-    cls = type(name, (EventOFPMsgBase,),
+    base = _OFP_MSG_EVENT_BASES.get(msg_cls.__name__, EventOFPMsgBase)
+    cls = type(name, (base,),
                dict(__init__=lambda self, msg:
                     super(self.__class__, self).__init__(msg)))
     globals()[name] = cls
     _OFP_MSG_EVENTS[name] = cls
 
 
-def _create_ofp_msg_ev_from_module(ofp_praser):
+def _create_ofp_msg_ev_from_module(ofp_parser):
     # print mod
-    for _k, cls in inspect.getmembers(ofp_parser, inspect.isclass):
-        if not hasattr(cls, 'cls_msg_type'):
+    # look at the module dict directly.  inspect.getmembers() is much
+    # slower as it sorts all the members, and this runs at import time.
+    for cls in vars(ofp_parser).values():
+        if not inspect.isclass(cls) or not hasattr(cls, 'cls_msg_type'):
             continue
         _create_ofp_msg_ev_class(cls)
 
 
+# the event classes are created for all the versions at import time.
+# applications name them in the decorators of their handlers when they
+# are imported, before the versions they enable are known, and a python2
+# module can't create its attributes on demand.
 for ofp_mods in ofproto.get_ofp_modules().values():
     ofp_parser = ofp_mods[1]
     # print 'loading module %s' % ofp_parser
@@ -78,4 +114,22 @@ class EventOFPStateChange(event.EventBase):
         self.datapath = dp
 
 
+class EventOFPSendQueueCongested(event.EventBase):
+    """
+    An event class to notify that the number of messages queued for a
+    datapath reached the high watermark of its send queue.
+
+    ========= =================================================
+    Attribute Description
+    ========= =================================================
+    datapath  A ryu.controller.controller.Datapath instance
+    qsize     Number of messages in the send queue
+    ========= =================================================
+    """
+    def __init__(self, dp, qsize):
+        super(EventOFPSendQueueCongested, self).__init__()
+        self.datapath = dp
+        self.qsize = qsize
+
+
 handler.register_service('ryu.controller.ofp_handler')
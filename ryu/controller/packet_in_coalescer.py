@@ -0,0 +1,169 @@
+# Copyright (C) 2013 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Coalescing of the packet-ins of a flow miss.
+
+When a new flow starts, the switch sends a packet-in for every packet of
+the flow until the flow entry installed by a reactive application is in
+place.  Each of them would be dispatched to the applications, which
+would install the same flow entry again and again.
+
+PacketInCoalescer dispatches only the first packet-in of a flow and
+holds the ones which follow within a short window.  When the window
+closes, the held packets are sent back to the switch as packet-outs to
+OFPP_TABLE, so that they go through the flow table where the new entry
+is expected to be by then.  A packet which misses again is a packet-in
+of a new window.
+"""
+
+import collections
+import struct
+import time
+
+from ryu import exception
+from ryu.lib import hub
+from ryu.ofproto import ether
+from ryu.ofproto import inet
+
+# max number of packets held for a flow. the excess ones are dropped.
+MAX_HELD = 64
+
+_VLAN_TYPES = (ether.ETH_TYPE_8021Q, ether.ETH_TYPE_8021AD)
+_L4_PROTOS = (inet.IPPROTO_TCP, inet.IPPROTO_UDP, inet.IPPROTO_SCTP)
+
+
+def flow_key(data):
+    """
+    Return the L2/L3/L4 key of a packet as a str, which is the ethernet
+    header including VLAN tags, the IP protocol and addresses, and the
+    transport ports.  None is returned for a truncated packet.
+    """
+    try:
+        offset = 12
+        (eth_type,) = struct.unpack_from('!H', data, offset)
+        offset += 2
+        while eth_type in _VLAN_TYPES:
+            (eth_type,) = struct.unpack_from('!H', data, offset + 2)
+            offset += 4
+        key = data[:offset]
+
+        if eth_type == ether.ETH_TYPE_IP:
+            (ver_ihl, proto) = struct.unpack_from('!B8xB', data, offset)
+            key += data[offset + 9:offset + 10] + \
+                data[offset + 12:offset + 20]
+            offset += (ver_ihl & 0xf) * 4
+        elif eth_type == ether.ETH_TYPE_IPV6:
+            (proto,) = struct.unpack_from('!6xB', data, offset)
+            key += data[offset + 6:offset + 7] + \
+                data[offset + 8:offset + 40]
+            offset += 40
+        else:
+            return key
+
+        if proto in _L4_PROTOS:
+            key += data[offset:offset + 4]
+        return key
+    except struct.error:
+        return None
+
+
+class PacketInCoalescer(object):
+    """
+    Coalesce the table-miss packet-ins of a datapath which are received
+    within ``window`` seconds after the first one of the same flow.
+    A flow is identified by the in_port and the flow_key of the packet.
+    The caller is supposed not to call hold() while window is 0.
+    """
+
+    def __init__(self, datapath, window=0):
+        super(PacketInCoalescer, self).__init__()
+        assert window >= 0
+        self.datapath = datapath
+        self.window = window
+        # key -> [deadline, held packet-ins]. ordered by deadline.
+        self.flows = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.released = 0
+        self.dropped = 0
+
+    def hold(self, msg, in_port):
+        """
+        Return True if the packet-in is held or dropped, or False if it
+        should be dispatched to the applications.
+        """
+        if msg.reason != self.datapath.ofproto.OFPR_NO_MATCH:
+            return False
+        key = flow_key(msg.data)
+        if key is None:
+            return False
+        key = (in_port, key)
+
+        now = time.time()
+        flows = self.flows
+        while flows:
+            first = next(flows.iterkeys())
+            if flows[first][0] > now:
+                break
+            del flows[first]
+
+        entry = flows.get(key)
+        if entry is None:
+            flows[key] = [now + self.window, None]
+            self.misses += 1
+            return False
+
+        self.hits += 1
+        held = entry[1]
+        if held is None:
+            held = entry[1] = []
+            hub.spawn(self._release, entry[0], in_port, held)
+        if len(held) < MAX_HELD:
+            held.append(msg)
+        else:
+            self.dropped += 1
+        return True
+
+    def _release(self, deadline, in_port, held):
+        hub.sleep(max(deadline - time.time(), 0))
+        dp = self.datapath
+        if not dp.is_active:
+            return
+
+        ofproto = dp.ofproto
+        parser = dp.ofproto_parser
+        for msg in held:
+            if msg.buffer_id == ofproto.OFP_NO_BUFFER:
+                data = msg.data
+            else:
+                data = None
+            actions = [parser.OFPActionOutput(ofproto.OFPP_TABLE)]
+            out = parser.OFPPacketOut(dp, buffer_id=msg.buffer_id,
+                                      in_port=in_port, actions=actions,
+                                      data=data)
+            try:
+                dp.send_msg(out)
+            except exception.OFPSendQueueFull as e:
+                dp._send_q_failed(e, msg)
+        self.released += len(held)
+
+    def get_stats(self):
+        return {
+            'coalesced': self.hits,
+            'coalesce_misses': self.misses,
+            'coalesce_released': self.released,
+            'coalesce_dropped': self.dropped,
+        }
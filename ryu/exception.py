@@ -39,6 +39,20 @@ class OFPMalformedMessage(RyuException):
     message = 'malformed message'
 
 
+class OFPSendQueueFull(RyuException):
+    message = 'send queue of datapath %(dpid)s is full'
+
+
+class OFPRequestError(RyuException):
+    message = 'request %(xid)s to datapath %(dpid)s failed: ' \
+              'error type %(type)s code %(code)s'
+
+
+class OFPRequestAborted(RyuException):
+    message = 'datapath %(dpid)s disconnected before replying to ' \
+              'request %(xid)s'
+
+
 class NetworkNotFound(RyuException):
     message = 'no such network id %(network_id)s'
 
@@ -0,0 +1,106 @@
+# Copyright (C) 2013 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import bisect
+import logging
+import time
+
+LOG = logging.getLogger('ryu.lib.handler_profiler')
+
+# upper bounds in seconds of the buckets of the latency histograms.
+# the last bucket counts everything above the last bound.
+LATENCY_BUCKETS = [0.0001, 0.001, 0.01, 0.1, 1.0]
+
+
+class LatencyStats(object):
+    """Call count, cumulative time and histogram of latencies."""
+
+    def __init__(self):
+        super(LatencyStats, self).__init__()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def add(self, latency):
+        self.count += 1
+        self.total += latency
+        if latency > self.max:
+            self.max = latency
+        self.histogram[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'total': self.total,
+            'max': self.max,
+            'histogram': list(self.histogram),
+        }
+
+
+class HandlerProfiler(object):
+    """Latency profiler of the event handlers of an application.
+
+    It records the latency of each handler called through call() and
+    the time events waited in the event queue of the application.  The
+    callers are expected to check ``enabled`` first and call handlers
+    directly when it is False, so that a disabled profiler costs no more
+    than the check.  A handler which takes longer than
+    ``slow_threshold`` seconds is logged.
+    """
+
+    def __init__(self, name, slow_threshold=None):
+        super(HandlerProfiler, self).__init__()
+        self.name = name
+        self.slow_threshold = slow_threshold
+        self.enabled = False
+        self.handlers = {}      # handler name -> LatencyStats
+        self.queue_waits = {}   # ev_cls name -> LatencyStats
+
+    def call(self, handler, ev):
+        start = time.time()
+        try:
+            handler(ev)
+        finally:
+            latency = time.time() - start
+            name = handler.__name__
+            stats = self.handlers.get(name)
+            if stats is None:
+                stats = self.handlers[name] = LatencyStats()
+            stats.add(latency)
+            if self.slow_threshold and latency > self.slow_threshold:
+                LOG.warning('slow handler %s.%s took %f sec for %s',
+                            self.name, name, latency,
+                            ev.__class__.__name__)
+
+    def queue_wait(self, ev, enqueued):
+        name = ev.__class__.__name__
+        stats = self.queue_waits.get(name)
+        if stats is None:
+            stats = self.queue_waits[name] = LatencyStats()
+        stats.add(time.time() - enqueued)
+
+    def reset(self):
+        self.handlers.clear()
+        self.queue_waits.clear()
+
+    def to_dict(self):
+        return {
+            'enabled': self.enabled,
+            'handlers': dict((name, stats.to_dict()) for name, stats
+                             in self.handlers.iteritems()),
+            'queue_waits': dict((name, stats.to_dict()) for name, stats
+                                in self.queue_waits.iteritems()),
+        }
@@ -28,6 +28,7 @@ LOG = logging.getLogger('ryu.lib.hub')
 if HUB_TYPE == 'eventlet':
     import eventlet
     import eventlet.event
+    import eventlet.hubs
     import eventlet.queue
     import eventlet.timeout
     import eventlet.wsgi
@@ -57,6 +58,12 @@ if HUB_TYPE == 'eventlet':
 
         return eventlet.spawn(_launch, *args, **kwargs)
 
+    def call_after(seconds, func, *args, **kwargs):
+        # run func in the hub itself after seconds, without a greenthread.
+        # func must not block.  the returned timer has cancel().
+        return eventlet.hubs.get_hub().schedule_call_global(
+            seconds, func, *args, **kwargs)
+
     def kill(thread):
         thread.kill()
 
@@ -137,3 +144,31 @@ if HUB_TYPE == 'eventlet':
                     pass
 
             return self._cond
+
+    class AsyncResult(object):
+        """A result which is set once and can be waited for by any
+        number of greenthreads.  This mimics gevent's AsyncResult.
+        """
+        def __init__(self):
+            self._ev = eventlet.event.Event()
+
+        def ready(self):
+            return self._ev.ready()
+
+        def successful(self):
+            return self._ev.ready() and not self._ev.has_exception()
+
+        def set(self, value=None):
+            self._ev.send(value)
+
+        def set_exception(self, exc):
+            self._ev.send_exception(exc)
+
+        def get(self, block=True, timeout=None):
+            if not self._ev.ready():
+                if not block:
+                    raise Timeout()
+                if timeout is not None:
+                    with Timeout(timeout):
+                        return self._ev.wait()
+            return self._ev.wait()
@@ -17,6 +17,7 @@ import struct
 import socket
 import logging
 
+from ryu import exception
 from ryu.ofproto import ofproto_v1_0
 from ryu.lib import hub
 from ryu.lib.mac import haddr_to_bin, haddr_to_str
@@ -197,23 +198,19 @@ def nw_dst_to_str(wildcards, addr):
     return ip
 
 
+# waiters of the functions below is ignored.  it's only accepted for
+# the callers which used to pass the dict of the waiters for the replies.
 def send_stats_request(dp, stats, waiters, msgs):
-    dp.set_xid(stats)
-    waiters_per_dp = waiters.setdefault(dp.id, {})
-    lock = hub.Event()
-    waiters_per_dp[stats.xid] = (lock, msgs)
-    dp.send_msg(stats)
-
     try:
-        lock.wait(timeout=DEFAULT_TIMEOUT)
-    except hub.Timeout:
-        del waiters_per_dp[stats.xid]
+        msgs.extend(dp.send_request(stats, timeout=DEFAULT_TIMEOUT).get())
+    except (hub.Timeout, exception.RyuException), e:
+        LOG.debug('stats request %s failed: %s', stats.xid, e)
 
 
-def get_desc_stats(dp, waiters):
+def get_desc_stats(dp, waiters=None):
     stats = dp.ofproto_parser.OFPDescStatsRequest(dp, 0)
     msgs = []
-    send_stats_request(dp, stats, waiters, msgs)
+    send_stats_request(dp, stats, None, msgs)
 
     for msg in msgs:
         stats = msg.body
@@ -226,13 +223,13 @@ def get_desc_stats(dp, waiters):
     return desc
 
 
-def get_flow_stats(dp, waiters):
+def get_flow_stats(dp, waiters=None):
     match = dp.ofproto_parser.OFPMatch(
         dp.ofproto.OFPFW_ALL, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
     stats = dp.ofproto_parser.OFPFlowStatsRequest(
         dp, 0, match, 0xff, dp.ofproto.OFPP_NONE)
     msgs = []
-    send_stats_request(dp, stats, waiters, msgs)
+    send_stats_request(dp, stats, None, msgs)
 
     flows = []
     for msg in msgs:
@@ -256,11 +253,11 @@ def get_flow_stats(dp, waiters):
     return flows
 
 
-def get_port_stats(dp, waiters):
+def get_port_stats(dp, waiters=None):
     stats = dp.ofproto_parser.OFPPortStatsRequest(
         dp, 0, dp.ofproto.OFPP_NONE)
     msgs = []
-    send_stats_request(dp, stats, waiters, msgs)
+    send_stats_request(dp, stats, None, msgs)
 
     ports = []
     for msg in msgs:
@@ -17,6 +17,7 @@ import struct
 import socket
 import logging
 
+from ryu import exception
 from ryu.ofproto import inet
 from ryu.ofproto import ofproto_v1_2
 from ryu.ofproto import ofproto_v1_2_parser
@@ -190,20 +191,16 @@ def match_ip_to_str(value, mask):
     return ip + netmask
 
 
+# waiters of the functions below is ignored.  it's only accepted for
+# the callers which used to pass the dict of the waiters for the replies.
 def send_stats_request(dp, stats, waiters, msgs):
-    dp.set_xid(stats)
-    waiters_per_dp = waiters.setdefault(dp.id, {})
-    lock = hub.Event()
-    waiters_per_dp[stats.xid] = (lock, msgs)
-    dp.send_msg(stats)
-
     try:
-        lock.wait(timeout=DEFAULT_TIMEOUT)
-    except hub.Timeout:
-        del waiters_per_dp[stats.xid]
+        msgs.extend(dp.send_request(stats, timeout=DEFAULT_TIMEOUT).get())
+    except (hub.Timeout, exception.RyuException), e:
+        LOG.debug('stats request %s failed: %s', stats.xid, e)
 
 
-def get_flow_stats(dp, waiters):
+def get_flow_stats(dp, waiters=None):
     table_id = 0
     out_port = dp.ofproto.OFPP_ANY
     out_group = dp.ofproto.OFPG_ANY
@@ -215,7 +212,7 @@ def get_flow_stats(dp, waiters):
         dp, table_id, out_port, out_group, cookie, cookie_mask, match)
 
     msgs = []
-    send_stats_request(dp, stats, waiters, msgs)
+    send_stats_request(dp, stats, None, msgs)
 
     flows = []
     for msg in msgs:
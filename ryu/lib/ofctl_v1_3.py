@@ -17,6 +17,7 @@ import struct
 import socket
 import logging
 
+from ryu import exception
 from ryu.ofproto import inet
 from ryu.ofproto import ofproto_v1_3
 from ryu.ofproto import ofproto_v1_3_parser
@@ -281,23 +282,30 @@ def match_ip_to_str(value, mask):
     return ip + netmask
 
 
+# waiters of the functions below is ignored.  it's only accepted for
+# the callers which used to pass the dict of the waiters for the replies.
 def send_stats_request(dp, stats, waiters, msgs):
-    dp.set_xid(stats)
-    waiters_per_dp = waiters.setdefault(dp.id, {})
-    lock = hub.Event()
-    waiters_per_dp[stats.xid] = (lock, msgs)
-    dp.send_msg(stats)
+    try:
+        msgs.extend(dp.send_request(stats, timeout=DEFAULT_TIMEOUT).get())
+    except (hub.Timeout, exception.RyuException), e:
+        LOG.debug('stats request %s failed: %s', stats.xid, e)
+
 
+def iter_stats_replies(dp, stats):
+    """
+    Iterate over the replies to a stats request as they arrive.
+    """
     try:
-        lock.wait(timeout=DEFAULT_TIMEOUT)
-    except hub.Timeout:
-        del waiters_per_dp[stats.xid]
+        for msg in dp.send_stream_request(stats, timeout=DEFAULT_TIMEOUT):
+            yield msg
+    except (hub.Timeout, exception.RyuException), e:
+        LOG.debug('stats request %s failed: %s', stats.xid, e)
 
 
-def get_desc_stats(dp, waiters):
+def get_desc_stats(dp, waiters=None):
     stats = dp.ofproto_parser.OFPDescStatsRequest(dp, 0)
     msgs = []
-    send_stats_request(dp, stats, waiters, msgs)
+    send_stats_request(dp, stats, None, msgs)
 
     for msg in msgs:
         stats = msg.body
@@ -310,7 +318,11 @@ def get_desc_stats(dp, waiters):
     return desc
 
 
-def get_flow_stats(dp, waiters):
+def iter_flow_stats(dp):
+    """
+    Iterate over the flow stats of the switch, a flow at a time, as the
+    replies arrive.
+    """
     table_id = 0
     flags = 0
     out_port = dp.ofproto.OFPP_ANY
@@ -323,12 +335,8 @@ def get_flow_stats(dp, waiters):
         dp, flags, table_id, out_port, out_group, cookie, cookie_mask,
         match)
 
-    msgs = []
-    send_stats_request(dp, stats, waiters, msgs)
-
-    flows = []
-    for msg in msgs:
-        for stats in msg.body:
+    for msg in iter_stats_replies(dp, stats):
+        for stats in msg.iter_body():
             actions = actions_to_str(stats.instructions)
             match = match_to_str(stats.match)
 
@@ -343,21 +351,24 @@ def get_flow_stats(dp, waiters):
                  'duration_nsec': stats.duration_nsec,
                  'packet_count': stats.packet_count,
                  'table_id': stats.table_id}
-            flows.append(s)
-    flows = {str(dp.id): flows}
+            yield s
 
+
+def get_flow_stats(dp, waiters=None):
+    flows = {str(dp.id): list(iter_flow_stats(dp))}
     return flows
 
 
-def get_port_stats(dp, waiters):
+def iter_port_stats(dp):
+    """
+    Iterate over the port stats of the switch, a port at a time, as the
+    replies arrive.
+    """
     stats = dp.ofproto_parser.OFPPortStatsRequest(
         dp, 0, dp.ofproto.OFPP_ANY)
-    msgs = []
-    send_stats_request(dp, stats, waiters, msgs)
 
-    ports = []
-    for msg in msgs:
-        for stats in msg.body:
+    for msg in iter_stats_replies(dp, stats):
+        for stats in msg.iter_body():
             s = {'port_no': stats.port_no,
                  'rx_packets': stats.rx_packets,
                  'tx_packets': stats.tx_packets,
@@ -371,11 +382,42 @@ def get_port_stats(dp, waiters):
                  'rx_over_err': stats.rx_over_err,
                  'rx_crc_err': stats.rx_crc_err,
                  'collisions': stats.collisions}
-            ports.append(s)
-    ports = {str(dp.id): ports}
+            yield s
+
+
+def get_port_stats(dp, waiters=None):
+    ports = {str(dp.id): list(iter_port_stats(dp))}
     return ports
 
 
+def iter_group_stats(dp):
+    """
+    Iterate over the group stats of the switch, a group at a time, as
+    the replies arrive.
+    """
+    stats = dp.ofproto_parser.OFPGroupStatsRequest(
+        dp, 0, dp.ofproto.OFPG_ALL)
+
+    for msg in iter_stats_replies(dp, stats):
+        for stats in msg.iter_body():
+            bucket_stats = [{'packet_count': c.packet_count,
+                             'byte_count': c.byte_count}
+                            for c in stats.bucket_stats]
+            s = {'group_id': stats.group_id,
+                 'ref_count': stats.ref_count,
+                 'packet_count': stats.packet_count,
+                 'byte_count': stats.byte_count,
+                 'duration_sec': stats.duration_sec,
+                 'duration_nsec': stats.duration_nsec,
+                 'bucket_stats': bucket_stats}
+            yield s
+
+
+def get_group_stats(dp):
+    groups = {str(dp.id): list(iter_group_stats(dp))}
+    return groups
+
+
 def mod_flow_entry(dp, flow, cmd):
     cookie = int(flow.get('cookie', 0))
     cookie_mask = int(flow.get('cookie_mask', 0))
@@ -17,7 +17,6 @@
 import logging
 from abc import ABCMeta, abstractmethod
 
-from ryu.lib.packet import packet
 
 LOG = logging.getLogger(__name__)
 
@@ -25,7 +24,7 @@ LOG = logging.getLogger(__name__)
 def packet_in_filter(cls, args=None):
     def _packet_in_filter(packet_in_handler):
         def __packet_in_filter(self, ev):
-            pkt = packet.Packet(ev.msg.data)
+            pkt = ev.packet
             if not packet_in_handler.pkt_in_filter.filter(pkt):
                 LOG.debug('The packet is discarded by %s: %s' % (cls, pkt))
                 return
@@ -0,0 +1,258 @@
+# Copyright (C) 2013 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Decoding of OpenFlow 1.3 stats replies into NumPy structured arrays.
+
+The entries of the port, queue and table stats replies have a fixed
+layout, so the body of a reply is read by numpy.frombuffer() in place
+of decoding an object for each entry.  The flow stats entries have a
+variable length because of their match and instructions, so only their
+fixed fields are gathered, e.g. the counters and the durations, along
+with ``match_hash``, a 64 bit digest of the serialized match which
+identifies the flow entry together with the table and the priority.
+
+The arrays of two polls are compared with align(), delta() and rate(),
+e.g. the utilization of the ports of some switches::
+
+    prev = from_replies(prev_replies)
+    cur = from_replies(cur_replies)
+    prev, cur = align(prev, cur, PORT_KEYS)
+    bps = rate(prev, cur, 'tx_bytes') * 8
+
+where prev_replies and cur_replies map each dpid to the port stats
+replies from Datapath.send_request().
+
+NumPy is optional for Ryu and is needed only by this module.
+"""
+
+import hashlib
+import re
+import struct
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_3_parser
+
+# the fields which identify an entry among the ones of a switch
+PORT_KEYS = ('dpid', 'port_no')
+QUEUE_KEYS = ('dpid', 'port_no', 'queue_id')
+TABLE_KEYS = ('dpid', 'table_id')
+FLOW_KEYS = ('dpid', 'table_id', 'priority', 'cookie', 'match_hash')
+
+_FLOW_STATS_0_FIELDS = ('length', 'table_id', 'duration_sec',
+                        'duration_nsec', 'priority', 'idle_timeout',
+                        'hard_timeout', 'flags', 'cookie', 'packet_count',
+                        'byte_count')
+
+_FORMAT_RE = re.compile(r'(\d*)([xBHIQ])')
+_LENGTH_STRUCT = struct.Struct('!H')
+# type and length of ofp_match
+_MATCH_HEADER_STRUCT = struct.Struct('!HH')
+
+_DTYPES = {}
+
+
+def _check_numpy():
+    if np is None:
+        raise ImportError('numpy is required for the stats arrays')
+
+
+def _dtype(fmt, names):
+    """
+    Return the big endian dtype of the fields ``names`` packed as the
+    struct format ``fmt``.
+    """
+    names = list(names)
+    fields = {'names': [], 'formats': [], 'offsets': []}
+    offset = 0
+    for count, code in _FORMAT_RE.findall(fmt.lstrip('!')):
+        count = int(count or 1)
+        if code == 'x':
+            offset += count
+            continue
+        size = struct.calcsize('!' + code)
+        for _i in range(count):
+            fields['names'].append(names.pop(0))
+            fields['formats'].append('>u%d' % size)
+            fields['offsets'].append(offset)
+            offset += size
+    assert not names
+    assert offset == struct.calcsize(fmt)
+    fields['itemsize'] = offset
+    return np.dtype(fields)
+
+
+def _stats_dtype(body_cls):
+    dtype = _DTYPES.get(body_cls)
+    if dtype is not None:
+        return dtype
+    if body_cls is ofproto_v1_3_parser.OFPPortStats:
+        dtype = _dtype(ofproto_v1_3.OFP_PORT_STATS_PACK_STR,
+                       body_cls._fields)
+    elif body_cls is ofproto_v1_3_parser.OFPQueueStats:
+        dtype = _dtype(ofproto_v1_3.OFP_QUEUE_STATS_PACK_STR,
+                       body_cls._fields)
+    elif body_cls is ofproto_v1_3_parser.OFPTableStats:
+        dtype = _dtype(ofproto_v1_3.OFP_TABLE_STATS_PACK_STR,
+                       body_cls._fields)
+    elif body_cls is ofproto_v1_3_parser.OFPFlowStats:
+        # match_hash follows the fixed fields
+        dtype = _dtype(ofproto_v1_3.OFP_FLOW_STATS_0_PACK_STR + 'Q',
+                       _FLOW_STATS_0_FIELDS + ('match_hash',))
+    else:
+        raise ValueError('no stats array for %s' % body_cls.__name__)
+    _DTYPES[body_cls] = dtype
+    return dtype
+
+
+def _flow_stats_array(buf, offset, end, dtype):
+    # only the length of each entry and the digest of its match are
+    # computed in python.  the fixed fields of the entries are gathered
+    # by numpy at once.
+    size = ofproto_v1_3.OFP_FLOW_STATS_0_SIZE
+    offsets = []
+    digests = []
+    while offset < end:
+        offsets.append(offset)
+        (length,) = _LENGTH_STRUCT.unpack_from(buf, offset)
+        match = offset + size
+        (_type, match_len) = _MATCH_HEADER_STRUCT.unpack_from(buf, match)
+        digests.append(hashlib.md5(buf[match:match + match_len]).digest()[:8])
+        offset += length
+    if not offsets:
+        return np.zeros(0, dtype)
+    data = np.frombuffer(buf, np.uint8, end)
+    rows = np.empty((len(offsets), dtype.itemsize), np.uint8)
+    rows[:, :size] = data[np.array(offsets)[:, None] + np.arange(size)]
+    rows[:, size:] = np.frombuffer(''.join(digests),
+                                   np.uint8).reshape(-1, 8)
+    return rows.view(dtype).reshape(-1)
+
+
+def to_array(msg):
+    """
+    Return the structured array of the body of a port, queue, table or
+    flow stats reply.  The array of the fixed size entries shares the
+    buffer of the message.
+    """
+    _check_numpy()
+    assert msg.version == ofproto_v1_3.OFP_VERSION
+    dtype = _stats_dtype(msg.cls_stats_body_cls)
+    offset = ofproto_v1_3.OFP_MULTIPART_REPLY_SIZE
+    if msg.cls_stats_body_cls is ofproto_v1_3_parser.OFPFlowStats:
+        return _flow_stats_array(msg.buf, offset, msg.msg_len, dtype)
+    count = (msg.msg_len - offset) // dtype.itemsize
+    return np.frombuffer(msg.buf, dtype, count, offset)
+
+
+def from_replies(replies):
+    """
+    Return a single structured array of the stats replies.  ``replies``
+    maps each dpid to its replies, e.g. the result of send_request(),
+    and the array has the fields of the entries after a ``dpid`` field.
+    """
+    _check_numpy()
+    arrays = []
+    for dpid, msgs in sorted(replies.items()):
+        for msg in msgs:
+            arrays.append((dpid, to_array(msg)))
+    if not arrays:
+        raise ValueError('no stats replies')
+
+    src = arrays[0][1].dtype
+    dtype = np.dtype([('dpid', '>u8')] +
+                     [(name, src[name]) for name in src.names])
+    out = np.empty(sum(len(a) for _dpid, a in arrays), dtype)
+    start = 0
+    for dpid, a in arrays:
+        end = start + len(a)
+        out['dpid'][start:end] = dpid
+        for name in src.names:
+            out[name][start:end] = a[name]
+        start = end
+    return out
+
+
+def _keys(a, keys):
+    # the key fields of each entry as a single opaque value, so that
+    # the entries can be sorted and looked up by them at once
+    dtype = np.dtype([(name, a.dtype[name]) for name in keys])
+    k = np.empty(len(a), dtype)
+    for name in keys:
+        k[name] = a[name]
+    return k.view('V%d' % dtype.itemsize).reshape(-1)
+
+
+def align(prev, cur, keys):
+    """
+    Return the entries of ``prev`` and ``cur`` found in both of them,
+    in the same order, identifying entries by the fields ``keys``.
+    e.g. PORT_KEYS.
+    """
+    _check_numpy()
+    if not len(prev) or not len(cur):
+        return prev[:0], cur[:0]
+    prev_keys = _keys(prev, keys)
+    cur_keys = _keys(cur, keys)
+    order = np.argsort(prev_keys, kind='mergesort')
+    pos = np.searchsorted(prev_keys, cur_keys, sorter=order)
+    index = order[np.minimum(pos, len(order) - 1)]
+    found = prev_keys[index] == cur_keys
+    return prev[index[found]], cur[found]
+
+
+def delta(prev, cur, field):
+    """
+    Return the increase of the counter ``field`` from the aligned
+    entries ``prev`` to ``cur``.  The 64 bit counters which have
+    wrapped around count from the maximum.
+    """
+    _check_numpy()
+    return cur[field].astype(np.uint64) - prev[field].astype(np.uint64)
+
+
+def elapsed(prev, cur):
+    """
+    Return the seconds between the aligned entries ``prev`` and ``cur``
+    by their durations.  It's not positive for the entries which have
+    been recreated in between.
+    """
+    _check_numpy()
+    return ((cur['duration_sec'].astype(np.float64) -
+             prev['duration_sec']) +
+            (cur['duration_nsec'].astype(np.float64) -
+             prev['duration_nsec']) / 1e9)
+
+
+def rate(prev, cur, field, interval=None):
+    """
+    Return the increase per second of the counter ``field`` from the
+    aligned entries ``prev`` to ``cur``.  ``interval`` is the seconds
+    between them, which defaults to elapsed() and is needed for the
+    table stats without durations.  The rate is NaN where the interval
+    isn't positive.
+    """
+    _check_numpy()
+    if interval is None:
+        interval = elapsed(prev, cur)
+    interval = np.asarray(interval, np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = delta(prev, cur, field) / interval
+    return np.where(interval > 0, r, np.nan)
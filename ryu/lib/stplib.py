@@ -242,7 +242,7 @@ class Stp(app_manager.RyuApp):
     def packet_in_handler(self, ev):
         if ev.msg.datapath.id in self.bridge_list:
             bridge = self.bridge_list[ev.msg.datapath.id]
-            bridge.packet_in_handler(ev.msg)
+            bridge.packet_in_handler(ev.msg, ev.packet)
 
     @set_ev_cls(ofp_event.EventOFPPortStatus, handler.MAIN_DISPATCHER)
     def port_status_handler(self, ev):
@@ -418,11 +418,10 @@ class Bridge(object):
         if init_stp_flg:
             self.recalculate_spanning_tree()
 
-    def packet_in_handler(self, msg):
+    def packet_in_handler(self, msg, pkt):
         if not msg.in_port in self.ports:
             return
 
-        pkt = packet.Packet(msg.data)
         in_port = self.ports[msg.in_port]
 
         if bpdu.ConfigurationBPDUs in pkt:
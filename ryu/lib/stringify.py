@@ -78,6 +78,10 @@ _types = {
 
 class StringifyMixin(object):
 
+    # no instance attributes here, so that the sub classes with
+    # __slots__ don't get __dict__ from this class
+    __slots__ = ()
+
     _TYPE = {}
     """_TYPE class attribute is used to annotate types of attributes.
 
@@ -299,6 +303,24 @@ class StringifyMixin(object):
             raise
 
 
+_SLOTS = {}
+
+
+def _class_slots(cls):
+    """the attribute names in __slots__ of cls and its base classes
+    """
+    slots = _SLOTS.get(cls)
+    if slots is None:
+        slots = set()
+        for c in cls.__mro__:
+            names = c.__dict__.get('__slots__', ())
+            if isinstance(names, basestring):
+                names = (names,)
+            slots.update(names)
+        _SLOTS[cls] = slots
+    return slots
+
+
 def obj_python_attrs(msg_):
     """iterate object attributes for stringify purposes
     """
@@ -310,6 +332,8 @@ def obj_python_attrs(msg_):
             yield(k, getattr(msg_, k))
         return
     base = getattr(msg_, '_base_attributes', [])
+    # the attributes in __slots__ are descriptors of the class
+    slots = _class_slots(msg_.__class__)
     for k, v in inspect.getmembers(msg_):
         if k.startswith('_'):
             continue
@@ -317,7 +341,7 @@ def obj_python_attrs(msg_):
             continue
         if k in base:
             continue
-        if hasattr(msg_.__class__, k):
+        if hasattr(msg_.__class__, k) and k not in slots:
             continue
         yield (k, v)
 
@@ -0,0 +1,48 @@
+# Copyright (C) 2013 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+
+class TokenBucket(object):
+    """Token bucket rate limiter.
+
+    The bucket is refilled with ``rate`` tokens per second and holds at
+    most ``burst`` tokens, which is ``rate`` by default.  It starts
+    full.
+    """
+
+    def __init__(self, rate, burst=None):
+        super(TokenBucket, self).__init__()
+        assert rate > 0
+        self.rate = rate
+        self.burst = max(burst or rate, 1)
+        self.tokens = self.burst
+        self.timestamp = time.time()
+
+    def consume(self, tokens=1):
+        """Take tokens out of the bucket.
+
+        Returns True if there were enough tokens, otherwise False and
+        no token is taken.
+        """
+        now = time.time()
+        self.tokens = min(self.burst,
+                          self.tokens + (now - self.timestamp) * self.rate)
+        self.timestamp = now
+        if self.tokens < tokens:
+            return False
+        self.tokens -= tokens
+        return True
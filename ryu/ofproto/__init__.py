@@ -62,7 +62,7 @@ def get_ofp_module(ofp_version):
 def get_ofp_cls(ofp_version, name):
     """get class for name of a given OF version"""
     (_consts_mod, parser_mod) = get_ofp_module(ofp_version)
-    for i in inspect.getmembers(parser_mod, inspect.isclass):
-        if i[0] == name:
-            return i[1]
+    cls = getattr(parser_mod, name, None)
+    if inspect.isclass(cls):
+        return cls
     return None
@@ -21,6 +21,9 @@ OFP_HEADER_PACK_STR = '!BBHI'
 OFP_HEADER_SIZE = 8
 assert calcsize(OFP_HEADER_PACK_STR) == OFP_HEADER_SIZE
 
+# the length field of ofp_header is 16 bits
+OFP_MAX_MSG_LEN = 0xffff
+
 # note: while IANA assigned port number for OpenFlow is 6653,
 # 6633 is (still) the defacto standard.
 OFP_TCP_PORT = 6633
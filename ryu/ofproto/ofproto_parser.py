@@ -25,14 +25,18 @@ from ryu import utils
 from ryu.lib import stringify
 
 from . import ofproto_common
+from . import ofproto_struct
 
 LOG = logging.getLogger('ryu.ofproto.ofproto_parser')
 
 
-def header(buf):
-    assert len(buf) >= ofproto_common.OFP_HEADER_SIZE
+_HEADER_STRUCT = ofproto_struct.get_struct(ofproto_common.OFP_HEADER_PACK_STR)
+
+
+def header(buf, offset=0):
+    assert len(buf) >= offset + ofproto_common.OFP_HEADER_SIZE
     #LOG.debug('len %d bufsize %d', len(buf), ofproto.OFP_HEADER_SIZE)
-    return struct.unpack_from(ofproto_common.OFP_HEADER_PACK_STR, buffer(buf))
+    return _HEADER_STRUCT.unpack_from(buffer(buf), offset)
 
 
 _MSG_PARSERS = {}
@@ -110,6 +114,7 @@ def ofp_msg_from_jsondict(dp, jsondict):
 
 
 class StringifyMixin(stringify.StringifyMixin):
+    __slots__ = ()
     _class_prefixes = ["OFP", "ONF", "MT"]
 
     @classmethod
@@ -137,6 +142,9 @@ class MsgBase(StringifyMixin):
     ========= ==============================
     """
 
+    # no __slots__.  the messages keep a __dict__ for the lazy attributes
+    # and the attributes which the parsers of each message set.
+
     @create_list_of_base_attributes
     def __init__(self, datapath):
         super(MsgBase, self).__init__()
@@ -162,6 +170,40 @@ class MsgBase(StringifyMixin):
     def set_buf(self, buf):
         self.buf = buffer(buf)
 
+    def _set_lazy_attr(self, name, decoder, *args):
+        """
+        Defer decoding of the attribute until it's accessed for the first
+        time. Then decoder(*args) is called and its return value becomes
+        the attribute.
+        Note that a malformed field is detected only at that time.
+        """
+        self.__dict__.pop(name, None)
+        self.__dict__.setdefault('_lazy_attrs', {})[name] = (decoder, args)
+
+    def __getattr__(self, name):
+        # called only when the attribute isn't found in the usual way
+        lazy_attrs = self.__dict__.get('_lazy_attrs')
+        if not lazy_attrs or name not in lazy_attrs:
+            raise AttributeError(name)
+        decoder, args = lazy_attrs.pop(name)
+        value = decoder(*args)
+        setattr(self, name, value)
+        return value
+
+    def _decode_lazy_attrs(self):
+        lazy_attrs = self.__dict__.get('_lazy_attrs')
+        while lazy_attrs:
+            name = next(iter(lazy_attrs))
+            if name in self.__dict__:
+                # overwritten before being decoded
+                del lazy_attrs[name]
+                continue
+            getattr(self, name)
+
+    def stringify_attrs(self):
+        self._decode_lazy_attrs()
+        return super(MsgBase, self).stringify_attrs()
+
     def __str__(self):
         buf = 'version: 0x%x msg_type 0x%x xid 0x%x ' % (self.version,
                                                          self.msg_type,
@@ -222,7 +264,8 @@ def msg_pack_into(fmt, buf, offset, *args):
 def namedtuple(typename, fields, **kwargs):
     class _namedtuple(StringifyMixin,
                       collections.namedtuple(typename, fields, **kwargs)):
-        pass
+        # the sub classes without __slots__ have __dict__ as usual
+        __slots__ = ()
     return _namedtuple
 
 
@@ -0,0 +1,56 @@
+# Copyright (C) 2013 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Precompiled struct.Struct of the OpenFlow wire formats.
+
+This module depends only on the standard library, so that the constant
+modules, e.g. ofproto_v1_3, can use it without depending on the parsers.
+"""
+
+import struct
+import sys
+
+
+_STRUCTS = {}
+
+
+def get_struct(fmt):
+    """
+    Return the precompiled struct.Struct for the format string *fmt*.
+    The Structs are cached, unlike the ones struct.pack() and
+    struct.unpack_from() compile from a cache which is flushed once it
+    holds 100 formats.
+    """
+    s = _STRUCTS.get(fmt)
+    if s is None:
+        s = _STRUCTS[fmt] = struct.Struct(fmt)
+    return s
+
+
+def generate_structs(modname):
+    """
+    Add FOO_STRUCT, the precompiled struct.Struct of FOO_PACK_STR, to the
+    module for each FOO_PACK_STR in it, and likewise FOO_STRUCT0 for
+    FOO_PACK_STR0.  The parsers and serializers use them instead of
+    passing the format strings to struct functions.
+    """
+    mod = sys.modules[modname]
+    for k, v in vars(mod).items():
+        if k.startswith('_') or not isinstance(v, str):
+            continue
+        head, sep, tail = k.rpartition('_PACK_STR')
+        if sep and (not tail or tail.isdigit()):
+            setattr(mod, head + '_STRUCT' + tail, get_struct(v))
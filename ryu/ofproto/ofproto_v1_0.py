@@ -16,6 +16,8 @@
 
 from struct import calcsize
 
+from ryu.ofproto import ofproto_struct
+
 
 MAX_XID = 0xffffffff
 
@@ -803,3 +805,5 @@ NX_LEARN_DST_LOAD = 1 << 11  # Add NXAST_REG_LOAD action
 NX_LEARN_DST_OUTPUT = 2 << 11  # Add OFPAT_OUTPUT action.
 NX_LEARN_DST_RESERVED = 3 << 11  # Not yet defined.
 NX_LEARN_DST_MASK = 3 << 11
+
+ofproto_struct.generate_structs(__name__)
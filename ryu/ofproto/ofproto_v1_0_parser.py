@@ -96,8 +96,7 @@ class OFPPhyPort(ofproto_parser.namedtuple('OFPPhyPort', (
 
     @classmethod
     def parser(cls, buf, offset):
-        port = struct.unpack_from(ofproto_v1_0.OFP_PHY_PORT_PACK_STR,
-                                  buf, offset)
+        port = ofproto_v1_0.OFP_PHY_PORT_STRUCT.unpack_from(buf, offset)
         port = list(port)
         i = cls._fields.index('hw_addr')
         port[i] = addrconv.mac.bin_to_text(port[i])
@@ -207,8 +206,7 @@ class OFPMatch(StringifyMixin):
 
     @classmethod
     def parse(cls, buf, offset):
-        match = struct.unpack_from(ofproto_v1_0.OFP_MATCH_PACK_STR,
-                                   buf, offset)
+        match = ofproto_v1_0.OFP_MATCH_STRUCT.unpack_from(buf, offset)
         return cls(*match)
 
 
@@ -243,8 +241,8 @@ class OFPAction(OFPActionHeader):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_ = struct.unpack_from(
-            ofproto_v1_0.OFP_ACTION_HEADER_PACK_STR, buf, offset)
+        type_, len_ = ofproto_v1_0.OFP_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         cls_ = cls._ACTION_TYPES.get(type_)
         assert cls_ is not None
         return cls_.parser(buf, offset)
@@ -263,8 +261,9 @@ class OFPActionOutput(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, port, max_len = struct.unpack_from(
-            ofproto_v1_0.OFP_ACTION_OUTPUT_PACK_STR, buf, offset)
+        (type_, len_, port,
+         max_len) = ofproto_v1_0.OFP_ACTION_OUTPUT_STRUCT.unpack_from(
+            buf, offset)
         assert type_ == ofproto_v1_0.OFPAT_OUTPUT
         assert len_ == ofproto_v1_0.OFP_ACTION_OUTPUT_SIZE
         return cls(port, max_len)
@@ -283,8 +282,9 @@ class OFPActionVlanVid(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, vlan_vid = struct.unpack_from(
-            ofproto_v1_0.OFP_ACTION_VLAN_VID_PACK_STR, buf, offset)
+        (type_, len_,
+         vlan_vid) = ofproto_v1_0.OFP_ACTION_VLAN_VID_STRUCT.unpack_from(
+            buf, offset)
         assert type_ == ofproto_v1_0.OFPAT_SET_VLAN_VID
         assert len_ == ofproto_v1_0.OFP_ACTION_VLAN_VID_SIZE
         return cls(vlan_vid)
@@ -303,8 +303,9 @@ class OFPActionVlanPcp(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, vlan_pcp = struct.unpack_from(
-            ofproto_v1_0.OFP_ACTION_VLAN_PCP_PACK_STR, buf, offset)
+        (type_, len_,
+         vlan_pcp) = ofproto_v1_0.OFP_ACTION_VLAN_PCP_STRUCT.unpack_from(
+            buf, offset)
         assert type_ == ofproto_v1_0.OFPAT_SET_VLAN_PCP
         assert len_ == ofproto_v1_0.OFP_ACTION_VLAN_PCP_SIZE
         return cls(vlan_pcp)
@@ -322,8 +323,8 @@ class OFPActionStripVlan(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_ = struct.unpack_from(
-            ofproto_v1_0.OFP_ACTION_HEADER_PACK_STR, buf, offset)
+        type_, len_ = ofproto_v1_0.OFP_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         assert type_ == ofproto_v1_0.OFPAT_STRIP_VLAN
         assert len_ == ofproto_v1_0.OFP_ACTION_HEADER_SIZE
         return cls()
@@ -336,8 +337,9 @@ class OFPActionDlAddr(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, dl_addr = struct.unpack_from(
-            ofproto_v1_0.OFP_ACTION_DL_ADDR_PACK_STR, buf, offset)
+        (type_, len_,
+         dl_addr) = ofproto_v1_0.OFP_ACTION_DL_ADDR_STRUCT.unpack_from(
+            buf, offset)
         assert type_ in (ofproto_v1_0.OFPAT_SET_DL_SRC,
                          ofproto_v1_0.OFPAT_SET_DL_DST)
         assert len_ == ofproto_v1_0.OFP_ACTION_DL_ADDR_SIZE
@@ -369,8 +371,9 @@ class OFPActionNwAddr(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, nw_addr = struct.unpack_from(
-            ofproto_v1_0.OFP_ACTION_NW_ADDR_PACK_STR, buf, offset)
+        (type_, len_,
+         nw_addr) = ofproto_v1_0.OFP_ACTION_NW_ADDR_STRUCT.unpack_from(
+            buf, offset)
         assert type_ in (ofproto_v1_0.OFPAT_SET_NW_SRC,
                          ofproto_v1_0.OFPAT_SET_NW_DST)
         assert len_ == ofproto_v1_0.OFP_ACTION_NW_ADDR_SIZE
@@ -404,8 +407,8 @@ class OFPActionSetNwTos(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, tos = struct.unpack_from(
-            ofproto_v1_0.OFP_ACTION_NW_TOS_PACK_STR, buf, offset)
+        type_, len_, tos = ofproto_v1_0.OFP_ACTION_NW_TOS_STRUCT.unpack_from(
+            buf, offset)
         assert type_ == ofproto_v1_0.OFPAT_SET_NW_TOS
         assert len_ == ofproto_v1_0.OFP_ACTION_NW_TOS_SIZE
         return cls(tos)
@@ -422,8 +425,8 @@ class OFPActionTpPort(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, tp = struct.unpack_from(
-            ofproto_v1_0.OFP_ACTION_TP_PORT_PACK_STR, buf, offset)
+        type_, len_, tp = ofproto_v1_0.OFP_ACTION_TP_PORT_STRUCT.unpack_from(
+            buf, offset)
         assert type_ in (ofproto_v1_0.OFPAT_SET_TP_SRC,
                          ofproto_v1_0.OFPAT_SET_TP_DST)
         assert len_ == ofproto_v1_0.OFP_ACTION_TP_PORT_SIZE
@@ -458,8 +461,9 @@ class OFPActionEnqueue(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, port, queue_id = struct.unpack_from(
-            ofproto_v1_0.OFP_ACTION_ENQUEUE_PACK_STR, buf, offset)
+        (type_, len_, port,
+         queue_id) = ofproto_v1_0.OFP_ACTION_ENQUEUE_STRUCT.unpack_from(
+            buf, offset)
         assert type_ == ofproto_v1_0.OFPAT_ENQUEUE
         assert len_ == ofproto_v1_0.OFP_ACTION_ENQUEUE_SIZE
         return cls(port, queue_id)
@@ -487,8 +491,9 @@ class OFPActionVendor(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, vendor = struct.unpack_from(
-            ofproto_v1_0.OFP_ACTION_VENDOR_HEADER_PACK_STR, buf, offset)
+        (type_, len_,
+         vendor) = ofproto_v1_0.OFP_ACTION_VENDOR_HEADER_STRUCT.unpack_from(
+            buf, offset)
         cls_ = cls._ACTION_VENDORS.get(vendor)
         return cls_.parser(buf, offset)
 
@@ -516,8 +521,9 @@ class NXActionHeader(OFPActionVendor):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, vendor, subtype = struct.unpack_from(
-            ofproto_v1_0.NX_ACTION_HEADER_PACK_STR, buf, offset)
+        (type_, len_, vendor,
+         subtype) = ofproto_v1_0.NX_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         cls_ = cls._NX_ACTION_SUBTYPES.get(subtype)
         return cls_.parser(buf, offset)
 
@@ -544,8 +550,9 @@ class NXActionResubmit(NXActionResubmitBase):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, vendor, subtype, in_port, table = struct.unpack_from(
-            ofproto_v1_0.NX_ACTION_RESUBMIT_PACK_STR, buf, offset)
+        (type_, len_, vendor, subtype, in_port,
+         table) = ofproto_v1_0.NX_ACTION_RESUBMIT_STRUCT.unpack_from(
+            buf, offset)
         return cls(in_port)
 
 
@@ -557,8 +564,9 @@ class NXActionResubmitTable(NXActionResubmitBase):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, vendor, subtype, in_port, table = struct.unpack_from(
-            ofproto_v1_0.NX_ACTION_RESUBMIT_PACK_STR, buf, offset)
+        (type_, len_, vendor, subtype, in_port,
+         table) = ofproto_v1_0.NX_ACTION_RESUBMIT_STRUCT.unpack_from(
+            buf, offset)
         return cls(in_port, table)
 
 
@@ -576,8 +584,9 @@ class NXActionSetTunnel(NXActionHeader):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, vendor, subtype, tun_id = struct.unpack_from(
-            ofproto_v1_0.NX_ACTION_SET_TUNNEL_PACK_STR, buf, offset)
+        (type_, len_, vendor, subtype,
+         tun_id) = ofproto_v1_0.NX_ACTION_SET_TUNNEL_STRUCT.unpack_from(
+            buf, offset)
         return cls(tun_id)
 
 
@@ -595,8 +604,9 @@ class NXActionSetQueue(NXActionHeader):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, vendor, subtype, queue_id) = struct.unpack_from(
-            ofproto_v1_0.NX_ACTION_SET_QUEUE_PACK_STR, buf, offset)
+        (type_, len_, vendor, subtype,
+         queue_id) = ofproto_v1_0.NX_ACTION_SET_QUEUE_STRUCT.unpack_from(
+            buf, offset)
         return cls(queue_id)
 
 
@@ -613,8 +623,9 @@ class NXActionPopQueue(NXActionHeader):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, vendor, subtype) = struct.unpack_from(
-            ofproto_v1_0.NX_ACTION_POP_QUEUE_PACK_STR, buf, offset)
+        (type_, len_, vendor,
+         subtype) = ofproto_v1_0.NX_ACTION_POP_QUEUE_STRUCT.unpack_from(
+            buf, offset)
         return cls()
 
 
@@ -638,8 +649,8 @@ class NXActionRegMove(NXActionHeader):
     @classmethod
     def parser(cls, buf, offset):
         (type_, len_, vendor, subtype, n_bits, src_ofs, dst_ofs,
-            src, dst) = struct.unpack_from(
-            ofproto_v1_0.NX_ACTION_REG_MOVE_PACK_STR, buf, offset)
+         src, dst) = ofproto_v1_0.NX_ACTION_REG_MOVE_STRUCT.unpack_from(
+            buf, offset)
         return cls(n_bits, src_ofs, dst_ofs, src, dst)
 
 
@@ -660,8 +671,8 @@ class NXActionRegLoad(NXActionHeader):
     @classmethod
     def parser(cls, buf, offset):
         (type_, len_, vendor, subtype, ofs_nbits, dst,
-            value) = struct.unpack_from(
-            ofproto_v1_0.NX_ACTION_REG_LOAD_PACK_STR, buf, offset)
+         value) = ofproto_v1_0.NX_ACTION_REG_LOAD_STRUCT.unpack_from(
+            buf, offset)
         return cls(ofs_nbits, dst, value)
 
 
@@ -679,8 +690,9 @@ class NXActionSetTunnel64(NXActionHeader):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, vendor, subtype, tun_id = struct.unpack_from(
-            ofproto_v1_0.NX_ACTION_SET_TUNNEL64_PACK_STR, buf, offset)
+        (type_, len_, vendor, subtype,
+         tun_id) = ofproto_v1_0.NX_ACTION_SET_TUNNEL64_STRUCT.unpack_from(
+            buf, offset)
         return cls(tun_id)
 
 
@@ -707,8 +719,8 @@ class NXActionMultipath(NXActionHeader):
     @classmethod
     def parser(cls, buf, offset):
         (type_, len_, vendor, subtype, fields, basis, algorithm,
-            max_link, arg, ofs_nbits, dst) = struct.unpack_from(
-            ofproto_v1_0.NX_ACTION_MULTIPATH_PACK_STR, buf, offset)
+            max_link, arg, ofs_nbits, dst) = \
+            ofproto_v1_0.NX_ACTION_MULTIPATH_STRUCT.unpack_from(buf, offset)
         return cls(fields, basis, algorithm, max_link, arg, ofs_nbits,
                    dst)
 
@@ -741,8 +753,7 @@ class NXActionNote(NXActionHeader):
 
     @classmethod
     def parser(cls, buf, offset):
-        note = struct.unpack_from(
-            ofproto_v1_0.NX_ACTION_NOTE_PACK_STR, buf, offset)
+        note = ofproto_v1_0.NX_ACTION_NOTE_STRUCT.unpack_from(buf, offset)
         (type_, len_, vendor, subtype) = note[0:4]
         note = [i for i in note[4:]]
         if len_ > ofproto_v1_0.NX_ACTION_NOTE_SIZE:
@@ -792,8 +803,8 @@ class NXActionBundleBase(NXActionHeader):
     @classmethod
     def parser(cls, action_cls, buf, offset):
         (type_, len_, vendor, subtype, algorithm, fields, basis,
-            slave_type, n_slaves, ofs_nbits, dst) = struct.unpack_from(
-            ofproto_v1_0.NX_ACTION_BUNDLE_PACK_STR, buf, offset)
+            slave_type, n_slaves, ofs_nbits, dst) = \
+            ofproto_v1_0.NX_ACTION_BUNDLE_STRUCT.unpack_from(buf, offset)
         slave_offset = offset + ofproto_v1_0.NX_ACTION_BUNDLE_SIZE
 
         slaves = []
@@ -849,8 +860,8 @@ class NXActionAutopath(NXActionHeader):
     @classmethod
     def parser(cls, buf, offset):
         (type_, len_, vendor, subtype, ofs_nbits, dst,
-            id_) = struct.unpack_from(
-            ofproto_v1_0.NX_ACTION_AUTOPATH_PACK_STR, buf, offset)
+         id_) = ofproto_v1_0.NX_ACTION_AUTOPATH_STRUCT.unpack_from(
+            buf, offset)
         return cls(ofs_nbits, dst, id_)
 
 
@@ -871,8 +882,8 @@ class NXActionOutputReg(NXActionHeader):
     @classmethod
     def parser(cls, buf, offset):
         (type_, len_, vendor, subtype, ofs_nbits, src,
-            max_len) = struct.unpack_from(
-            ofproto_v1_0.NX_ACTION_OUTPUT_REG_PACK_STR, buf, offset)
+         max_len) = ofproto_v1_0.NX_ACTION_OUTPUT_REG_STRUCT.unpack_from(
+            buf, offset)
         return cls(ofs_nbits, src, max_len)
 
 
@@ -888,8 +899,9 @@ class NXActionExit(NXActionHeader):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, vendor, subtype) = struct.unpack_from(
-            ofproto_v1_0.NX_ACTION_HEADER_PACK_STR, buf, offset)
+        (type_, len_, vendor,
+         subtype) = ofproto_v1_0.NX_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         return cls()
 
 
@@ -905,8 +917,9 @@ class NXActionDecTtl(NXActionHeader):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, vendor, subtype) = struct.unpack_from(
-            ofproto_v1_0.NX_ACTION_HEADER_PACK_STR, buf, offset)
+        (type_, len_, vendor,
+         subtype) = ofproto_v1_0.NX_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         return cls()
 
 
@@ -941,8 +954,8 @@ class NXActionLearn(NXActionHeader):
     def parser(cls, buf, offset):
         (type_, len_, vendor, subtype, idle_timeout, hard_timeout, priority,
             cookie, flags, table_id, fin_idle_timeout,
-            fin_hard_timeout) = struct.unpack_from(
-            ofproto_v1_0.NX_ACTION_LEARN_PACK_STR, buf, offset)
+            fin_hard_timeout) = \
+            ofproto_v1_0.NX_ACTION_LEARN_STRUCT.unpack_from(buf, offset)
         spec = buf[offset + ofproto_v1_0.NX_ACTION_LEARN_SIZE:]
         return cls(idle_timeout, hard_timeout, priority,
                    cookie, flags, table_id, fin_idle_timeout,
@@ -966,8 +979,8 @@ class NXActionController(NXActionHeader):
     @classmethod
     def parser(cls, buf, offset):
         (type_, len_, vendor, subtype, max_len, controller_id, reason,
-            _zero) = struct.unpack_from(
-            ofproto_v1_0.NX_ACTION_CONTROLLER_PACK_STR, buf, offset)
+         _zero) = ofproto_v1_0.NX_ACTION_CONTROLLER_STRUCT.unpack_from(
+            buf, offset)
         return cls(max_len, controller_id, reason)
 
 
@@ -987,8 +1000,8 @@ class NXActionFinTimeout(NXActionHeader):
     @classmethod
     def parser(cls, buf, offset):
         (type_, len_, vendor, subtype, fin_idle_timeout,
-            fin_hard_timeout) = struct.unpack_from(
-            ofproto_v1_0.NX_ACTION_FIN_TIMEOUT_PACK_STR, buf, offset)
+            fin_hard_timeout) = \
+            ofproto_v1_0.NX_ACTION_FIN_TIMEOUT_STRUCT.unpack_from(buf, offset)
         return cls(fin_idle_timeout, fin_hard_timeout)
 
 
@@ -1007,8 +1020,7 @@ class OFPDescStats(ofproto_parser.namedtuple('OFPDescStats', (
 
     @classmethod
     def parser(cls, buf, offset):
-        desc = struct.unpack_from(ofproto_v1_0.OFP_DESC_STATS_PACK_STR,
-                                  buf, offset)
+        desc = ofproto_v1_0.OFP_DESC_STATS_STRUCT.unpack_from(buf, offset)
         desc = list(desc)
         desc = map(lambda x: x.rstrip('\0'), desc)
         stats = cls(*desc)
@@ -1036,8 +1048,8 @@ class OFPFlowStats(StringifyMixin):
     def parser(cls, buf, offset):
         flow_stats = cls()
 
-        flow_stats.length, flow_stats.table_id = struct.unpack_from(
-            ofproto_v1_0.OFP_FLOW_STATS_0_PACK_STR, buf, offset)
+        flow_stats.length, flow_stats.table_id = \
+            ofproto_v1_0.OFP_FLOW_STATS_0_STRUCT.unpack_from(buf, offset)
         offset += ofproto_v1_0.OFP_FLOW_STATS_0_SIZE
 
         flow_stats.match = OFPMatch.parse(buf, offset)
@@ -1050,8 +1062,8 @@ class OFPFlowStats(StringifyMixin):
          flow_stats.hard_timeout,
          flow_stats.cookie,
          flow_stats.packet_count,
-         flow_stats.byte_count) = struct.unpack_from(
-            ofproto_v1_0.OFP_FLOW_STATS_1_PACK_STR, buf, offset)
+         flow_stats.byte_count) = \
+            ofproto_v1_0.OFP_FLOW_STATS_1_STRUCT.unpack_from(buf, offset)
         offset += ofproto_v1_0.OFP_FLOW_STATS_1_SIZE
 
         flow_stats.actions = []
@@ -1070,8 +1082,8 @@ class OFPAggregateStats(ofproto_parser.namedtuple('OFPAggregateStats', (
         'packet_count', 'byte_count', 'flow_count'))):
     @classmethod
     def parser(cls, buf, offset):
-        agg = struct.unpack_from(
-            ofproto_v1_0.OFP_AGGREGATE_STATS_REPLY_PACK_STR, buf, offset)
+        agg = ofproto_v1_0.OFP_AGGREGATE_STATS_REPLY_STRUCT.unpack_from(
+            buf, offset)
         stats = cls(*agg)
         stats.length = ofproto_v1_0.OFP_AGGREGATE_STATS_REPLY_SIZE
         return stats
@@ -1091,8 +1103,7 @@ class OFPTableStats(ofproto_parser.namedtuple('OFPTableStats', (
 
     @classmethod
     def parser(cls, buf, offset):
-        tbl = struct.unpack_from(ofproto_v1_0.OFP_TABLE_STATS_PACK_STR,
-                                 buf, offset)
+        tbl = ofproto_v1_0.OFP_TABLE_STATS_STRUCT.unpack_from(buf, offset)
         tbl = list(tbl)
         i = cls._fields.index('name')
         tbl[i] = tbl[i].rstrip('\0')
@@ -1107,8 +1118,7 @@ class OFPPortStats(ofproto_parser.namedtuple('OFPPortStats', (
         'rx_frame_err', 'rx_over_err', 'rx_crc_err', 'collisions'))):
     @classmethod
     def parser(cls, buf, offset):
-        port = struct.unpack_from(ofproto_v1_0.OFP_PORT_STATS_PACK_STR,
-                                  buf, offset)
+        port = ofproto_v1_0.OFP_PORT_STATS_STRUCT.unpack_from(buf, offset)
         stats = cls(*port)
         stats.length = ofproto_v1_0.OFP_PORT_STATS_SIZE
         return stats
@@ -1118,8 +1128,7 @@ class OFPQueueStats(ofproto_parser.namedtuple('OFPQueueStats', (
         'port_no', 'queue_id', 'tx_bytes', 'tx_packets', 'tx_errors'))):
     @classmethod
     def parser(cls, buf, offset):
-        queue = struct.unpack_from(ofproto_v1_0.OFP_QUEUE_STATS_PACK_STR,
-                                   buf, offset)
+        queue = ofproto_v1_0.OFP_QUEUE_STATS_STRUCT.unpack_from(buf, offset)
         stats = cls(*queue)
         stats.length = ofproto_v1_0.OFP_QUEUE_STATS_SIZE
         return stats
@@ -1161,8 +1170,8 @@ class NXFlowStats(StringifyMixin):
          nxflow_stats.hard_timeout, nxflow_stats.match_len,
          nxflow_stats.idle_age, nxflow_stats.hard_age,
          nxflow_stats.cookie, nxflow_stats.packet_count,
-         nxflow_stats.byte_count) = struct.unpack_from(
-            ofproto_v1_0.NX_FLOW_STATS_PACK_STR, buf, offset)
+         nxflow_stats.byte_count) = \
+            ofproto_v1_0.NX_FLOW_STATS_STRUCT.unpack_from(buf, offset)
         offset += ofproto_v1_0.NX_FLOW_STATS_SIZE
 
         fields = []
@@ -1192,8 +1201,8 @@ class NXAggregateStats(ofproto_parser.namedtuple('NXAggregateStats', (
         'packet_count', 'byte_count', 'flow_count'))):
     @classmethod
     def parser(cls, buf, offset):
-        agg = struct.unpack_from(
-            ofproto_v1_0.NX_AGGREGATE_STATS_REPLY_PACK_STR, buf, offset)
+        agg = ofproto_v1_0.NX_AGGREGATE_STATS_REPLY_STRUCT.unpack_from(
+            buf, offset)
         stats = cls(*agg)
         stats.length = ofproto_v1_0.NX_AGGREGATE_STATS_REPLY_SIZE
 
@@ -1218,8 +1227,9 @@ class OFPQueuePropHeader(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        property_, len_ = struct.unpack_from(
-            ofproto_v1_0.OFP_QUEUE_PROP_HEADER_PACK_STR, buf, offset)
+        (property_,
+         len_) = ofproto_v1_0.OFP_QUEUE_PROP_HEADER_STRUCT.unpack_from(
+            buf, offset)
         prop_cls = cls._QUEUE_PROPERTIES[property_]
         assert property_ == prop_cls.cls_prop_type
         assert len_ == prop_cls.cls_prop_len
@@ -1248,8 +1258,7 @@ class OFPQueuePropMinRate(OFPQueuePropHeader):
 
     @classmethod
     def parser(cls, buf, offset):
-        (rate,) = struct.unpack_from(
-            ofproto_v1_0.OFP_QUEUE_PROP_MIN_RATE_PACK_STR,
+        (rate,) = ofproto_v1_0.OFP_QUEUE_PROP_MIN_RATE_STRUCT.unpack_from(
             buf, offset)
         return cls(rate)
 
@@ -1305,9 +1314,8 @@ class OFPErrorMsg(MsgBase):
     def parser(cls, datapath, version, msg_type, msg_len, xid, buf):
         msg = super(OFPErrorMsg, cls).parser(datapath, version, msg_type,
                                              msg_len, xid, buf)
-        msg.type, msg.code = struct.unpack_from(
-            ofproto_v1_0.OFP_ERROR_MSG_PACK_STR, msg.buf,
-            ofproto_v1_0.OFP_HEADER_SIZE)
+        msg.type, msg.code = ofproto_v1_0.OFP_ERROR_MSG_STRUCT.unpack_from(
+            msg.buf, ofproto_v1_0.OFP_HEADER_SIZE)
         msg.data = msg.buf[ofproto_v1_0.OFP_ERROR_MSG_SIZE:]
         return msg
 
@@ -1377,9 +1385,8 @@ class OFPVendor(MsgBase):
     def parser(cls, datapath, version, msg_type, msg_len, xid, buf):
         msg = super(OFPVendor, cls).parser(datapath, version, msg_type,
                                            msg_len, xid, buf)
-        (msg.vendor,) = struct.unpack_from(
-            ofproto_v1_0.OFP_VENDOR_HEADER_PACK_STR, msg.buf,
-            ofproto_v1_0.OFP_HEADER_SIZE)
+        (msg.vendor,) = ofproto_v1_0.OFP_VENDOR_HEADER_STRUCT.unpack_from(
+            msg.buf, ofproto_v1_0.OFP_HEADER_SIZE)
 
         cls_ = cls._VENDORS.get(msg.vendor)
         if cls_:
@@ -1424,9 +1431,8 @@ class NiciraHeader(OFPVendor):
 
     @classmethod
     def parser(cls, datapath, buf, offset):
-        vendor, subtype = struct.unpack_from(
-            ofproto_v1_0.NICIRA_HEADER_PACK_STR, buf,
-            offset + ofproto_v1_0.OFP_HEADER_SIZE)
+        vendor, subtype = ofproto_v1_0.NICIRA_HEADER_STRUCT.unpack_from(
+            buf, offset + ofproto_v1_0.OFP_HEADER_SIZE)
         cls_ = cls._NX_SUBTYPES.get(subtype)
         return cls_.parser(datapath, buf,
                            offset + ofproto_v1_0.NICIRA_HEADER_SIZE)
@@ -1511,8 +1517,7 @@ class NXTRoleReply(NiciraHeader):
 
     @classmethod
     def parser(cls, datapath, buf, offset):
-        (role,) = struct.unpack_from(
-            ofproto_v1_0.NX_ROLE_PACK_STR, buf, offset)
+        (role,) = ofproto_v1_0.NX_ROLE_STRUCT.unpack_from(buf, offset)
         return cls(datapath, role)
 
 
@@ -1551,8 +1556,8 @@ class NXTFlowRemoved(NiciraHeader):
     def parser(cls, datapath, buf, offset):
         (cookie, priority, reason, duration_sec, duration_nsec,
          idle_timeout, match_len,
-         packet_count, byte_count) = struct.unpack_from(
-            ofproto_v1_0.NX_FLOW_REMOVED_PACK_STR, buf, offset)
+         packet_count, byte_count) = \
+            ofproto_v1_0.NX_FLOW_REMOVED_STRUCT.unpack_from(buf, offset)
         offset += (ofproto_v1_0.NX_FLOW_REMOVED_SIZE
                    - ofproto_v1_0.NICIRA_HEADER_SIZE)
         match = nx_match.NXMatch.parser(buf, offset, match_len)
@@ -1592,8 +1597,8 @@ class NXTPacketIn(NiciraHeader):
     @classmethod
     def parser(cls, datapath, buf, offset):
         (buffer_id, total_len, reason, table_id,
-         cookie, match_len) = struct.unpack_from(
-            ofproto_v1_0.NX_PACKET_IN_PACK_STR, buf, offset)
+         cookie, match_len) = ofproto_v1_0.NX_PACKET_IN_STRUCT.unpack_from(
+            buf, offset)
 
         offset += (ofproto_v1_0.NX_PACKET_IN_SIZE
                    - ofproto_v1_0.NICIRA_HEADER_SIZE)
@@ -1674,9 +1679,8 @@ class OFPSwitchFeatures(MsgBase):
          msg.n_buffers,
          msg.n_tables,
          msg.capabilities,
-         msg.actions) = struct.unpack_from(
-            ofproto_v1_0.OFP_SWITCH_FEATURES_PACK_STR, msg.buf,
-            ofproto_v1_0.OFP_HEADER_SIZE)
+         msg.actions) = ofproto_v1_0.OFP_SWITCH_FEATURES_STRUCT.unpack_from(
+            msg.buf, ofproto_v1_0.OFP_HEADER_SIZE)
 
         msg.ports = {}
         n_ports = ((msg_len - ofproto_v1_0.OFP_SWITCH_FEATURES_SIZE) /
@@ -1703,8 +1707,7 @@ class OFPPortStatus(MsgBase):
     def parser(cls, datapath, version, msg_type, msg_len, xid, buf):
         msg = super(OFPPortStatus, cls).parser(datapath, version, msg_type,
                                                msg_len, xid, buf)
-        msg.reason = struct.unpack_from(
-            ofproto_v1_0.OFP_PORT_STATUS_PACK_STR,
+        msg.reason = ofproto_v1_0.OFP_PORT_STATUS_STRUCT.unpack_from(
             msg.buf, ofproto_v1_0.OFP_HEADER_SIZE)[0]
         msg.desc = OFPPhyPort.parser(msg.buf,
                                      ofproto_v1_0.OFP_PORT_STATUS_DESC_OFFSET)
@@ -1730,8 +1733,7 @@ class OFPPacketIn(MsgBase):
         (msg.buffer_id,
          msg.total_len,
          msg.in_port,
-         msg.reason) = struct.unpack_from(
-            ofproto_v1_0.OFP_PACKET_IN_PACK_STR,
+         msg.reason) = ofproto_v1_0.OFP_PACKET_IN_STRUCT.unpack_from(
             msg.buf, ofproto_v1_0.OFP_HEADER_SIZE)
         msg.data = msg.buf[ofproto_v1_0.OFP_PACKET_IN_SIZE:]
         if msg.total_len < len(msg.data):
@@ -1750,9 +1752,9 @@ class OFPGetConfigReply(MsgBase):
     def parser(cls, datapath, version, msg_type, msg_len, xid, buf):
         msg = super(OFPGetConfigReply, cls).parser(datapath, version, msg_type,
                                                    msg_len, xid, buf)
-        (msg.flags, msg.miss_send_len) = struct.unpack_from(
-            ofproto_v1_0.OFP_SWITCH_CONFIG_PACK_STR,
-            msg.buf, ofproto_v1_0.OFP_HEADER_SIZE)
+        (msg.flags, msg.miss_send_len) = \
+            ofproto_v1_0.OFP_SWITCH_CONFIG_STRUCT.unpack_from(
+                msg.buf, ofproto_v1_0.OFP_HEADER_SIZE)
         return msg
 
 
@@ -1774,7 +1776,8 @@ class OFPFlowRemoved(MsgBase):
         msg = super(OFPFlowRemoved, cls).parser(datapath, version, msg_type,
                                                 msg_len, xid, buf)
 
-        msg.match = OFPMatch.parse(msg.buf, ofproto_v1_0.OFP_HEADER_SIZE)
+        msg._set_lazy_attr('match', OFPMatch.parse, msg.buf,
+                           ofproto_v1_0.OFP_HEADER_SIZE)
 
         (msg.cookie,
          msg.priority,
@@ -1783,8 +1786,8 @@ class OFPFlowRemoved(MsgBase):
          msg.duration_nsec,
          msg.idle_timeout,
          msg.packet_count,
-         msg.byte_count) = struct.unpack_from(
-            ofproto_v1_0.OFP_FLOW_REMOVED_PACK_STR0, msg.buf,
+         msg.byte_count) = ofproto_v1_0.OFP_FLOW_REMOVED_STRUCT0.unpack_from(
+            msg.buf,
             ofproto_v1_0.OFP_HEADER_SIZE + ofproto_v1_0.OFP_MATCH_SIZE)
 
         return msg
@@ -1802,8 +1805,9 @@ class OFPQueueGetConfigReply(MsgBase):
             datapath, version, msg_type, msg_len, xid, buf)
 
         offset = ofproto_v1_0.OFP_HEADER_SIZE
-        (msg.port,) = struct.unpack_from(
-            ofproto_v1_0.OFP_QUEUE_GET_CONFIG_REPLY_PACK_STR, msg.buf, offset)
+        (msg.port,) = \
+            ofproto_v1_0.OFP_QUEUE_GET_CONFIG_REPLY_STRUCT.unpack_from(
+                msg.buf, offset)
 
         msg.queues = []
         offset = ofproto_v1_0.OFP_QUEUE_GET_CONFIG_REPLY_SIZE
@@ -1864,15 +1868,15 @@ class OFPStatsReply(MsgBase):
         # call MsgBase::parser, not OFPStatsReply::parser
         msg = MsgBase.parser.__func__(
             cls, datapath, version, msg_type, msg_len, xid, buf)
-        msg.body = msg.parser_stats_body(msg.buf, msg.msg_len,
-                                         ofproto_v1_0.OFP_STATS_MSG_SIZE)
+        # the body is decoded when it's accessed for the first time
+        msg._set_lazy_attr('body', msg.parser_stats_body, msg.buf,
+                           msg.msg_len, ofproto_v1_0.OFP_STATS_MSG_SIZE)
         return msg
 
     @classmethod
     def parser(cls, datapath, version, msg_type, msg_len, xid, buf):
-        type_, flags = struct.unpack_from(ofproto_v1_0.OFP_STATS_MSG_PACK_STR,
-                                          buffer(buf),
-                                          ofproto_v1_0.OFP_HEADER_SIZE)
+        type_, flags = ofproto_v1_0.OFP_STATS_MSG_STRUCT.unpack_from(
+            buffer(buf), ofproto_v1_0.OFP_HEADER_SIZE)
         stats_type_cls = cls._STATS_MSG_TYPES.get(type_)
         msg = stats_type_cls.parser_stats(
             datapath, version, msg_type, msg_len, xid, buf)
@@ -1949,9 +1953,8 @@ class OFPVendorStatsReply(OFPStatsReply):
     @classmethod
     def parser_stats(cls, datapath, version, msg_type, msg_len, xid,
                      buf):
-        (type_,) = struct.unpack_from(
-            ofproto_v1_0.OFP_VENDOR_STATS_MSG_PACK_STR, buffer(buf),
-            ofproto_v1_0.OFP_STATS_MSG_SIZE)
+        (type_,) = ofproto_v1_0.OFP_VENDOR_STATS_MSG_STRUCT.unpack_from(
+            buffer(buf), ofproto_v1_0.OFP_STATS_MSG_SIZE)
 
         cls_ = cls._STATS_VENDORS.get(type_)
 
@@ -2003,15 +2006,16 @@ class NXStatsReply(OFPStatsReply):
                      buf, offset):
         msg = MsgBase.parser.__func__(
             cls, datapath, version, msg_type, msg_len, xid, buf)
-        msg.body = msg.parser_stats_body(msg.buf, msg.msg_len, offset)
+        msg._set_lazy_attr('body', msg.parser_stats_body, msg.buf,
+                           msg.msg_len, offset)
 
         return msg
 
     @classmethod
     def parser(cls, datapath, version, msg_type, msg_len, xid, buf,
                offset):
-        (type_,) = struct.unpack_from(
-            ofproto_v1_0.NX_STATS_MSG_PACK_STR, buffer(buf), offset)
+        (type_,) = ofproto_v1_0.NX_STATS_MSG_STRUCT.unpack_from(
+            buffer(buf), offset)
         offset += ofproto_v1_0.NX_STATS_MSG0_SIZE
 
         cls_ = cls._NX_STATS_TYPES.get(type_)
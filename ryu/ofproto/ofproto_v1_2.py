@@ -14,6 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from ryu.ofproto import ofproto_struct
 from ryu.ofproto import oxm_fields
 
 from struct import calcsize
@@ -828,3 +829,5 @@ OFP_TCP_PORT = 6633
 MAX_XID = 0xffffffff
 
 OFP_NO_BUFFER = 0xffffffff
+
+ofproto_struct.generate_structs(__name__)
@@ -132,9 +132,8 @@ class OFPErrorMsg(MsgBase):
 
         msg = super(OFPErrorMsg, cls).parser(datapath, version, msg_type,
                                              msg_len, xid, buf)
-        msg.type, msg.code = struct.unpack_from(
-            ofproto_v1_2.OFP_ERROR_MSG_PACK_STR, msg.buf,
-            ofproto_v1_2.OFP_HEADER_SIZE)
+        msg.type, msg.code = ofproto_v1_2.OFP_ERROR_MSG_STRUCT.unpack_from(
+            msg.buf, ofproto_v1_2.OFP_HEADER_SIZE)
         msg.data = msg.buf[ofproto_v1_2.OFP_ERROR_MSG_SIZE:]
         return msg
 
@@ -159,9 +158,9 @@ class OFPErrorExperimenterMsg(MsgBase):
         cls.cls_msg_type = msg_type
         msg = super(OFPErrorExperimenterMsg, cls).parser(
             datapath, version, msg_type, msg_len, xid, buf)
-        msg.type, msg.exp_type, msg.experimenter = struct.unpack_from(
-            ofproto_v1_2.OFP_ERROR_EXPERIMENTER_MSG_PACK_STR, msg.buf,
-            ofproto_v1_2.OFP_HEADER_SIZE)
+        msg.type, msg.exp_type, msg.experimenter = \
+            ofproto_v1_2.OFP_ERROR_EXPERIMENTER_MSG_STRUCT.unpack_from(
+                msg.buf, ofproto_v1_2.OFP_HEADER_SIZE)
         msg.data = msg.buf[ofproto_v1_2.OFP_ERROR_EXPERIMENTER_MSG_SIZE:]
         return msg
 
@@ -289,9 +288,9 @@ class OFPExperimenter(MsgBase):
     def parser(cls, datapath, version, msg_type, msg_len, xid, buf):
         msg = super(OFPExperimenter, cls).parser(datapath, version, msg_type,
                                                  msg_len, xid, buf)
-        (msg.experimenter, msg.exp_type) = struct.unpack_from(
-            ofproto_v1_2.OFP_EXPERIMENTER_HEADER_PACK_STR, msg.buf,
-            ofproto_v1_2.OFP_HEADER_SIZE)
+        (msg.experimenter, msg.exp_type) = \
+            ofproto_v1_2.OFP_EXPERIMENTER_HEADER_STRUCT.unpack_from(
+                msg.buf, ofproto_v1_2.OFP_HEADER_SIZE)
         msg.data = msg.buf[ofproto_v1_2.OFP_EXPERIMENTER_HEADER_SIZE:]
 
         return msg
@@ -321,7 +320,7 @@ class OFPPort(ofproto_parser.namedtuple('OFPPort', (
 
     @classmethod
     def parser(cls, buf, offset):
-        port = struct.unpack_from(ofproto_v1_2.OFP_PORT_PACK_STR, buf, offset)
+        port = ofproto_v1_2.OFP_PORT_STRUCT.unpack_from(buf, offset)
         port = list(port)
         i = cls._fields.index('hw_addr')
         port[i] = addrconv.mac.bin_to_text(port[i])
@@ -394,9 +393,8 @@ class OFPSwitchFeatures(MsgBase):
          msg.n_buffers,
          msg.n_tables,
          msg.capabilities,
-         msg._reserved) = struct.unpack_from(
-            ofproto_v1_2.OFP_SWITCH_FEATURES_PACK_STR, msg.buf,
-            ofproto_v1_2.OFP_HEADER_SIZE)
+         msg._reserved) = ofproto_v1_2.OFP_SWITCH_FEATURES_STRUCT.unpack_from(
+            msg.buf, ofproto_v1_2.OFP_HEADER_SIZE)
 
         msg.ports = {}
         n_ports = ((msg_len - ofproto_v1_2.OFP_SWITCH_FEATURES_SIZE) /
@@ -485,9 +483,9 @@ class OFPGetConfigReply(MsgBase):
     def parser(cls, datapath, version, msg_type, msg_len, xid, buf):
         msg = super(OFPGetConfigReply, cls).parser(datapath, version, msg_type,
                                                    msg_len, xid, buf)
-        msg.flags, msg.miss_send_len = struct.unpack_from(
-            ofproto_v1_2.OFP_SWITCH_CONFIG_PACK_STR, msg.buf,
-            ofproto_v1_2.OFP_HEADER_SIZE)
+        msg.flags, msg.miss_send_len = \
+            ofproto_v1_2.OFP_SWITCH_CONFIG_STRUCT.unpack_from(
+                msg.buf, ofproto_v1_2.OFP_HEADER_SIZE)
         return msg
 
 
@@ -590,25 +588,27 @@ class OFPPacketIn(MsgBase):
         self.match = match
         self.data = data
 
+    @staticmethod
+    def _parser_data(buf, match_offset, total_len):
+        (_type, length) = struct.unpack_from('!HH', buf, match_offset)
+        data = buf[match_offset + utils.round_up(length, 8) + 2:]
+        if total_len < len(data):
+            # discard padding for 8-byte alignment of OFP packet
+            data = data[:total_len]
+        return data
+
     @classmethod
     def parser(cls, datapath, version, msg_type, msg_len, xid, buf):
         msg = super(OFPPacketIn, cls).parser(datapath, version, msg_type,
                                              msg_len, xid, buf)
         (msg.buffer_id, msg.total_len, msg.reason,
-         msg.table_id) = struct.unpack_from(
-            ofproto_v1_2.OFP_PACKET_IN_PACK_STR,
+         msg.table_id) = ofproto_v1_2.OFP_PACKET_IN_STRUCT.unpack_from(
             msg.buf, ofproto_v1_2.OFP_HEADER_SIZE)
 
-        msg.match = OFPMatch.parser(msg.buf, ofproto_v1_2.OFP_PACKET_IN_SIZE -
-                                    ofproto_v1_2.OFP_MATCH_SIZE)
-
-        match_len = utils.round_up(msg.match.length, 8)
-        msg.data = msg.buf[(ofproto_v1_2.OFP_PACKET_IN_SIZE -
-                            ofproto_v1_2.OFP_MATCH_SIZE + match_len + 2):]
-
-        if msg.total_len < len(msg.data):
-            # discard padding for 8-byte alignment of OFP packet
-            msg.data = msg.data[:msg.total_len]
+        offset = ofproto_v1_2.OFP_PACKET_IN_SIZE - ofproto_v1_2.OFP_MATCH_SIZE
+        msg._set_lazy_attr('match', OFPMatch.parser, msg.buf, offset)
+        msg._set_lazy_attr('data', cls._parser_data, msg.buf, offset,
+                           msg.total_len)
 
         return msg
 
@@ -696,15 +696,13 @@ class OFPFlowRemoved(MsgBase):
         (msg.cookie, msg.priority, msg.reason,
          msg.table_id, msg.duration_sec, msg.duration_nsec,
          msg.idle_timeout, msg.hard_timeout, msg.packet_count,
-         msg.byte_count) = struct.unpack_from(
-            ofproto_v1_2.OFP_FLOW_REMOVED_PACK_STR0,
-            msg.buf,
-            ofproto_v1_2.OFP_HEADER_SIZE)
+         msg.byte_count) = ofproto_v1_2.OFP_FLOW_REMOVED_STRUCT0.unpack_from(
+            msg.buf, ofproto_v1_2.OFP_HEADER_SIZE)
 
         offset = (ofproto_v1_2.OFP_FLOW_REMOVED_SIZE -
                   ofproto_v1_2.OFP_MATCH_SIZE)
 
-        msg.match = OFPMatch.parser(msg.buf, offset)
+        msg._set_lazy_attr('match', OFPMatch.parser, msg.buf, offset)
 
         return msg
 
@@ -756,9 +754,8 @@ class OFPPortStatus(MsgBase):
     def parser(cls, datapath, version, msg_type, msg_len, xid, buf):
         msg = super(OFPPortStatus, cls).parser(datapath, version, msg_type,
                                                msg_len, xid, buf)
-        msg.reason = struct.unpack_from(
-            ofproto_v1_2.OFP_PORT_STATUS_PACK_STR, msg.buf,
-            ofproto_v1_2.OFP_HEADER_SIZE)[0]
+        msg.reason = ofproto_v1_2.OFP_PORT_STATUS_STRUCT.unpack_from(
+            msg.buf, ofproto_v1_2.OFP_HEADER_SIZE)[0]
         msg.desc = OFPPort.parser(msg.buf,
                                   ofproto_v1_2.OFP_PORT_STATUS_DESC_OFFSET)
         return msg
@@ -965,9 +962,9 @@ class OFPInstructionGotoTable(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, table_id) = struct.unpack_from(
-            ofproto_v1_2.OFP_INSTRUCTION_GOTO_TABLE_PACK_STR,
-            buf, offset)
+        (type_, len_, table_id) = \
+            ofproto_v1_2.OFP_INSTRUCTION_GOTO_TABLE_STRUCT.unpack_from(
+                buf, offset)
         return cls(table_id)
 
     def serialize(self, buf, offset):
@@ -998,9 +995,9 @@ class OFPInstructionWriteMetadata(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, metadata, metadata_mask) = struct.unpack_from(
-            ofproto_v1_2.OFP_INSTRUCTION_WRITE_METADATA_PACK_STR,
-            buf, offset)
+        (type_, len_, metadata, metadata_mask) = \
+            ofproto_v1_2.OFP_INSTRUCTION_WRITE_METADATA_STRUCT.unpack_from(
+                buf, offset)
         return cls(metadata, metadata_mask)
 
     def serialize(self, buf, offset):
@@ -1037,8 +1034,8 @@ class OFPInstructionActions(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto_v1_2.OFP_INSTRUCTION_ACTIONS_PACK_STR,
+        (type_,
+         len_) = ofproto_v1_2.OFP_INSTRUCTION_ACTIONS_STRUCT.unpack_from(
             buf, offset)
 
         offset += ofproto_v1_2.OFP_INSTRUCTION_ACTIONS_SIZE
@@ -1100,8 +1097,8 @@ class OFPAction(OFPActionHeader):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_ = struct.unpack_from(
-            ofproto_v1_2.OFP_ACTION_HEADER_PACK_STR, buf, offset)
+        type_, len_ = ofproto_v1_2.OFP_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         cls_ = cls._ACTION_TYPES.get(type_)
         assert cls_ is not None
         return cls_.parser(buf, offset)
@@ -1134,8 +1131,9 @@ class OFPActionOutput(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, port, max_len = struct.unpack_from(
-            ofproto_v1_2.OFP_ACTION_OUTPUT_PACK_STR, buf, offset)
+        (type_, len_, port,
+         max_len) = ofproto_v1_2.OFP_ACTION_OUTPUT_STRUCT.unpack_from(
+            buf, offset)
         return cls(port, max_len)
 
     def serialize(self, buf, offset):
@@ -1163,8 +1161,9 @@ class OFPActionGroup(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, group_id) = struct.unpack_from(
-            ofproto_v1_2.OFP_ACTION_GROUP_PACK_STR, buf, offset)
+        (type_, len_,
+         group_id) = ofproto_v1_2.OFP_ACTION_GROUP_STRUCT.unpack_from(
+            buf, offset)
         return cls(group_id)
 
     def serialize(self, buf, offset):
@@ -1193,8 +1192,9 @@ class OFPActionSetQueue(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, queue_id) = struct.unpack_from(
-            ofproto_v1_2.OFP_ACTION_SET_QUEUE_PACK_STR, buf, offset)
+        (type_, len_,
+         queue_id) = ofproto_v1_2.OFP_ACTION_SET_QUEUE_STRUCT.unpack_from(
+            buf, offset)
         return cls(queue_id)
 
     def serialize(self, buf, offset):
@@ -1222,8 +1222,9 @@ class OFPActionSetMplsTtl(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, mpls_ttl) = struct.unpack_from(
-            ofproto_v1_2.OFP_ACTION_MPLS_TTL_PACK_STR, buf, offset)
+        (type_, len_,
+         mpls_ttl) = ofproto_v1_2.OFP_ACTION_MPLS_TTL_STRUCT.unpack_from(
+            buf, offset)
         return cls(mpls_ttl)
 
     def serialize(self, buf, offset):
@@ -1244,8 +1245,8 @@ class OFPActionDecMplsTtl(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto_v1_2.OFP_ACTION_HEADER_PACK_STR, buf, offset)
+        (type_, len_) = ofproto_v1_2.OFP_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         return cls()
 
 
@@ -1269,8 +1270,9 @@ class OFPActionSetNwTtl(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, nw_ttl) = struct.unpack_from(
-            ofproto_v1_2.OFP_ACTION_NW_TTL_PACK_STR, buf, offset)
+        (type_, len_,
+         nw_ttl) = ofproto_v1_2.OFP_ACTION_NW_TTL_STRUCT.unpack_from(
+            buf, offset)
         return cls(nw_ttl)
 
     def serialize(self, buf, offset):
@@ -1291,8 +1293,8 @@ class OFPActionDecNwTtl(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto_v1_2.OFP_ACTION_HEADER_PACK_STR, buf, offset)
+        (type_, len_) = ofproto_v1_2.OFP_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         return cls()
 
 
@@ -1310,8 +1312,8 @@ class OFPActionCopyTtlOut(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto_v1_2.OFP_ACTION_HEADER_PACK_STR, buf, offset)
+        (type_, len_) = ofproto_v1_2.OFP_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         return cls()
 
 
@@ -1329,8 +1331,8 @@ class OFPActionCopyTtlIn(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto_v1_2.OFP_ACTION_HEADER_PACK_STR, buf, offset)
+        (type_, len_) = ofproto_v1_2.OFP_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         return cls()
 
 
@@ -1354,8 +1356,9 @@ class OFPActionPushVlan(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, ethertype) = struct.unpack_from(
-            ofproto_v1_2.OFP_ACTION_PUSH_PACK_STR, buf, offset)
+        (type_, len_,
+         ethertype) = ofproto_v1_2.OFP_ACTION_PUSH_STRUCT.unpack_from(
+            buf, offset)
         return cls(ethertype)
 
     def serialize(self, buf, offset):
@@ -1383,8 +1386,9 @@ class OFPActionPushMpls(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, ethertype) = struct.unpack_from(
-            ofproto_v1_2.OFP_ACTION_PUSH_PACK_STR, buf, offset)
+        (type_, len_,
+         ethertype) = ofproto_v1_2.OFP_ACTION_PUSH_STRUCT.unpack_from(
+            buf, offset)
         return cls(ethertype)
 
     def serialize(self, buf, offset):
@@ -1405,8 +1409,8 @@ class OFPActionPopVlan(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto_v1_2.OFP_ACTION_HEADER_PACK_STR, buf, offset)
+        (type_, len_) = ofproto_v1_2.OFP_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         return cls()
 
 
@@ -1424,8 +1428,9 @@ class OFPActionPopMpls(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, ethertype) = struct.unpack_from(
-            ofproto_v1_2.OFP_ACTION_POP_MPLS_PACK_STR, buf, offset)
+        (type_, len_,
+         ethertype) = ofproto_v1_2.OFP_ACTION_POP_MPLS_STRUCT.unpack_from(
+            buf, offset)
         return cls(ethertype)
 
     def serialize(self, buf, offset):
@@ -1576,8 +1581,9 @@ class OFPActionExperimenter(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, experimenter) = struct.unpack_from(
-            ofproto_v1_2.OFP_ACTION_EXPERIMENTER_HEADER_PACK_STR, buf, offset)
+        (type_, len_, experimenter) = \
+            ofproto_v1_2.OFP_ACTION_EXPERIMENTER_HEADER_STRUCT.unpack_from(
+                buf, offset)
         ex = cls(experimenter)
         ex.len = len_
         return ex
@@ -1597,8 +1603,9 @@ class OFPBucket(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        (len_, weigth, watch_port, watch_group) = struct.unpack_from(
-            ofproto_v1_2.OFP_BUCKET_PACK_STR, buf, offset)
+        (len_, weigth, watch_port,
+         watch_group) = ofproto_v1_2.OFP_BUCKET_STRUCT.unpack_from(
+            buf, offset)
 
         length = ofproto_v1_2.OFP_BUCKET_SIZE
         offset += ofproto_v1_2.OFP_BUCKET_SIZE
@@ -1857,24 +1864,26 @@ class OFPStatsReply(MsgBase):
     def parser(cls, datapath, version, msg_type, msg_len, xid, buf):
         msg = super(OFPStatsReply, cls).parser(datapath, version, msg_type,
                                                msg_len, xid, buf)
-        msg.type, msg.flags = struct.unpack_from(
-            ofproto_v1_2.OFP_STATS_REPLY_PACK_STR, msg.buf,
-            ofproto_v1_2.OFP_HEADER_SIZE)
+        msg.type, msg.flags = ofproto_v1_2.OFP_STATS_REPLY_STRUCT.unpack_from(
+            msg.buf, ofproto_v1_2.OFP_HEADER_SIZE)
         stats_type_cls = cls._STATS_TYPES.get(msg.type)
+        # the body is decoded when it's accessed for the first time
+        msg._set_lazy_attr('body', cls._parser_body, stats_type_cls,
+                           msg.buf, msg_len)
+        return msg
 
+    @staticmethod
+    def _parser_body(stats_type_cls, buf, msg_len):
         offset = ofproto_v1_2.OFP_STATS_REPLY_SIZE
         body = []
         while offset < msg_len:
-            r = stats_type_cls.parser(msg.buf, offset)
+            r = stats_type_cls.parser(buf, offset)
             body.append(r)
             offset += r.length
 
         if stats_type_cls.cls_body_single_struct:
-            msg.body = body[0]
-        else:
-            msg.body = body
-
-        return msg
+            return body[0]
+        return body
 
 
 @_set_msg_type(ofproto_v1_2.OFPT_STATS_REQUEST)
@@ -1954,8 +1963,7 @@ class OFPDescStats(ofproto_parser.namedtuple('OFPDescStats', (
 
     @classmethod
     def parser(cls, buf, offset):
-        desc = struct.unpack_from(ofproto_v1_2.OFP_DESC_STATS_PACK_STR,
-                                  buf, offset)
+        desc = ofproto_v1_2.OFP_DESC_STATS_STRUCT.unpack_from(buf, offset)
         desc = list(desc)
         desc = map(lambda x: x.rstrip('\0'), desc)
         stats = cls(*desc)
@@ -2101,9 +2109,8 @@ class OFPFlowStats(StringifyMixin):
         (length, table_id, duration_sec,
          duration_nsec, priority,
          idle_timeout, hard_timeout,
-         cookie, packet_count, byte_count) = struct.unpack_from(
-            ofproto_v1_2.OFP_FLOW_STATS_PACK_STR,
-            buf, offset)
+         cookie, packet_count, byte_count) = \
+            ofproto_v1_2.OFP_FLOW_STATS_STRUCT.unpack_from(buf, offset)
         offset += (ofproto_v1_2.OFP_FLOW_STATS_SIZE -
                    ofproto_v1_2.OFP_MATCH_SIZE)
         match = OFPMatch.parser(buf, offset)
@@ -2228,8 +2235,7 @@ class OFPAggregateStatsReply(ofproto_parser.namedtuple('OFPAggregateStats', (
 
     @classmethod
     def parser(cls, buf, offset):
-        desc = struct.unpack_from(
-            ofproto_v1_2.OFP_AGGREGATE_STATS_REPLY_PACK_STR,
+        desc = ofproto_v1_2.OFP_AGGREGATE_STATS_REPLY_STRUCT.unpack_from(
             buf, offset)
         stats = cls(*desc)
         stats.length = ofproto_v1_2.OFP_AGGREGATE_STATS_REPLY_SIZE
@@ -2338,9 +2344,7 @@ class OFPTableStats(
 
     @classmethod
     def parser(cls, buf, offset):
-        table = struct.unpack_from(
-            ofproto_v1_2.OFP_TABLE_STATS_PACK_STR,
-            buf, offset)
+        table = ofproto_v1_2.OFP_TABLE_STATS_STRUCT.unpack_from(buf, offset)
         table = list(table)
         i = cls._fields.index('name')
         table[i] = table[i].rstrip('\0')
@@ -2450,8 +2454,7 @@ class OFPPortStats(
     """
     @classmethod
     def parser(cls, buf, offset):
-        port = struct.unpack_from(ofproto_v1_2.OFP_PORT_STATS_PACK_STR,
-                                  buf, offset)
+        port = ofproto_v1_2.OFP_PORT_STATS_STRUCT.unpack_from(buf, offset)
         stats = cls(*port)
         stats.length = ofproto_v1_2.OFP_PORT_STATS_SIZE
         return stats
@@ -2538,8 +2541,7 @@ class OFPQueueStats(
     """
     @classmethod
     def parser(cls, buf, offset):
-        queue = struct.unpack_from(ofproto_v1_2.OFP_QUEUE_STATS_PACK_STR,
-                                   buf, offset)
+        queue = ofproto_v1_2.OFP_QUEUE_STATS_STRUCT.unpack_from(buf, offset)
         stats = cls(*queue)
         stats.length = ofproto_v1_2.OFP_QUEUE_STATS_SIZE
         return stats
@@ -2553,8 +2555,7 @@ class OFPBucketCounter(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        packet, byte = struct.unpack_from(
-            ofproto_v1_2.OFP_BUCKET_COUNTER_PACK_STR,
+        packet, byte = ofproto_v1_2.OFP_BUCKET_COUNTER_STRUCT.unpack_from(
             buf, offset)
         return cls(packet, byte)
 
@@ -2648,8 +2649,7 @@ class OFPGroupStats(StringifyMixin):
     @classmethod
     def parser(cls, buf, offset):
         (length, group_id, ref_count, packet_count,
-         byte_count) = struct.unpack_from(
-            ofproto_v1_2.OFP_GROUP_STATS_PACK_STR,
+         byte_count) = ofproto_v1_2.OFP_GROUP_STATS_STRUCT.unpack_from(
             buf, offset)
 
         bucket_len = length - ofproto_v1_2.OFP_GROUP_STATS_SIZE
@@ -2738,8 +2738,8 @@ class OFPGroupDescStats(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        (length, type_, group_id) = struct.unpack_from(
-            ofproto_v1_2.OFP_GROUP_DESC_STATS_PACK_STR,
+        (length, type_,
+         group_id) = ofproto_v1_2.OFP_GROUP_DESC_STATS_STRUCT.unpack_from(
             buf, offset)
 
         bucket_len = length - ofproto_v1_2.OFP_GROUP_DESC_STATS_SIZE
@@ -2830,8 +2830,8 @@ class OFPGroupFeaturesStats(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        stats = struct.unpack_from(
-            ofproto_v1_2.OFP_GROUP_FEATURES_STATS_PACK_STR, buf, offset)
+        stats = ofproto_v1_2.OFP_GROUP_FEATURES_STATS_STRUCT.unpack_from(
+            buf, offset)
         types = stats[0]
         capabilities = stats[1]
         max_groups = list(stats[2:6])
@@ -2900,8 +2900,8 @@ class OFPQueueProp(OFPQueuePropHeader):
 
     @classmethod
     def parser(cls, buf, offset):
-        (property_, len_) = struct.unpack_from(
-            ofproto_v1_2.OFP_QUEUE_PROP_HEADER_PACK_STR,
+        (property_,
+         len_) = ofproto_v1_2.OFP_QUEUE_PROP_HEADER_STRUCT.unpack_from(
             buf, offset)
         cls_ = cls._QUEUE_PROP_PROPERTIES.get(property_)
         offset += ofproto_v1_2.OFP_QUEUE_PROP_HEADER_SIZE
@@ -2918,8 +2918,9 @@ class OFPPacketQueue(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        (queue_id, port, len_) = struct.unpack_from(
-            ofproto_v1_2.OFP_PACKET_QUEUE_PACK_STR, buf, offset)
+        (queue_id, port,
+         len_) = ofproto_v1_2.OFP_PACKET_QUEUE_STRUCT.unpack_from(
+            buf, offset)
         length = ofproto_v1_2.OFP_PACKET_QUEUE_SIZE
         offset += ofproto_v1_2.OFP_PACKET_QUEUE_SIZE
         properties = []
@@ -2942,8 +2943,8 @@ class OFPQueuePropMinRate(OFPQueueProp):
 
     @classmethod
     def parser(cls, buf, offset):
-        (rate,) = struct.unpack_from(
-            ofproto_v1_2.OFP_QUEUE_PROP_MIN_RATE_PACK_STR, buf, offset)
+        (rate,) = ofproto_v1_2.OFP_QUEUE_PROP_MIN_RATE_STRUCT.unpack_from(
+            buf, offset)
         return cls(rate)
 
 
@@ -2956,8 +2957,8 @@ class OFPQueuePropMaxRate(OFPQueueProp):
 
     @classmethod
     def parser(cls, buf, offset):
-        (rate,) = struct.unpack_from(
-            ofproto_v1_2.OFP_QUEUE_PROP_MAX_RATE_PACK_STR, buf, offset)
+        (rate,) = ofproto_v1_2.OFP_QUEUE_PROP_MAX_RATE_STRUCT.unpack_from(
+            buf, offset)
         return cls(rate)
 
 
@@ -2996,9 +2997,9 @@ class OFPQueueGetConfigReply(MsgBase):
         msg = super(OFPQueueGetConfigReply, cls).parser(datapath, version,
                                                         msg_type,
                                                         msg_len, xid, buf)
-        (msg.port,) = struct.unpack_from(
-            ofproto_v1_2.OFP_QUEUE_GET_CONFIG_REPLY_PACK_STR, msg.buf,
-            ofproto_v1_2.OFP_HEADER_SIZE)
+        (msg.port,) = \
+            ofproto_v1_2.OFP_QUEUE_GET_CONFIG_REPLY_STRUCT.unpack_from(
+                msg.buf, ofproto_v1_2.OFP_HEADER_SIZE)
 
         msg.queues = []
         length = ofproto_v1_2.OFP_QUEUE_GET_CONFIG_REPLY_SIZE
@@ -3140,9 +3141,9 @@ class OFPRoleReply(MsgBase):
         msg = super(OFPRoleReply, cls).parser(datapath, version,
                                               msg_type,
                                               msg_len, xid, buf)
-        (msg.role, msg.generation_id) = struct.unpack_from(
-            ofproto_v1_2.OFP_ROLE_REQUEST_PACK_STR, msg.buf,
-            ofproto_v1_2.OFP_HEADER_SIZE)
+        (msg.role,
+         msg.generation_id) = ofproto_v1_2.OFP_ROLE_REQUEST_STRUCT.unpack_from(
+            msg.buf, ofproto_v1_2.OFP_HEADER_SIZE)
 
         return msg
 
@@ -3290,7 +3291,8 @@ class OFPMatch(StringifyMixin):
         super(OFPMatch, self).__init__()
         self._wc = FlowWildcards()
         self._flow = Flow()
-        self.fields = []
+        self._old_fields = []
+        self._old_fields_buf = None
         self.type = ofproto_v1_2.OFPMT_OXM
         self.length = length
 
@@ -3311,6 +3313,21 @@ class OFPMatch(StringifyMixin):
             self._fields2 = [ofproto_v1_2.oxm_to_user(n, v, m) for (n, v, m)
                              in fields]
 
+    @property
+    def fields(self):
+        # XXX old api compat
+        # the OFPMatchFields of a parsed match are parsed on first access
+        if self._old_fields_buf is not None:
+            buf, offset, length = self._old_fields_buf
+            self._old_fields_buf = None
+            self.parser_old(self, buf, offset, length)
+        return self._old_fields
+
+    @fields.setter
+    def fields(self, fields):
+        self._old_fields = fields
+        self._old_fields_buf = None
+
     def __getitem__(self, key):
         return dict(self._fields2)[key]
 
@@ -3440,7 +3457,7 @@ class OFPMatch(StringifyMixin):
         self.fields.append(OFPMatchField.make(header, value, mask))
 
     def _composed_with_old_api(self):
-        return (self.fields and not self._fields2) or \
+        return (not self._fields2 and self.fields) or \
             self._wc.__dict__ != FlowWildcards().__dict__
 
     def serialize(self, buf, offset):
@@ -3694,12 +3711,12 @@ class OFPMatch(StringifyMixin):
         length -= 4
 
         # XXXcompat
-        cls.parser_old(match, buf, offset, length)
+        # OFPMatch.fields is parsed from here when it's accessed
+        match._old_fields_buf = (buf, offset, length)
 
         fields = []
         while length > 0:
-            n, value, mask, field_len = ofproto_v1_2.oxm_parse(buf, offset)
-            k, uv = ofproto_v1_2.oxm_to_user(n, value, mask)
+            k, uv, field_len = ofproto_v1_2.oxm_parse_user(buf, offset)
             fields.append((k, uv))
             offset += field_len
             length -= field_len
@@ -82,8 +82,9 @@ class OFPHello(MsgBase):
         offset = ofproto_v1_3.OFP_HELLO_HEADER_SIZE
         elems = []
         while offset < msg.msg_len:
-            type_, length = struct.unpack_from(
-                ofproto_v1_3.OFP_HELLO_ELEM_HEADER_PACK_STR, msg.buf, offset)
+            (type_,
+             length) = ofproto_v1_3.OFP_HELLO_ELEM_HEADER_STRUCT.unpack_from(
+                msg.buf, offset)
 
             # better to register Hello Element classes but currently
             # Only VerisonBitmap is supported so let's be simple.
@@ -116,9 +117,8 @@ class OFPHelloElemVersionBitmap(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, length = struct.unpack_from(
-            ofproto_v1_3.OFP_HELLO_ELEM_VERSIONBITMAP_HEADER_PACK_STR,
-            buf, offset)
+        hdr_struct = ofproto_v1_3.OFP_HELLO_ELEM_VERSIONBITMAP_HEADER_STRUCT
+        type_, length = hdr_struct.unpack_from(buf, offset)
         assert type_ == ofproto_v1_3.OFPHET_VERSIONBITMAP
 
         bitmaps_len = (length -
@@ -206,9 +206,8 @@ class OFPErrorMsg(MsgBase):
                                                   msg_len, xid, buf)
         msg = super(OFPErrorMsg, cls).parser(datapath, version, msg_type,
                                              msg_len, xid, buf)
-        msg.type, msg.code = struct.unpack_from(
-            ofproto_v1_3.OFP_ERROR_MSG_PACK_STR, msg.buf,
-            ofproto_v1_3.OFP_HEADER_SIZE)
+        msg.type, msg.code = ofproto_v1_3.OFP_ERROR_MSG_STRUCT.unpack_from(
+            msg.buf, ofproto_v1_3.OFP_HEADER_SIZE)
         msg.data = msg.buf[ofproto_v1_3.OFP_ERROR_MSG_SIZE:]
         return msg
 
@@ -233,9 +232,9 @@ class OFPErrorExperimenterMsg(MsgBase):
         cls.cls_msg_type = msg_type
         msg = super(OFPErrorExperimenterMsg, cls).parser(
             datapath, version, msg_type, msg_len, xid, buf)
-        msg.type, msg.exp_type, msg.experimenter = struct.unpack_from(
-            ofproto_v1_3.OFP_ERROR_EXPERIMENTER_MSG_PACK_STR, msg.buf,
-            ofproto_v1_3.OFP_HEADER_SIZE)
+        msg.type, msg.exp_type, msg.experimenter = \
+            ofproto_v1_3.OFP_ERROR_EXPERIMENTER_MSG_STRUCT.unpack_from(
+                msg.buf, ofproto_v1_3.OFP_HEADER_SIZE)
         msg.data = msg.buf[ofproto_v1_3.OFP_ERROR_EXPERIMENTER_MSG_SIZE:]
         return msg
 
@@ -364,9 +363,9 @@ class OFPExperimenter(MsgBase):
         msg = super(OFPExperimenter, cls).parser(datapath, version,
                                                  msg_type, msg_len,
                                                  xid, buf)
-        (msg.experimenter, msg.exp_type) = struct.unpack_from(
-            ofproto_v1_3.OFP_EXPERIMENTER_HEADER_PACK_STR, msg.buf,
-            ofproto_v1_3.OFP_HEADER_SIZE)
+        (msg.experimenter, msg.exp_type) = \
+            ofproto_v1_3.OFP_EXPERIMENTER_HEADER_STRUCT.unpack_from(
+                msg.buf, ofproto_v1_3.OFP_HEADER_SIZE)
         msg.data = msg.buf[ofproto_v1_3.OFP_EXPERIMENTER_HEADER_SIZE:]
 
         return msg
@@ -445,9 +444,8 @@ class OFPSwitchFeatures(MsgBase):
          msg.n_tables,
          msg.auxiliary_id,
          msg.capabilities,
-         msg._reserved) = struct.unpack_from(
-            ofproto_v1_3.OFP_SWITCH_FEATURES_PACK_STR, msg.buf,
-            ofproto_v1_3.OFP_HEADER_SIZE)
+         msg._reserved) = ofproto_v1_3.OFP_SWITCH_FEATURES_STRUCT.unpack_from(
+            msg.buf, ofproto_v1_3.OFP_HEADER_SIZE)
         return msg
 
 
@@ -523,9 +521,9 @@ class OFPGetConfigReply(MsgBase):
     def parser(cls, datapath, version, msg_type, msg_len, xid, buf):
         msg = super(OFPGetConfigReply, cls).parser(datapath, version, msg_type,
                                                    msg_len, xid, buf)
-        msg.flags, msg.miss_send_len = struct.unpack_from(
-            ofproto_v1_3.OFP_SWITCH_CONFIG_PACK_STR, msg.buf,
-            ofproto_v1_3.OFP_HEADER_SIZE)
+        msg.flags, msg.miss_send_len = \
+            ofproto_v1_3.OFP_SWITCH_CONFIG_STRUCT.unpack_from(
+                msg.buf, ofproto_v1_3.OFP_HEADER_SIZE)
         return msg
 
 
@@ -719,6 +717,8 @@ class OFPMatch(StringifyMixin):
         ...
         ('2001:db8:bd05:1d2:288a:1fc0:1:10ee', 'ffff:ffff:ffff:ffff::')
     """
+    __slots__ = ('type', 'length', '_fields2', '_old_fields',
+                 '_old_fields_buf', '_old_wc', '_old_flow', '_serialized')
 
     def __init__(self, type_=None, length=None, _ordered_fields=None,
                  **kwargs):
@@ -728,9 +728,10 @@ class OFPMatch(StringifyMixin):
         define.
         """
         super(OFPMatch, self).__init__()
-        self._wc = FlowWildcards()
-        self._flow = Flow()
-        self.fields = []
+        self._old_wc = None
+        self._old_flow = None
+        self._old_fields = []
+        self._old_fields_buf = None
         self.type = ofproto_v1_3.OFPMT_OXM
         self.length = length
 
@@ -751,6 +752,36 @@ class OFPMatch(StringifyMixin):
             self._fields2 = [ofproto_v1_3.oxm_to_user(n, v, m) for (n, v, m)
                              in fields]
 
+    @property
+    def fields(self):
+        # XXX old api compat
+        # the OFPMatchFields of a parsed match are parsed on first access
+        if self._old_fields_buf is not None:
+            buf, offset, length = self._old_fields_buf
+            self._old_fields_buf = None
+            self.parser_old(self, buf, offset, length)
+        return self._old_fields
+
+    @fields.setter
+    def fields(self, fields):
+        self._old_fields = fields
+        self._old_fields_buf = None
+
+    @property
+    def _wc(self):
+        # XXX old api compat
+        # the wildcards and the flow of set_*() are made on first use
+        if self._old_wc is None:
+            self._old_wc = FlowWildcards()
+        return self._old_wc
+
+    @property
+    def _flow(self):
+        # XXX old api compat
+        if self._old_flow is None:
+            self._old_flow = Flow()
+        return self._old_flow
+
     def __getitem__(self, key):
         return dict(self._fields2)[key]
 
@@ -884,8 +915,9 @@ class OFPMatch(StringifyMixin):
         self.fields.append(OFPMatchField.make(header, value, mask))
 
     def _composed_with_old_api(self):
-        return (self.fields and not self._fields2) or \
-            self._wc.__dict__ != FlowWildcards().__dict__
+        return (not self._fields2 and self.fields) or \
+            (self._old_wc is not None and
+             self._old_wc.__dict__ != FlowWildcards().__dict__)
 
     def serialize(self, buf, offset):
         """
@@ -1166,12 +1198,12 @@ class OFPMatch(StringifyMixin):
         length -= 4
 
         # XXXcompat
-        cls.parser_old(match, buf, offset, length)
+        # OFPMatch.fields is parsed from here when it's accessed
+        match._old_fields_buf = (buf, offset, length)
 
         fields = []
         while length > 0:
-            n, value, mask, field_len = ofproto_v1_3.oxm_parse(buf, offset)
-            k, uv = ofproto_v1_3.oxm_to_user(n, value, mask)
+            k, uv, field_len = ofproto_v1_3.oxm_parse_user(buf, offset)
             fields.append((k, uv))
             offset += field_len
             length -= field_len
@@ -2037,25 +2069,28 @@ class OFPPacketIn(MsgBase):
         self.match = match
         self.data = data
 
+    @staticmethod
+    def _parser_data(buf, match_offset, total_len):
+        (_type, length) = struct.unpack_from('!HH', buf, match_offset)
+        data = buf[match_offset + utils.round_up(length, 8) + 2:]
+        if total_len < len(data):
+            # discard padding for 8-byte alignment of OFP packet
+            data = data[:total_len]
+        return data
+
     @classmethod
     def parser(cls, datapath, version, msg_type, msg_len, xid, buf):
         msg = super(OFPPacketIn, cls).parser(datapath, version, msg_type,
                                              msg_len, xid, buf)
         (msg.buffer_id, msg.total_len, msg.reason,
-         msg.table_id, msg.cookie) = struct.unpack_from(
-            ofproto_v1_3.OFP_PACKET_IN_PACK_STR,
-            msg.buf, ofproto_v1_3.OFP_HEADER_SIZE)
+         msg.table_id, msg.cookie) = \
+            ofproto_v1_3.OFP_PACKET_IN_STRUCT.unpack_from(
+                msg.buf, ofproto_v1_3.OFP_HEADER_SIZE)
 
-        msg.match = OFPMatch.parser(msg.buf, ofproto_v1_3.OFP_PACKET_IN_SIZE -
-                                    ofproto_v1_3.OFP_MATCH_SIZE)
-
-        match_len = utils.round_up(msg.match.length, 8)
-        msg.data = msg.buf[(ofproto_v1_3.OFP_PACKET_IN_SIZE -
-                            ofproto_v1_3.OFP_MATCH_SIZE + match_len + 2):]
-
-        if msg.total_len < len(msg.data):
-            # discard padding for 8-byte alignment of OFP packet
-            msg.data = msg.data[:msg.total_len]
+        offset = ofproto_v1_3.OFP_PACKET_IN_SIZE - ofproto_v1_3.OFP_MATCH_SIZE
+        msg._set_lazy_attr('match', OFPMatch.parser, msg.buf, offset)
+        msg._set_lazy_attr('data', cls._parser_data, msg.buf, offset,
+                           msg.total_len)
 
         return msg
 
@@ -2143,14 +2178,13 @@ class OFPFlowRemoved(MsgBase):
         (msg.cookie, msg.priority, msg.reason,
          msg.table_id, msg.duration_sec, msg.duration_nsec,
          msg.idle_timeout, msg.hard_timeout, msg.packet_count,
-         msg.byte_count) = struct.unpack_from(
-            ofproto_v1_3.OFP_FLOW_REMOVED_PACK_STR0,
+         msg.byte_count) = ofproto_v1_3.OFP_FLOW_REMOVED_STRUCT0.unpack_from(
             msg.buf, ofproto_v1_3.OFP_HEADER_SIZE)
 
         offset = (ofproto_v1_3.OFP_FLOW_REMOVED_SIZE -
                   ofproto_v1_3.OFP_MATCH_SIZE)
 
-        msg.match = OFPMatch.parser(msg.buf, offset)
+        msg._set_lazy_attr('match', OFPMatch.parser, msg.buf, offset)
 
         return msg
 
@@ -2158,6 +2192,8 @@ class OFPFlowRemoved(MsgBase):
 class OFPPort(ofproto_parser.namedtuple('OFPPort', (
         'port_no', 'hw_addr', 'name', 'config', 'state', 'curr',
         'advertised', 'supported', 'peer', 'curr_speed', 'max_speed'))):
+    __slots__ = ()
+    length = ofproto_v1_3.OFP_PORT_SIZE
 
     _TYPE = {
         'ascii': [
@@ -2172,15 +2208,13 @@ class OFPPort(ofproto_parser.namedtuple('OFPPort', (
 
     @classmethod
     def parser(cls, buf, offset):
-        port = struct.unpack_from(ofproto_v1_3.OFP_PORT_PACK_STR, buf, offset)
+        port = ofproto_v1_3.OFP_PORT_STRUCT.unpack_from(buf, offset)
         port = list(port)
         i = cls._fields.index('hw_addr')
         port[i] = addrconv.mac.bin_to_text(port[i])
         i = cls._fields.index('name')
         port[i] = port[i].rstrip('\0')
-        ofpport = cls(*port)
-        ofpport.length = ofproto_v1_3.OFP_PORT_SIZE
-        return ofpport
+        return cls(*port)
 
 
 @_register_parser
@@ -2230,9 +2264,8 @@ class OFPPortStatus(MsgBase):
     def parser(cls, datapath, version, msg_type, msg_len, xid, buf):
         msg = super(OFPPortStatus, cls).parser(datapath, version, msg_type,
                                                msg_len, xid, buf)
-        msg.reason = struct.unpack_from(
-            ofproto_v1_3.OFP_PORT_STATUS_PACK_STR, msg.buf,
-            ofproto_v1_3.OFP_HEADER_SIZE)[0]
+        msg.reason = ofproto_v1_3.OFP_PORT_STATUS_STRUCT.unpack_from(
+            msg.buf, ofproto_v1_3.OFP_HEADER_SIZE)[0]
         msg.desc = OFPPort.parser(msg.buf,
                                   ofproto_v1_3.OFP_PORT_STATUS_DESC_OFFSET)
         return msg
@@ -2439,9 +2472,9 @@ class OFPInstructionGotoTable(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, table_id) = struct.unpack_from(
-            ofproto_v1_3.OFP_INSTRUCTION_GOTO_TABLE_PACK_STR,
-            buf, offset)
+        (type_, len_, table_id) = \
+            ofproto_v1_3.OFP_INSTRUCTION_GOTO_TABLE_STRUCT.unpack_from(
+                buf, offset)
         return cls(table_id)
 
     def serialize(self, buf, offset):
@@ -2472,9 +2505,9 @@ class OFPInstructionWriteMetadata(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, metadata, metadata_mask) = struct.unpack_from(
-            ofproto_v1_3.OFP_INSTRUCTION_WRITE_METADATA_PACK_STR,
-            buf, offset)
+        (type_, len_, metadata, metadata_mask) = \
+            ofproto_v1_3.OFP_INSTRUCTION_WRITE_METADATA_STRUCT.unpack_from(
+                buf, offset)
         return cls(metadata, metadata_mask)
 
     def serialize(self, buf, offset):
@@ -2504,6 +2537,8 @@ class OFPInstructionActions(StringifyMixin):
 
     ``type`` attribute corresponds to ``type_`` parameter of __init__.
     """
+    __slots__ = ('type', 'actions', 'len')
+
     def __init__(self, type_, actions=None, len_=None):
         super(OFPInstructionActions, self).__init__()
         self.type = type_
@@ -2511,8 +2546,8 @@ class OFPInstructionActions(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto_v1_3.OFP_INSTRUCTION_ACTIONS_PACK_STR,
+        (type_,
+         len_) = ofproto_v1_3.OFP_INSTRUCTION_ACTIONS_STRUCT.unpack_from(
             buf, offset)
 
         offset += ofproto_v1_3.OFP_INSTRUCTION_ACTIONS_SIZE
@@ -2567,8 +2602,8 @@ class OFPInstructionMeter(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, meter_id) = struct.unpack_from(
-            ofproto_v1_3.OFP_INSTRUCTION_METER_PACK_STR,
+        (type_, len_,
+         meter_id) = ofproto_v1_3.OFP_INSTRUCTION_METER_STRUCT.unpack_from(
             buf, offset)
         return cls(meter_id)
 
@@ -2578,6 +2613,8 @@ class OFPInstructionMeter(StringifyMixin):
 
 
 class OFPActionHeader(StringifyMixin):
+    __slots__ = ('type', 'len')
+
     def __init__(self, type_, len_):
         self.type = type_
         self.len = len_
@@ -2588,6 +2625,7 @@ class OFPActionHeader(StringifyMixin):
 
 
 class OFPAction(OFPActionHeader):
+    __slots__ = ()
     _ACTION_TYPES = {}
 
     @staticmethod
@@ -2606,8 +2644,8 @@ class OFPAction(OFPActionHeader):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_ = struct.unpack_from(
-            ofproto_v1_3.OFP_ACTION_HEADER_PACK_STR, buf, offset)
+        type_, len_ = ofproto_v1_3.OFP_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         cls_ = cls._ACTION_TYPES.get(type_)
         assert cls_ is not None
         return cls_.parser(buf, offset)
@@ -2628,6 +2666,8 @@ class OFPActionOutput(OFPAction):
     max_len          Max length to send to controller
     ================ ======================================================
     """
+    __slots__ = ('port', 'max_len')
+
     def __init__(self, port, max_len=ofproto_v1_3.OFPCML_MAX,
                  type_=None, len_=None):
         super(OFPActionOutput, self).__init__()
@@ -2636,8 +2676,9 @@ class OFPActionOutput(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, port, max_len = struct.unpack_from(
-            ofproto_v1_3.OFP_ACTION_OUTPUT_PACK_STR, buf, offset)
+        (type_, len_, port,
+         max_len) = ofproto_v1_3.OFP_ACTION_OUTPUT_STRUCT.unpack_from(
+            buf, offset)
         return cls(port, max_len)
 
     def serialize(self, buf, offset):
@@ -2665,8 +2706,9 @@ class OFPActionGroup(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, group_id) = struct.unpack_from(
-            ofproto_v1_3.OFP_ACTION_GROUP_PACK_STR, buf, offset)
+        (type_, len_,
+         group_id) = ofproto_v1_3.OFP_ACTION_GROUP_STRUCT.unpack_from(
+            buf, offset)
         return cls(group_id)
 
     def serialize(self, buf, offset):
@@ -2695,8 +2737,9 @@ class OFPActionSetQueue(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, queue_id) = struct.unpack_from(
-            ofproto_v1_3.OFP_ACTION_SET_QUEUE_PACK_STR, buf, offset)
+        (type_, len_,
+         queue_id) = ofproto_v1_3.OFP_ACTION_SET_QUEUE_STRUCT.unpack_from(
+            buf, offset)
         return cls(queue_id)
 
     def serialize(self, buf, offset):
@@ -2724,8 +2767,9 @@ class OFPActionSetMplsTtl(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, mpls_ttl) = struct.unpack_from(
-            ofproto_v1_3.OFP_ACTION_MPLS_TTL_PACK_STR, buf, offset)
+        (type_, len_,
+         mpls_ttl) = ofproto_v1_3.OFP_ACTION_MPLS_TTL_STRUCT.unpack_from(
+            buf, offset)
         return cls(mpls_ttl)
 
     def serialize(self, buf, offset):
@@ -2746,8 +2790,8 @@ class OFPActionDecMplsTtl(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto_v1_3.OFP_ACTION_HEADER_PACK_STR, buf, offset)
+        (type_, len_) = ofproto_v1_3.OFP_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         return cls()
 
 
@@ -2771,8 +2815,9 @@ class OFPActionSetNwTtl(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, nw_ttl) = struct.unpack_from(
-            ofproto_v1_3.OFP_ACTION_NW_TTL_PACK_STR, buf, offset)
+        (type_, len_,
+         nw_ttl) = ofproto_v1_3.OFP_ACTION_NW_TTL_STRUCT.unpack_from(
+            buf, offset)
         return cls(nw_ttl)
 
     def serialize(self, buf, offset):
@@ -2793,8 +2838,8 @@ class OFPActionDecNwTtl(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto_v1_3.OFP_ACTION_HEADER_PACK_STR, buf, offset)
+        (type_, len_) = ofproto_v1_3.OFP_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         return cls()
 
 
@@ -2812,8 +2857,8 @@ class OFPActionCopyTtlOut(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto_v1_3.OFP_ACTION_HEADER_PACK_STR, buf, offset)
+        (type_, len_) = ofproto_v1_3.OFP_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         return cls()
 
 
@@ -2831,8 +2876,8 @@ class OFPActionCopyTtlIn(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto_v1_3.OFP_ACTION_HEADER_PACK_STR, buf, offset)
+        (type_, len_) = ofproto_v1_3.OFP_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         return cls()
 
 
@@ -2856,8 +2901,9 @@ class OFPActionPushVlan(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, ethertype) = struct.unpack_from(
-            ofproto_v1_3.OFP_ACTION_PUSH_PACK_STR, buf, offset)
+        (type_, len_,
+         ethertype) = ofproto_v1_3.OFP_ACTION_PUSH_STRUCT.unpack_from(
+            buf, offset)
         return cls(ethertype)
 
     def serialize(self, buf, offset):
@@ -2885,8 +2931,9 @@ class OFPActionPushMpls(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, ethertype) = struct.unpack_from(
-            ofproto_v1_3.OFP_ACTION_PUSH_PACK_STR, buf, offset)
+        (type_, len_,
+         ethertype) = ofproto_v1_3.OFP_ACTION_PUSH_STRUCT.unpack_from(
+            buf, offset)
         return cls(ethertype)
 
     def serialize(self, buf, offset):
@@ -2907,8 +2954,8 @@ class OFPActionPopVlan(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto_v1_3.OFP_ACTION_HEADER_PACK_STR, buf, offset)
+        (type_, len_) = ofproto_v1_3.OFP_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         return cls()
 
 
@@ -2926,8 +2973,9 @@ class OFPActionPopMpls(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, ethertype) = struct.unpack_from(
-            ofproto_v1_3.OFP_ACTION_POP_MPLS_PACK_STR, buf, offset)
+        (type_, len_,
+         ethertype) = ofproto_v1_3.OFP_ACTION_POP_MPLS_STRUCT.unpack_from(
+            buf, offset)
         return cls(ethertype)
 
     def serialize(self, buf, offset):
@@ -2971,8 +3019,8 @@ class OFPActionSetField(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto_v1_3.OFP_ACTION_SET_FIELD_PACK_STR, buf, offset)
+        (type_, len_) = ofproto_v1_3.OFP_ACTION_SET_FIELD_STRUCT.unpack_from(
+            buf, offset)
         (n, value, mask, _len) = ofproto_v1_3.oxm_parse(buf, offset + 4)
         k, uv = ofproto_v1_3.oxm_to_user(n, value, mask)
         action = cls(**{k: uv})
@@ -3078,8 +3126,9 @@ class OFPActionPushPbb(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, ethertype) = struct.unpack_from(
-            ofproto_v1_3.OFP_ACTION_PUSH_PACK_STR, buf, offset)
+        (type_, len_,
+         ethertype) = ofproto_v1_3.OFP_ACTION_PUSH_STRUCT.unpack_from(
+            buf, offset)
         return cls(ethertype)
 
     def serialize(self, buf, offset):
@@ -3101,14 +3150,14 @@ class OFPActionPopPbb(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto_v1_3.OFP_ACTION_HEADER_PACK_STR, buf, offset)
+        (type_, len_) = ofproto_v1_3.OFP_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         return cls()
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_) = struct.unpack_from(
-            ofproto_v1_3.OFP_ACTION_HEADER_PACK_STR, buf, offset)
+        (type_, len_) = ofproto_v1_3.OFP_ACTION_HEADER_STRUCT.unpack_from(
+            buf, offset)
         return cls()
 
 
@@ -3133,8 +3182,9 @@ class OFPActionExperimenter(OFPAction):
 
     @classmethod
     def parser(cls, buf, offset):
-        (type_, len_, experimenter) = struct.unpack_from(
-            ofproto_v1_3.OFP_ACTION_EXPERIMENTER_HEADER_PACK_STR, buf, offset)
+        (type_, len_, experimenter) = \
+            ofproto_v1_3.OFP_ACTION_EXPERIMENTER_HEADER_STRUCT.unpack_from(
+                buf, offset)
         return cls(experimenter)
 
     def serialize(self, buf, offset):
@@ -3152,8 +3202,9 @@ class OFPBucket(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        (len_, weight, watch_port, watch_group) = struct.unpack_from(
-            ofproto_v1_3.OFP_BUCKET_PACK_STR, buf, offset)
+        (len_, weight, watch_port,
+         watch_group) = ofproto_v1_3.OFP_BUCKET_STRUCT.unpack_from(
+            buf, offset)
         msg = cls(weight, watch_port, watch_group, [])
         msg.len = len_
 
@@ -3467,32 +3518,51 @@ class OFPMultipartReply(MsgBase):
     def parser_stats(cls, datapath, version, msg_type, msg_len, xid, buf):
         msg = MsgBase.parser.__func__(
             cls, datapath, version, msg_type, msg_len, xid, buf)
-        msg.body = msg.parser_stats_body(msg.buf, msg.msg_len,
-                                         ofproto_v1_3.OFP_MULTIPART_REPLY_SIZE)
+        msg._set_lazy_attr('body', msg.parser_stats_body, msg.buf,
+                           msg.msg_len, ofproto_v1_3.OFP_MULTIPART_REPLY_SIZE)
         return msg
 
+    @classmethod
+    def _iter_body(cls, buf, msg_len):
+        offset = ofproto_v1_3.OFP_MULTIPART_REPLY_SIZE
+        while offset < msg_len:
+            b = cls.cls_stats_body_cls.parser(buf, offset)
+            yield b
+            offset += b.length if hasattr(b, 'length') else b.len
+
+    @classmethod
+    def _parser_body(cls, buf, msg_len):
+        body = list(cls._iter_body(buf, msg_len))
+        if cls.cls_body_single_struct:
+            return body[0]
+        return body
+
+    def iter_body(self):
+        """
+        Iterate over the entries of the body, e.g. OFPFlowStats, decoding
+        each of them from the message only when it's reached.  Unlike
+        ``body``, the entries aren't kept in the message, so a reply
+        with a large body can be processed an entry at a time.
+        """
+        if 'body' in self.__dict__ or self.buf is None:
+            # already decoded, or composed rather than parsed
+            if self.cls_body_single_struct:
+                return iter([self.body])
+            return iter(self.body)
+        return self._iter_body(self.buf, self.msg_len)
+
     @classmethod
     def parser(cls, datapath, version, msg_type, msg_len, xid, buf):
-        type_, flags = struct.unpack_from(
-            ofproto_v1_3.OFP_MULTIPART_REPLY_PACK_STR, buffer(buf),
-            ofproto_v1_3.OFP_HEADER_SIZE)
+        type_, flags = ofproto_v1_3.OFP_MULTIPART_REPLY_STRUCT.unpack_from(
+            buffer(buf), ofproto_v1_3.OFP_HEADER_SIZE)
         stats_type_cls = cls._STATS_MSG_TYPES.get(type_)
         msg = super(OFPMultipartReply, stats_type_cls).parser(
             datapath, version, msg_type, msg_len, xid, buf)
         msg.type = type_
         msg.flags = flags
-
-        offset = ofproto_v1_3.OFP_MULTIPART_REPLY_SIZE
-        body = []
-        while offset < msg_len:
-            b = stats_type_cls.cls_stats_body_cls.parser(msg.buf, offset)
-            body.append(b)
-            offset += b.length if hasattr(b, 'length') else b.len
-
-        if stats_type_cls.cls_body_single_struct:
-            msg.body = body[0]
-        else:
-            msg.body = body
+        # the body is decoded when it's accessed for the first time
+        msg._set_lazy_attr('body', stats_type_cls._parser_body, msg.buf,
+                           msg_len)
         return msg
 
 
@@ -3511,8 +3581,7 @@ class OFPDescStats(ofproto_parser.namedtuple('OFPDescStats', (
 
     @classmethod
     def parser(cls, buf, offset):
-        desc = struct.unpack_from(ofproto_v1_3.OFP_DESC_PACK_STR,
-                                  buf, offset)
+        desc = ofproto_v1_3.OFP_DESC_STRUCT.unpack_from(buf, offset)
         desc = list(desc)
         desc = map(lambda x: x.rstrip('\0'), desc)
         stats = cls(*desc)
@@ -3579,6 +3648,11 @@ class OFPDescStatsReply(OFPMultipartReply):
 
 
 class OFPFlowStats(StringifyMixin):
+    __slots__ = ('length', 'table_id', 'duration_sec', 'duration_nsec',
+                 'priority', 'idle_timeout', 'hard_timeout', 'flags',
+                 'cookie', 'packet_count', 'byte_count', 'match',
+                 'instructions')
+
     def __init__(self, table_id=None, duration_sec=None, duration_nsec=None,
                  priority=None, idle_timeout=None, hard_timeout=None,
                  flags=None, cookie=None, packet_count=None,
@@ -3608,8 +3682,8 @@ class OFPFlowStats(StringifyMixin):
          flow_stats.priority, flow_stats.idle_timeout,
          flow_stats.hard_timeout, flow_stats.flags,
          flow_stats.cookie, flow_stats.packet_count,
-         flow_stats.byte_count) = struct.unpack_from(
-            ofproto_v1_3.OFP_FLOW_STATS_0_PACK_STR, buf, offset)
+         flow_stats.byte_count) = \
+            ofproto_v1_3.OFP_FLOW_STATS_0_STRUCT.unpack_from(buf, offset)
         offset += ofproto_v1_3.OFP_FLOW_STATS_0_SIZE
 
         flow_stats.match = OFPMatch.parser(buf, offset)
@@ -3742,8 +3816,8 @@ class OFPAggregateStats(ofproto_parser.namedtuple('OFPAggregateStats', (
         'packet_count', 'byte_count', 'flow_count'))):
     @classmethod
     def parser(cls, buf, offset):
-        agg = struct.unpack_from(
-            ofproto_v1_3.OFP_AGGREGATE_STATS_REPLY_PACK_STR, buf, offset)
+        agg = ofproto_v1_3.OFP_AGGREGATE_STATS_REPLY_STRUCT.unpack_from(
+            buf, offset)
         stats = cls(*agg)
         stats.length = ofproto_v1_3.OFP_AGGREGATE_STATS_REPLY_SIZE
         return stats
@@ -3835,8 +3909,7 @@ class OFPTableStats(ofproto_parser.namedtuple('OFPTableStats', (
         'matched_count'))):
     @classmethod
     def parser(cls, buf, offset):
-        tbl = struct.unpack_from(ofproto_v1_3.OFP_TABLE_STATS_PACK_STR,
-                                 buf, offset)
+        tbl = ofproto_v1_3.OFP_TABLE_STATS_STRUCT.unpack_from(buf, offset)
         stats = cls(*tbl)
         stats.length = ofproto_v1_3.OFP_TABLE_STATS_SIZE
         return stats
@@ -3907,8 +3980,7 @@ class OFPPortStats(ofproto_parser.namedtuple('OFPPortStats', (
         'duration_sec', 'duration_nsec'))):
     @classmethod
     def parser(cls, buf, offset):
-        port = struct.unpack_from(ofproto_v1_3.OFP_PORT_STATS_PACK_STR,
-                                  buf, offset)
+        port = ofproto_v1_3.OFP_PORT_STATS_STRUCT.unpack_from(buf, offset)
         stats = cls(*port)
         stats.length = ofproto_v1_3.OFP_PORT_STATS_SIZE
         return stats
@@ -3997,8 +4069,7 @@ class OFPQueueStats(ofproto_parser.namedtuple('OFPQueueStats', (
         'duration_sec', 'duration_nsec'))):
     @classmethod
     def parser(cls, buf, offset):
-        queue = struct.unpack_from(ofproto_v1_3.OFP_QUEUE_STATS_PACK_STR,
-                                   buf, offset)
+        queue = ofproto_v1_3.OFP_QUEUE_STATS_STRUCT.unpack_from(buf, offset)
         stats = cls(*queue)
         stats.length = ofproto_v1_3.OFP_QUEUE_STATS_SIZE
         return stats
@@ -4084,8 +4155,9 @@ class OFPBucketCounter(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        packet_count, byte_count = struct.unpack_from(
-            ofproto_v1_3.OFP_BUCKET_COUNTER_PACK_STR, buf, offset)
+        (packet_count,
+         byte_count) = ofproto_v1_3.OFP_BUCKET_COUNTER_STRUCT.unpack_from(
+            buf, offset)
         return cls(packet_count, byte_count)
 
 
@@ -4105,8 +4177,7 @@ class OFPGroupStats(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        group = struct.unpack_from(ofproto_v1_3.OFP_GROUP_STATS_PACK_STR,
-                                   buf, offset)
+        group = ofproto_v1_3.OFP_GROUP_STATS_STRUCT.unpack_from(buf, offset)
         group_stats = cls(*group)
 
         group_stats.bucket_stats = []
@@ -4201,8 +4272,8 @@ class OFPGroupDescStats(StringifyMixin):
     def parser(cls, buf, offset):
         stats = cls()
 
-        (stats.length, stats.type, stats.group_id) = struct.unpack_from(
-            ofproto_v1_3.OFP_GROUP_DESC_STATS_PACK_STR, buf, offset)
+        (stats.length, stats.type, stats.group_id) = \
+            ofproto_v1_3.OFP_GROUP_DESC_STATS_STRUCT.unpack_from(buf, offset)
         offset += ofproto_v1_3.OFP_GROUP_DESC_STATS_SIZE
 
         stats.buckets = []
@@ -4280,8 +4351,8 @@ class OFPGroupFeaturesStats(ofproto_parser.namedtuple('OFPGroupFeaturesStats',
                              'actions'))):
     @classmethod
     def parser(cls, buf, offset):
-        group_features = struct.unpack_from(
-            ofproto_v1_3.OFP_GROUP_FEATURES_PACK_STR, buf, offset)
+        group_features = ofproto_v1_3.OFP_GROUP_FEATURES_STRUCT.unpack_from(
+            buf, offset)
         types = group_features[0]
         capabilities = group_features[1]
         max_groups = list(group_features[2:6])
@@ -4358,8 +4429,8 @@ class OFPMeterBandStats(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        band_stats = struct.unpack_from(
-            ofproto_v1_3.OFP_METER_BAND_STATS_PACK_STR, buf, offset)
+        band_stats = ofproto_v1_3.OFP_METER_BAND_STATS_STRUCT.unpack_from(
+            buf, offset)
         return cls(*band_stats)
 
 
@@ -4384,8 +4455,8 @@ class OFPMeterStats(StringifyMixin):
         (meter_stats.meter_id, meter_stats.len,
          meter_stats.flow_count, meter_stats.packet_in_count,
          meter_stats.byte_in_count, meter_stats.duration_sec,
-         meter_stats.duration_nsec) = struct.unpack_from(
-            ofproto_v1_3.OFP_METER_STATS_PACK_STR, buf, offset)
+         meter_stats.duration_nsec) = \
+            ofproto_v1_3.OFP_METER_STATS_STRUCT.unpack_from(buf, offset)
         offset += ofproto_v1_3.OFP_METER_STATS_SIZE
 
         meter_stats.band_stats = []
@@ -4496,8 +4567,9 @@ class OFPMeterBandHeader(OFPMeterBand):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, _rate, _burst_size = struct.unpack_from(
-            ofproto_v1_3.OFP_METER_BAND_HEADER_PACK_STR, buf, offset)
+        (type_, len_, _rate,
+         _burst_size) = ofproto_v1_3.OFP_METER_BAND_HEADER_STRUCT.unpack_from(
+            buf, offset)
         cls_ = cls._METER_BAND[type_]
         assert cls_.cls_meter_band_len == len_
         return cls_.parser(buf, offset)
@@ -4517,8 +4589,9 @@ class OFPMeterBandDrop(OFPMeterBandHeader):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, rate, burst_size = struct.unpack_from(
-            ofproto_v1_3.OFP_METER_BAND_DROP_PACK_STR, buf, offset)
+        (type_, len_, rate,
+         burst_size) = ofproto_v1_3.OFP_METER_BAND_DROP_STRUCT.unpack_from(
+            buf, offset)
         assert cls.cls_meter_band_type == type_
         assert cls.cls_meter_band_len == len_
         return cls(rate, burst_size)
@@ -4541,8 +4614,9 @@ class OFPMeterBandDscpRemark(OFPMeterBandHeader):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, rate, burst_size, prec_level = struct.unpack_from(
-            ofproto_v1_3.OFP_METER_BAND_DSCP_REMARK_PACK_STR, buf, offset)
+        type_, len_, rate, burst_size, prec_level = \
+            ofproto_v1_3.OFP_METER_BAND_DSCP_REMARK_STRUCT.unpack_from(
+                buf, offset)
         assert cls.cls_meter_band_type == type_
         assert cls.cls_meter_band_len == len_
         return cls(rate, burst_size, prec_level)
@@ -4565,8 +4639,9 @@ class OFPMeterBandExperimenter(OFPMeterBandHeader):
 
     @classmethod
     def parser(cls, buf, offset):
-        type_, len_, rate, burst_size, experimenter = struct.unpack_from(
-            ofproto_v1_3.OFP_METER_BAND_EXPERIMENTER_PACK_STR, buf, offset)
+        type_, len_, rate, burst_size, experimenter = \
+            ofproto_v1_3.OFP_METER_BAND_EXPERIMENTER_STRUCT.unpack_from(
+                buf, offset)
         assert cls.cls_meter_band_type == type_
         assert cls.cls_meter_band_len == len_
         return cls(rate, burst_size, experimenter)
@@ -4585,8 +4660,8 @@ class OFPMeterConfigStats(StringifyMixin):
         meter_config = cls()
 
         (meter_config.length, meter_config.flags,
-         meter_config.meter_id) = struct.unpack_from(
-            ofproto_v1_3.OFP_METER_CONFIG_PACK_STR, buf, offset)
+         meter_config.meter_id) = \
+            ofproto_v1_3.OFP_METER_CONFIG_STRUCT.unpack_from(buf, offset)
         offset += ofproto_v1_3.OFP_METER_CONFIG_SIZE
 
         meter_config.bands = []
@@ -4674,8 +4749,8 @@ class OFPMeterFeaturesStats(ofproto_parser.namedtuple('OFPMeterFeaturesStats',
                              'max_band', 'max_color'))):
     @classmethod
     def parser(cls, buf, offset):
-        meter_features = struct.unpack_from(
-            ofproto_v1_3.OFP_METER_FEATURES_PACK_STR, buf, offset)
+        meter_features = ofproto_v1_3.OFP_METER_FEATURES_STRUCT.unpack_from(
+            buf, offset)
         stats = cls(*meter_features)
         stats.length = ofproto_v1_3.OFP_METER_FEATURES_SIZE
         return stats
@@ -4772,8 +4847,7 @@ class OFPTableFeaturesStats(StringifyMixin):
          name, table_features.metadata_match,
          table_features.metadata_write, table_features.config,
          table_features.max_entries
-         ) = struct.unpack_from(ofproto_v1_3.OFP_TABLE_FEATURES_PACK_STR,
-                                buf, offset)
+         ) = ofproto_v1_3.OFP_TABLE_FEATURES_STRUCT.unpack_from(buf, offset)
         table_features.name = name.rstrip('\0')
 
         props = []
@@ -5212,9 +5286,9 @@ class OFPExperimenterMultipart(ofproto_parser.namedtuple(
 
     @classmethod
     def parser(cls, buf, offset):
-        args = struct.unpack_from(
-            ofproto_v1_3.OFP_EXPERIMENTER_MULTIPART_HEADER_PACK_STR, buf,
-            offset)
+        args = \
+            ofproto_v1_3.OFP_EXPERIMENTER_MULTIPART_HEADER_STRUCT.unpack_from(
+                buf, offset)
         args = list(args)
         args.append(buf[offset +
                         ofproto_v1_3.OFP_EXPERIMENTER_MULTIPART_HEADER_SIZE:])
@@ -5449,8 +5523,8 @@ class OFPQueueProp(OFPQueuePropHeader):
 
     @classmethod
     def parser(cls, buf, offset):
-        (property_, len_) = struct.unpack_from(
-            ofproto_v1_3.OFP_QUEUE_PROP_HEADER_PACK_STR,
+        (property_,
+         len_) = ofproto_v1_3.OFP_QUEUE_PROP_HEADER_STRUCT.unpack_from(
             buf, offset)
         cls_ = cls._QUEUE_PROP_PROPERTIES.get(property_)
         offset += ofproto_v1_3.OFP_QUEUE_PROP_HEADER_SIZE
@@ -5467,8 +5541,8 @@ class OFPQueuePropMinRate(OFPQueueProp):
 
     @classmethod
     def parser(cls, buf, offset):
-        (rate,) = struct.unpack_from(
-            ofproto_v1_3.OFP_QUEUE_PROP_MIN_RATE_PACK_STR, buf, offset)
+        (rate,) = ofproto_v1_3.OFP_QUEUE_PROP_MIN_RATE_STRUCT.unpack_from(
+            buf, offset)
         return cls(rate)
 
 
@@ -5482,8 +5556,8 @@ class OFPQueuePropMaxRate(OFPQueueProp):
 
     @classmethod
     def parser(cls, buf, offset):
-        (rate,) = struct.unpack_from(
-            ofproto_v1_3.OFP_QUEUE_PROP_MAX_RATE_PACK_STR, buf, offset)
+        (rate,) = ofproto_v1_3.OFP_QUEUE_PROP_MAX_RATE_STRUCT.unpack_from(
+            buf, offset)
         return cls(rate)
 
 
@@ -5500,8 +5574,9 @@ class OFPPacketQueue(StringifyMixin):
 
     @classmethod
     def parser(cls, buf, offset):
-        (queue_id, port, len_) = struct.unpack_from(
-            ofproto_v1_3.OFP_PACKET_QUEUE_PACK_STR, buf, offset)
+        (queue_id, port,
+         len_) = ofproto_v1_3.OFP_PACKET_QUEUE_STRUCT.unpack_from(
+            buf, offset)
         length = ofproto_v1_3.OFP_PACKET_QUEUE_SIZE
         offset += ofproto_v1_3.OFP_PACKET_QUEUE_SIZE
         properties = []
@@ -5550,9 +5625,9 @@ class OFPQueueGetConfigReply(MsgBase):
         msg = super(OFPQueueGetConfigReply, cls).parser(datapath, version,
                                                         msg_type,
                                                         msg_len, xid, buf)
-        (msg.port,) = struct.unpack_from(
-            ofproto_v1_3.OFP_QUEUE_GET_CONFIG_REPLY_PACK_STR, msg.buf,
-            ofproto_v1_3.OFP_HEADER_SIZE)
+        (msg.port,) = \
+            ofproto_v1_3.OFP_QUEUE_GET_CONFIG_REPLY_STRUCT.unpack_from(
+                msg.buf, ofproto_v1_3.OFP_HEADER_SIZE)
 
         msg.queues = []
         offset = ofproto_v1_3.OFP_QUEUE_GET_CONFIG_REPLY_SIZE
@@ -5655,9 +5730,9 @@ class OFPRoleReply(MsgBase):
         msg = super(OFPRoleReply, cls).parser(datapath, version,
                                               msg_type, msg_len, xid,
                                               buf)
-        (msg.role, msg.generation_id) = struct.unpack_from(
-            ofproto_v1_3.OFP_ROLE_REQUEST_PACK_STR, msg.buf,
-            ofproto_v1_3.OFP_HEADER_SIZE)
+        (msg.role,
+         msg.generation_id) = ofproto_v1_3.OFP_ROLE_REQUEST_STRUCT.unpack_from(
+            msg.buf, ofproto_v1_3.OFP_HEADER_SIZE)
         return msg
 
 
@@ -5743,9 +5818,9 @@ class OFPGetAsyncReply(MsgBase):
                                                   xid, buf)
         (packet_in_mask_m, packet_in_mask_s,
          port_status_mask_m, port_status_mask_s,
-         flow_removed_mask_m, flow_removed_mask_s) = struct.unpack_from(
-            ofproto_v1_3.OFP_ASYNC_CONFIG_PACK_STR, msg.buf,
-            ofproto_v1_3.OFP_HEADER_SIZE)
+         flow_removed_mask_m, flow_removed_mask_s) = \
+            ofproto_v1_3.OFP_ASYNC_CONFIG_STRUCT.unpack_from(
+                msg.buf, ofproto_v1_3.OFP_HEADER_SIZE)
         msg.packet_in_mask = [packet_in_mask_m, packet_in_mask_s]
         msg.port_status_mask = [port_status_mask_m, port_status_mask_s]
         msg.flow_removed_mask = [flow_removed_mask_m, flow_removed_mask_s]
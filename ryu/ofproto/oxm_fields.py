@@ -144,11 +144,14 @@ def generate(modname):
 
     name_to_field = dict((f.name, f) for f in mod.oxm_types)
     num_to_field = dict((f.num, f) for f in mod.oxm_types)
+    header_to_field = _header_table(mod)
     add_attr('oxm_from_user', functools.partial(from_user, name_to_field))
     add_attr('oxm_to_user', functools.partial(to_user, num_to_field))
     add_attr('_oxm_field_desc', functools.partial(_field_desc, num_to_field))
     add_attr('oxm_normalize_user', functools.partial(normalize_user, mod))
     add_attr('oxm_parse', functools.partial(parse, mod))
+    add_attr('oxm_parse_user',
+             functools.partial(parse_user, mod, header_to_field))
     add_attr('oxm_serialize', functools.partial(serialize, mod))
     add_attr('oxm_to_jsondict', to_jsondict)
     add_attr('oxm_from_jsondict', from_jsondict)
@@ -213,42 +216,107 @@ def normalize_user(mod, k, uv):
     return (k2, uv2)
 
 
+_HDR_STRUCT = struct.Struct('!I')
+_EXP_HDR_STRUCT = struct.Struct('!I')  # experimenter_id
+_ONF_EXP_TYPE_STRUCT = struct.Struct('!H')
+
+# the Structs of the values, by their lengths
+_VALUE_STRUCTS = {}
+
+
+def _value_struct(value_len):
+    s = _VALUE_STRUCTS.get(value_len)
+    if s is None:
+        s = _VALUE_STRUCTS[value_len] = struct.Struct('!%ds' % value_len)
+    return s
+
+
 def parse(mod, buf, offset):
-    hdr_pack_str = '!I'
-    (header, ) = struct.unpack_from(hdr_pack_str, buf, offset)
-    hdr_len = struct.calcsize(hdr_pack_str)
+    (header, ) = _HDR_STRUCT.unpack_from(buf, offset)
+    hdr_len = _HDR_STRUCT.size
     oxm_type = header >> 9  # class|field
     oxm_hasmask = mod.oxm_tlv_header_extract_hasmask(header)
     len = mod.oxm_tlv_header_extract_length(header)
     oxm_class = oxm_type >> 7
     if oxm_class == OFPXMC_EXPERIMENTER:
-        exp_hdr_pack_str = '!I'  # experimenter_id
-        (exp_id, ) = struct.unpack_from(exp_hdr_pack_str, buf,
-                                        offset + hdr_len)
-        exp_hdr_len = struct.calcsize(exp_hdr_pack_str)
+        (exp_id, ) = _EXP_HDR_STRUCT.unpack_from(buf, offset + hdr_len)
+        exp_hdr_len = _EXP_HDR_STRUCT.size
         if exp_id == ofproto_common.ONF_EXPERIMENTER_ID:
-            onf_exp_type_pack_str = '!H'
-            (exp_type, ) = struct.unpack_from(onf_exp_type_pack_str, buf,
-                                              offset + hdr_len + exp_hdr_len)
-            exp_hdr_len += struct.calcsize(onf_exp_type_pack_str)
+            (exp_type, ) = _ONF_EXP_TYPE_STRUCT.unpack_from(
+                buf, offset + hdr_len + exp_hdr_len)
+            exp_hdr_len += _ONF_EXP_TYPE_STRUCT.size
             num = (ONFExperimenter, exp_type)
     else:
         num = oxm_type
         exp_hdr_len = 0
     value_offset = offset + hdr_len + exp_hdr_len
     value_len = len - exp_hdr_len
-    value_pack_str = '!%ds' % value_len
-    assert struct.calcsize(value_pack_str) == value_len
-    (value, ) = struct.unpack_from(value_pack_str, buf, value_offset)
+    value_struct = _value_struct(value_len)
+    (value, ) = value_struct.unpack_from(buf, value_offset)
     if oxm_hasmask:
-        (mask, ) = struct.unpack_from(value_pack_str, buf,
-                                      value_offset + value_len)
+        (mask, ) = value_struct.unpack_from(buf, value_offset + value_len)
     else:
         mask = None
     field_len = hdr_len + (header & 0xff)
     return num, value, mask, field_len
 
 
+# the struct formats of the integers which to_user() can be skipped for
+_INT_PACK_STRS = {
+    1: 'B',
+    2: 'H',
+    4: 'I',
+    8: 'Q',
+}
+
+
+def _header_table(mod):
+    """
+    Return a dict mapping the TLV headers of the OpenFlow basic fields,
+    with and without mask, to (name, Struct of the value and the mask,
+    converter to the user representation or None).
+    """
+    table = {}
+    for f in mod.oxm_types:
+        if not isinstance(f, OpenFlowBasic):
+            continue
+        t = f.type
+        ofpxmt = f.num & 0x3f
+        if isinstance(t, IntDescr) and t.size in _INT_PACK_STRS:
+            pack_str = _INT_PACK_STRS[t.size]
+            to_user = None
+        else:
+            pack_str = '%ds' % t.size
+            to_user = t.to_user
+        table[mod.oxm_tlv_header(ofpxmt, t.size)] = (
+            f.name, struct.Struct('!' + pack_str), to_user)
+        table[mod.oxm_tlv_header_w(ofpxmt, t.size)] = (
+            f.name, struct.Struct('!' + pack_str * 2), to_user)
+    return table
+
+
+def parse_user(mod, header_to_field, buf, offset):
+    """
+    Parse a TLV directly into the "user" representation.
+    Returns (name, user_value, field_len).
+    """
+    (header, ) = _HDR_STRUCT.unpack_from(buf, offset)
+    field_len = _HDR_STRUCT.size + (header & 0xff)
+    try:
+        name, value_struct, to_user = header_to_field[header]
+    except KeyError:
+        # experimenter and unknown fields
+        n, value, mask, field_len = parse(mod, buf, offset)
+        name, user_value = mod.oxm_to_user(n, value, mask)
+        return name, user_value, field_len
+    values = value_struct.unpack_from(buf, offset + _HDR_STRUCT.size)
+    if to_user is not None:
+        values = [to_user(v) for v in values]
+    if len(values) == 1:
+        return name, values[0], field_len
+    return name, tuple(values), field_len
+
+
 def serialize(mod, n, value, mask, buf, offset):
     exp_hdr = bytearray()
     if isinstance(n, tuple):
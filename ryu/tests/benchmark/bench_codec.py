@@ -0,0 +1,156 @@
+# Copyright (C) 2013 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure the struct codecs of the OpenFlow parsers and serializers.
+
+First, every FOO_PACK_STR of ofproto_v1_0, ofproto_v1_2 and ofproto_v1_3
+is unpacked and packed again, through the struct functions with the
+format string as the parsers used to do, and through the precompiled
+FOO_STRUCT as the parsers do now.  The struct functions compile the
+format strings into a cache which is flushed once it holds 100 formats,
+which these modules have more than.  The serializers still pass the
+format strings to msg_pack_into(), which measured faster there.
+
+Then the messages in packet_data/of10, of12 and of13 are decoded,
+including their lazily decoded parts, and the controller-to-switch ones
+are built from the json in the unit tests and serialized.
+"""
+
+import json
+import os
+import struct
+import sys
+
+from ryu.tests.benchmark import common
+from ryu.ofproto import ofproto_parser
+from ryu.ofproto import ofproto_v1_0
+from ryu.ofproto import ofproto_v1_0_parser
+from ryu.ofproto import ofproto_v1_2
+from ryu.ofproto import ofproto_v1_2_parser
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_3_parser
+
+JSON_DIR = os.path.join(os.path.dirname(__file__), os.pardir, 'unit',
+                        'ofproto', 'json')
+
+_VERSIONS = [
+    ('of10', ofproto_v1_0, ofproto_v1_0_parser),
+    ('of12', ofproto_v1_2, ofproto_v1_2_parser),
+    ('of13', ofproto_v1_3, ofproto_v1_3_parser),
+]
+
+
+class _Datapath(object):
+    def __init__(self, ofp, ofpp):
+        self.ofproto = ofp
+        self.ofproto_parser = ofpp
+
+
+def load_structs():
+    """
+    Return (format string, Struct, values) of every FOO_PACK_STR.
+    """
+    structs = []
+    for _dir, ofp, _ofpp in _VERSIONS:
+        for k, v in sorted(vars(ofp).items()):
+            s = getattr(ofp, k.replace('_PACK_STR', '_STRUCT'), None)
+            if not k.endswith('_PACK_STR') or s is None:
+                continue
+            structs.append((v, s, s.unpack_from(bytearray(s.size))))
+    return structs
+
+
+def codec_by_format(structs, repeat):
+    for _i in xrange(repeat):
+        for fmt, s, values in structs:
+            buf = bytearray(s.size)
+            struct.unpack_from(fmt, buf, 0)
+            struct.pack_into(fmt, buf, 0, *values)
+
+
+def codec_by_struct(structs, repeat):
+    for _i in xrange(repeat):
+        for fmt, s, values in structs:
+            buf = bytearray(s.size)
+            s.unpack_from(buf, 0)
+            s.pack_into(buf, 0, *values)
+
+
+def load_serializable(version_dir, ofp, ofpp):
+    """
+    Return the controller-to-switch messages built from the json of
+    the unit tests for packet_data/<version_dir>.
+    """
+    dp = _Datapath(ofp, ofpp)
+    jdir = os.path.join(JSON_DIR, version_dir)
+    pdir = os.path.join(common.PACKET_DATA_DIR, version_dir)
+    msgs = []
+    for name in sorted(os.listdir(pdir)):
+        if not name.endswith('.packet'):
+            continue
+        buf = open(os.path.join(pdir, name), 'rb').read()
+        (version, msg_type, msg_len, xid) = ofproto_parser.header(buf)
+        if msg_type in ofpp._MSG_PARSERS:
+            continue
+        jsondict = json.load(open(os.path.join(jdir, name + '.json')))
+        msg = ofproto_parser.ofp_msg_from_jsondict(dp, jsondict)
+        try:
+            msg.serialize()
+        except Exception:
+            continue
+        msgs.append(msg)
+    return msgs
+
+
+def parse(msgs, ofpp, repeat):
+    for _i in xrange(repeat):
+        for _name, buf in msgs:
+            (version, msg_type, msg_len, xid) = ofproto_parser.header(buf)
+            msg = ofpp.msg_parser(None, version, msg_type, msg_len, xid,
+                                  buf)
+            msg._decode_lazy_attrs()
+
+
+def serialize(msgs, repeat):
+    for _i in xrange(repeat):
+        for msg in msgs:
+            msg.serialize()
+
+
+def main(args):
+    repeat = int(args[0]) if args else 1000
+
+    structs = load_structs()
+    count = len(structs) * repeat
+    print '%d structures, unpack and pack' % len(structs)
+    elapsed, _ret = common.measure(codec_by_format, structs, repeat)
+    common.report('  before (format strings)', count, elapsed, 'structs')
+    elapsed, _ret = common.measure(codec_by_struct, structs, repeat)
+    common.report('  after (precompiled Structs)', count, elapsed,
+                  'structs')
+
+    for version_dir, ofp, ofpp in _VERSIONS:
+        print 'packet_data/%s' % version_dir
+        msgs = common.load_packet_data(version_dir, ofpp)
+        elapsed, _ret = common.measure(parse, msgs, ofpp, repeat)
+        common.report('  parse', len(msgs) * repeat, elapsed)
+        msgs = load_serializable(version_dir, ofp, ofpp)
+        elapsed, _ret = common.measure(serialize, msgs, repeat)
+        common.report('  serialize', len(msgs) * repeat, elapsed)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
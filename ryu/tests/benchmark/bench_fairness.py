@@ -0,0 +1,161 @@
+# Copyright (C) 2013 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Multi-switch load test of the scheduling of Datapath._recv_loop.
+
+One switch floods the controller with packet-ins while the other
+switches send an echo request every 10ms. The echo latency seen by the
+quiet switches is reported for the former fixed limit (yield after 2048
+messages) and for the default budgets.
+
+    % python -m ryu.tests.benchmark.bench_fairness [duration [switches]]
+"""
+
+from ryu.lib import hub
+hub.patch()
+
+import socket
+import struct
+import sys
+import time
+
+from oslo.config import cfg
+
+from ryu.tests.benchmark import common
+from ryu.base import app_manager
+from ryu.controller import controller
+from ryu.controller import handler
+from ryu.controller import ofp_handler
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_3_parser
+
+CONF = cfg.CONF
+
+
+def _echo_request(xid):
+    return struct.pack(ofproto_v1_3.OFP_HEADER_PACK_STR,
+                       ofproto_v1_3.OFP_VERSION,
+                       ofproto_v1_3.OFPT_ECHO_REQUEST,
+                       ofproto_v1_3.OFP_HEADER_SIZE, xid)
+
+
+def _recv_msg(sock):
+    data = ''
+    while len(data) < ofproto_v1_3.OFP_HEADER_SIZE:
+        data += sock.recv(ofproto_v1_3.OFP_HEADER_SIZE - len(data))
+    (_version, msg_type, msg_len, xid) = struct.unpack_from(
+        ofproto_v1_3.OFP_HEADER_PACK_STR, data)
+    while len(data) < msg_len:
+        data += sock.recv(msg_len - len(data))
+    return msg_type, xid
+
+
+def _flooder(sock, blob, state):
+    while state['running']:
+        sock.sendall(blob)
+        state['flood'] += 1
+
+
+def _echo_client(sock, latencies, state):
+    xid = 0
+    while state['running']:
+        xid += 1
+        start = time.time()
+        sock.sendall(_echo_request(xid))
+        while True:
+            msg_type, reply_xid = _recv_msg(sock)
+            if (msg_type == ofproto_v1_3.OFPT_ECHO_REPLY and
+                    reply_xid == xid):
+                break
+        latencies.append(time.time() - start)
+        hub.sleep(0.01)
+
+
+def _connect():
+    sw, ctl = socket.socketpair()
+    dp = controller.Datapath(ctl, ('bench', 0))
+    dp.set_version(ofproto_v1_3.OFP_VERSION)
+    dp.set_state(handler.MAIN_DISPATCHER)
+    threads = [hub.spawn(dp._recv_loop), hub.spawn(dp._send_loop)]
+    return sw, dp, threads
+
+
+def run(duration, switches, packet_in, per_flood):
+    state = {'running': True, 'flood': 0}
+    latencies = []
+    threads = []
+    dps = []
+
+    sw, dp, dp_threads = _connect()
+    dps.append(dp)
+    threads.extend(dp_threads)
+    clients = [hub.spawn(_flooder, sw, packet_in * per_flood, state)]
+    for _i in range(switches):
+        sw, dp, dp_threads = _connect()
+        dps.append(dp)
+        threads.extend(dp_threads)
+        clients.append(hub.spawn(_echo_client, sw, latencies, state))
+
+    hub.sleep(duration)
+    state['running'] = False
+    for t in clients + threads:
+        hub.kill(t)
+    hub.joinall(clients + threads)
+    for dp in dps:
+        dp.socket.close()
+    return latencies, state['flood'] * per_flood
+
+
+def main(args):
+    duration = float(args[0]) if args else 5
+    switches = int(args[1]) if len(args) > 1 else 10
+    brick = app_manager.lookup_service_brick('ofp_event')
+    if brick is None:
+        CONF([], project='ryu')
+        brick = ofp_handler.OFPHandler()
+        app_manager.register_app(brick)
+
+    msgs = common.load_packet_data('of13', ofproto_v1_3_parser)
+    packet_in = [buf for name, buf in msgs
+                 if name.endswith('ofp_packet_in.packet')][0]
+
+    for title, msg_budget, time_budget in (
+            ('before (yield every 2048 msgs)', 2048, 3600.0),
+            ('after (default budgets)',
+             CONF.ofp_recv_msg_budget, CONF.ofp_recv_time_budget)):
+        CONF.set_override('ofp_recv_msg_budget', msg_budget)
+        CONF.set_override('ofp_recv_time_budget', time_budget)
+        latencies, flooded = run(duration, switches, packet_in, 64)
+        CONF.clear_override('ofp_recv_msg_budget')
+        CONF.clear_override('ofp_recv_time_budget')
+
+        latencies.sort()
+        print title
+        print '  flood: %d packet-ins, %.1f msgs/sec' % (
+            flooded, flooded / duration)
+        if not latencies:
+            print '  no echo reply'
+            continue
+        print ('  echo: %d replies, avg %.2f ms, 99%% %.2f ms, '
+               'max %.2f ms' % (
+                   len(latencies),
+                   sum(latencies) / len(latencies) * 1000,
+                   latencies[int(len(latencies) * 0.99)] * 1000,
+                   latencies[-1] * 1000))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,117 @@
+# Copyright (C) 2013 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure the memory held by the decoded OpenFlow 1.3 flow stats.
+
+The flow stats entries of packet_data/of13/4-12-ofp_flow_stats_reply
+are repeated into a body of the given number of entries (100000 by
+default) and decoded into a list of OFPFlowStats, as an application
+holding a mirror of the flow tables would do.  The memory is reported
+in two ways: the sum of sys.getsizeof() of the objects reachable from
+the list, not counting the body buffer, and the growth of the maximum
+resident set size of the process.
+
+Run it on an older tree to compare.
+"""
+
+import os
+import resource
+import sys
+
+from ryu.tests.benchmark import common
+from ryu.ofproto import ofproto_parser
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_3_parser
+
+
+def load_entries(count):
+    """
+    Return a flow stats body of ``count`` entries.
+    """
+    name = os.path.join(common.PACKET_DATA_DIR, 'of13',
+                        '4-12-ofp_flow_stats_reply.packet')
+    buf = open(name, 'rb').read()
+    (version, msg_type, msg_len, xid) = ofproto_parser.header(buf)
+    entries = buf[ofproto_v1_3.OFP_MULTIPART_REPLY_SIZE:msg_len]
+    msg = ofproto_parser.msg(None, version, msg_type, msg_len, xid, buf)
+    per_body = len(msg.body)
+    body = entries * (count // per_body)
+    offset = 0
+    for i in xrange(count % per_body):
+        offset += msg.body[i].length
+    return body + entries[:offset]
+
+
+def parse(body):
+    flows = []
+    offset = 0
+    while offset < len(body):
+        stats = ofproto_v1_3_parser.OFPFlowStats.parser(body, offset)
+        flows.append(stats)
+        offset += stats.length
+    return flows
+
+
+def deep_size(obj, seen):
+    """
+    Return the sum of sys.getsizeof() of obj and the objects reachable
+    from it which aren't in ``seen``, a set of ids.
+    """
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for k, v in obj.iteritems():
+            size += deep_size(k, seen) + deep_size(v, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for v in obj:
+            size += deep_size(v, seen)
+    if hasattr(obj, '__dict__'):
+        size += deep_size(obj.__dict__, seen)
+    for cls in type(obj).__mro__:
+        names = cls.__dict__.get('__slots__', ())
+        if isinstance(names, basestring):
+            names = (names,)
+        for name in names:
+            if hasattr(obj, name):
+                size += deep_size(getattr(obj, name), seen)
+    return size
+
+
+def max_rss():
+    # kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def main(args):
+    count = int(args[0]) if args else 100000
+
+    body = load_entries(count)
+    rss = max_rss()
+    elapsed, flows = common.measure(parse, body)
+    rss = max_rss() - rss
+    common.report('parse', len(flows), elapsed, 'flows')
+
+    size = deep_size(flows, set([id(body)]))
+    print '%-40s %10d bytes %8.1f bytes/flow' % (
+        'objects', size, float(size) / len(flows))
+    print '%-40s %10d bytes %8.1f bytes/flow' % (
+        'max rss growth', rss, float(rss) / len(flows))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
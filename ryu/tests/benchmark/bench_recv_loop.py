@@ -0,0 +1,109 @@
+# Copyright (C) 2013 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Replay the OpenFlow 1.3 messages in packet_data/of13 through
+Datapath._recv_loop and report the number of messages per second and
+the number of recv calls, which are system calls on a real connection.
+
+Two streams are replayed: all the decodable messages in packet_data/of13,
+and a packet-in storm made of the packet-in message only.
+
+The former implementation, which read the stream header by header and
+sliced the tail of the buffer off after every message, is measured too
+for the comparison.
+"""
+
+import sys
+
+from ryu.tests.benchmark import common
+from ryu.controller import controller
+from ryu.controller import ofp_event
+from ryu.ofproto import ofproto_common
+from ryu.ofproto import ofproto_parser
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_3_parser
+
+
+def legacy_recv_loop(dp):
+    buf = bytearray()
+    required_len = ofproto_common.OFP_HEADER_SIZE
+
+    while dp.is_active:
+        ret = dp.socket.recv(required_len)
+        if len(ret) == 0:
+            dp.is_active = False
+            break
+        buf += ret
+        while len(buf) >= required_len:
+            (version, msg_type, msg_len, xid) = ofproto_parser.header(buf)
+            required_len = msg_len
+            if len(buf) < required_len:
+                break
+
+            msg = ofproto_parser.msg(dp, version, msg_type, msg_len, xid, buf)
+            if msg:
+                ev = ofp_event.ofp_msg_to_ev(msg)
+                dp.ofp_brick.send_event_to_observers(ev, dp.state)
+
+                handlers = [handler for handler in
+                            dp.ofp_brick.get_handlers(ev) if
+                            dp.state in handler.dispatchers]
+                for handler in handlers:
+                    handler(ev)
+
+            buf = buf[required_len:]
+            required_len = ofproto_common.OFP_HEADER_SIZE
+
+
+def current_recv_loop(dp):
+    dp._recv_loop()
+
+
+def run(recv_loop, stream):
+    sock = common.ReplaySocket(stream)
+    dp = controller.Datapath(sock, ('bench', 0))
+    dp.set_version(ofproto_v1_3.OFP_VERSION)
+    recv_loop(dp)
+    return sock.recv_calls
+
+
+def bench(title, msgs, repeat):
+    stream = ''.join(buf for _name, buf in msgs) * repeat
+    count = len(msgs) * repeat
+    print '%s: %d messages, %d bytes' % (title, count, len(stream))
+
+    for name, recv_loop in (('  before (recv per header)', legacy_recv_loop),
+                            ('  after (recv_into ring buffer)',
+                             current_recv_loop)):
+        elapsed, recv_calls = common.measure(run, recv_loop, stream)
+        common.report(name, count, elapsed)
+        print '%-40s %10d recv calls' % ('', recv_calls)
+
+
+def main(args):
+    repeat = int(args[0]) if args else 1000
+    common.setup_ofp_brick()
+
+    msgs = common.load_packet_data('of13', ofproto_v1_3_parser)
+    bench('packet_data/of13', msgs, repeat)
+
+    packet_in = [(name, buf) for name, buf in msgs
+                 if name.endswith('ofp_packet_in.packet')]
+    bench('packet-in storm', packet_in, repeat * 50)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,84 @@
+# Copyright (C) 2013 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure the startup time of ryu-manager.
+
+Every run is a fresh python process which imports ryu.cmd.manager and
+the applications, then loads the applications, creates their contexts
+and instantiates them as ryu-manager does, without running the event
+loop.  The minimum and the median of the runs are reported for the two
+phases and the total.
+
+    % python -m ryu.tests.benchmark.bench_startup [runs] [app ...]
+
+The applications default to ryu.app.simple_switch_13.
+"""
+
+import os
+import subprocess
+import sys
+
+_TOP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                        os.pardir, os.pardir, os.pardir))
+
+_CHILD = """
+import sys
+import time
+start = time.time()
+apps = sys.argv[1:]
+from ryu.cmd import manager
+from ryu.base import app_manager
+for app in apps:
+    __import__(app)
+imported = time.time()
+manager.CONF(args=[], project='ryu')
+app_mgr = app_manager.AppManager.get_instance()
+app_mgr.load_apps(apps)
+contexts = app_mgr.create_contexts()
+app_mgr.instantiate_apps(**contexts)
+end = time.time()
+print imported - start, end - imported, end - start
+"""
+
+_PHASES = ['importing modules', 'instantiating apps', 'total']
+
+
+def run(apps):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [_TOP_DIR] + filter(None, [env.get('PYTHONPATH')]))
+    out = subprocess.check_output(
+        [sys.executable, '-c', _CHILD] + apps, env=env,
+        stderr=open(os.devnull, 'w'))
+    return [float(t) for t in out.split()]
+
+
+def main(args):
+    runs = int(args[0]) if args else 15
+    apps = args[1:] or ['ryu.app.simple_switch_13']
+
+    # the first run compiles the modules
+    run(apps)
+    results = [run(apps) for _i in xrange(runs)]
+    print '%s, %d runs' % (' '.join(apps), runs)
+    for i, phase in enumerate(_PHASES):
+        times = sorted(r[i] for r in results)
+        print '  %-20s min %8.1f ms median %8.1f ms' % (
+            phase, times[0] * 1000, times[len(times) // 2] * 1000)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
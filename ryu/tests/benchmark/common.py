@@ -0,0 +1,121 @@
+# Copyright (C) 2013 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Helpers shared by the benchmark scripts in this directory.
+
+The benchmarks are standalone scripts, e.g.::
+
+    % python -m ryu.tests.benchmark.bench_recv_loop
+"""
+
+import os
+import time
+
+from oslo.config import cfg
+
+from ryu.base import app_manager
+from ryu.controller import ofp_event
+from ryu.ofproto import ofproto_parser
+
+PACKET_DATA_DIR = os.path.join(os.path.dirname(__file__),
+                               os.pardir, 'packet_data')
+
+
+def load_packet_data(version_dir, parser_module):
+    """
+    Return the raw messages in packet_data/<version_dir> which can be
+    decoded by parser_module and delivered as events, sorted by file name.
+    """
+    pdir = os.path.join(PACKET_DATA_DIR, version_dir)
+    msgs = []
+    for name in sorted(os.listdir(pdir)):
+        if not name.endswith('.packet'):
+            continue
+        buf = open(os.path.join(pdir, name), 'rb').read()
+        (version, msg_type, msg_len, xid) = ofproto_parser.header(buf)
+        if msg_type not in parser_module._MSG_PARSERS:
+            # a controller-to-switch message. we don't decode it.
+            continue
+        msg = parser_module.msg_parser(None, version, msg_type, msg_len,
+                                       xid, buf)
+        try:
+            ofp_event.ofp_msg_to_ev(msg)
+        except KeyError:
+            continue
+        msgs.append((name, buf))
+    return msgs
+
+
+class DummyOFPBrick(app_manager.RyuApp):
+    """
+    Stand-in for ofp_handler which just drops the events.
+    """
+    def __init__(self, *args, **kwargs):
+        super(DummyOFPBrick, self).__init__(*args, **kwargs)
+        self.name = 'ofp_event'
+
+
+def setup_ofp_brick():
+    cfg.CONF([], project='ryu')
+    brick = app_manager.lookup_service_brick('ofp_event')
+    if brick is None:
+        brick = DummyOFPBrick()
+        app_manager.register_app(brick)
+    return brick
+
+
+class ReplaySocket(object):
+    """
+    A socket-like object which returns the given data, at most
+    chunk_size bytes at a time.
+    """
+    def __init__(self, data, chunk_size=64 * 1024):
+        self.data = data
+        self.offset = 0
+        self.chunk_size = chunk_size
+        self.recv_calls = 0
+
+    def _next(self, bufsize):
+        self.recv_calls += 1
+        size = min(bufsize, self.chunk_size)
+        chunk = self.data[self.offset:self.offset + size]
+        self.offset += len(chunk)
+        return chunk
+
+    def recv(self, bufsize):
+        return self._next(bufsize)
+
+    def recv_into(self, buf, nbytes=0):
+        chunk = self._next(nbytes or len(buf))
+        buf[:len(chunk)] = chunk
+        return len(chunk)
+
+    def sendall(self, data):
+        pass
+
+    def close(self):
+        pass
+
+
+def measure(func, *args, **kwargs):
+    start = time.time()
+    ret = func(*args, **kwargs)
+    return time.time() - start, ret
+
+
+def report(title, count, elapsed, unit='msgs'):
+    print '%-40s %10d %s %8.3f sec %12.1f %s/sec' % (
+        title, count, unit, elapsed, count / elapsed, unit)
@@ -0,0 +1,453 @@
+# Copyright (C) 2013 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from nose.tools import eq_, ok_
+
+from ryu.base import app_manager
+from ryu.controller import event
+from ryu.controller import ofp_event
+from ryu.lib import hub
+from ryu.controller.handler import set_ev_cls, set_ev_handler
+from ryu.controller.handler import MAIN_DISPATCHER, CONFIG_DISPATCHER
+
+
+class _Event(event.EventBase):
+    pass
+
+
+class _OtherEvent(event.EventBase):
+    pass
+
+
+class _App(app_manager.RyuApp):
+    @set_ev_handler(_Event, MAIN_DISPATCHER)
+    def main_handler(self, ev):
+        pass
+
+    @set_ev_handler(_Event)
+    def any_handler(self, ev):
+        pass
+
+
+class TestDispatchTable(unittest.TestCase):
+    def setUp(self):
+        self.app = _App()
+        app_manager.register_app(self.app)
+
+    def tearDown(self):
+        app_manager.unregister_app(self.app)
+
+    def test_get_handlers(self):
+        ev = _Event()
+        eq_(set([self.app.main_handler, self.app.any_handler]),
+            set(self.app.get_handlers(ev, MAIN_DISPATCHER)))
+        eq_([self.app.any_handler],
+            self.app.get_handlers(ev, CONFIG_DISPATCHER))
+        eq_([], self.app.get_handlers(_OtherEvent(), MAIN_DISPATCHER))
+
+    def test_get_handlers_after_register(self):
+        ev = _OtherEvent()
+        eq_([], self.app.get_handlers(ev, MAIN_DISPATCHER))
+
+        def _handler(ev):
+            pass
+        _handler.dispatchers = [MAIN_DISPATCHER]
+        self.app.register_handler(_OtherEvent, _handler)
+        eq_([_handler], self.app.get_handlers(ev, MAIN_DISPATCHER))
+        eq_([], self.app.get_handlers(ev, CONFIG_DISPATCHER))
+
+    def test_get_observers(self):
+        ev = _Event()
+        eq_([], self.app.get_observers(ev, MAIN_DISPATCHER))
+
+        self.app.register_observer(_Event, 'main', [MAIN_DISPATCHER])
+        self.app.register_observer(_Event, 'any')
+        eq_(['any', 'main'],
+            sorted(self.app.get_observers(ev, MAIN_DISPATCHER)))
+        eq_(['any'], self.app.get_observers(ev, CONFIG_DISPATCHER))
+        eq_(['any', 'main'], sorted(self.app.get_observers(ev, None)))
+
+        self.app.unregister_observer(_Event, 'any')
+        eq_(['main'], self.app.get_observers(ev, MAIN_DISPATCHER))
+
+        self.app.unregister_observer_all_event('main')
+        eq_([], self.app.get_observers(ev, MAIN_DISPATCHER))
+
+    def test_send_event_to_observers(self):
+        class _Observer(app_manager.RyuApp):
+            def __init__(self):
+                super(_Observer, self).__init__()
+                self.received = []
+
+            def _send_event(self, ev, state):
+                self.received.append((ev, state))
+
+        self.app.register_observer(_Event, 'observer', [MAIN_DISPATCHER])
+        ev = _Event()
+        # the observer isn't registered yet
+        self.app.send_event_to_observers(ev, MAIN_DISPATCHER)
+
+        observer = _Observer()
+        observer.name = 'observer'
+        app_manager.register_app(observer)
+        try:
+            self.app.send_event_to_observers(ev, MAIN_DISPATCHER)
+            self.app.send_event_to_observers(ev, CONFIG_DISPATCHER)
+            eq_([(ev, MAIN_DISPATCHER)], observer.received)
+        finally:
+            app_manager.unregister_app(observer)
+
+        self.app.send_event_to_observers(ev, MAIN_DISPATCHER)
+        eq_(1, len(observer.received))
+
+
+class _LowEvent(_Event):
+    pass
+
+
+class _QueueApp(app_manager.RyuApp):
+    _EVENT_QUEUE_SIZE = 3
+    _EVENT_PRIORITIES = {_LowEvent: app_manager.EVENT_PRIORITY_LOW}
+    _EVENT_QUEUE_POLICIES = {
+        _Event: app_manager.EVENT_QUEUE_DROP_OLDEST,
+        _OtherEvent: app_manager.EVENT_QUEUE_DROP_NEW,
+    }
+
+
+class TestEventQueue(unittest.TestCase):
+    def setUp(self):
+        self.app = _QueueApp()
+
+    def _get_all(self):
+        evs = []
+        while not self.app.events.empty():
+            evs.append(self.app.events.get()[0])
+        return evs
+
+    def test_priority(self):
+        app = app_manager.RyuApp()
+        packet_in = ofp_event.EventOFPPacketIn(None)
+        other = _Event()
+        state = ofp_event.EventOFPStateChange(None)
+        for ev in (packet_in, other, state):
+            app._send_event(ev, None)
+        eq_(3, app.events.qsize())
+        evs = [app.events.get()[0] for _i in range(3)]
+        eq_([state, other, packet_in], evs)
+
+    def test_params(self):
+        eq_((app_manager.EVENT_PRIORITY_NORMAL,
+             app_manager.EVENT_QUEUE_DROP_OLDEST),
+            self.app._event_queue_params(_Event))
+        # inherited from _Event
+        eq_((app_manager.EVENT_PRIORITY_LOW,
+             app_manager.EVENT_QUEUE_DROP_OLDEST),
+            self.app._event_queue_params(_LowEvent))
+        eq_((app_manager.EVENT_PRIORITY_HIGH,
+             app_manager.EVENT_QUEUE_BLOCK),
+            self.app._event_queue_params(ofp_event.EventOFPPortStatus))
+
+    def test_drop_new(self):
+        evs = [_OtherEvent() for _i in range(4)]
+        for ev in evs:
+            self.app._send_event(ev, None)
+        eq_(evs[:3], self._get_all())
+        stats = self.app.get_event_queue_stats()
+        eq_(0, stats['qsize'])
+        eq_(3, stats['maxsize'])
+        eq_({'_OtherEvent': 1}, stats['dropped'])
+
+    def test_drop_oldest(self):
+        low = _LowEvent()
+        other = _OtherEvent()
+        evs = [_Event(), _Event()]
+        self.app._send_event(low, None)
+        self.app._send_event(other, None)
+        self.app._send_event(evs[0], None)
+        # the event of the lower priority is dropped first
+        self.app._send_event(evs[1], None)
+        eq_({'_LowEvent': 1}, self.app.events_dropped)
+        ev = _Event()
+        self.app._send_event(ev, None)
+        eq_({'_LowEvent': 1, '_OtherEvent': 1}, self.app.events_dropped)
+        eq_([evs[0], evs[1], ev], self._get_all())
+
+    def test_drop_oldest_higher_priority(self):
+        evs = [_Event() for _i in range(3)]
+        for ev in evs:
+            self.app._send_event(ev, None)
+        # only the events of higher priorities are queued
+        self.app._send_event(_LowEvent(), None)
+        eq_({'_LowEvent': 1}, self.app.events_dropped)
+        eq_(evs, self._get_all())
+
+    def test_block(self):
+        q = app_manager.EventQueue(1)
+        q.put(1)
+        putter = hub.spawn(q.put, 2)
+        hub.sleep(0)
+        eq_(1, q.qsize())
+        eq_(1, q.get())
+        hub.joinall([putter])
+        eq_(2, q.get())
+
+        got = []
+        getter = hub.spawn(lambda: got.append(q.get()))
+        hub.sleep(0)
+        q.put(3)
+        hub.joinall([getter])
+        eq_([3], got)
+        ok_(q.empty())
+
+
+class _Datapath(object):
+    def __init__(self, id_):
+        self.id = id_
+
+
+class _DatapathEvent(_Event):
+    def __init__(self, datapath, seq):
+        super(_DatapathEvent, self).__init__()
+        self.datapath = datapath
+        self.seq = seq
+
+
+class _WorkerApp(app_manager.RyuApp):
+    _EVENT_WORKERS = 2
+
+    def __init__(self, *args, **kwargs):
+        super(_WorkerApp, self).__init__(*args, **kwargs)
+        self.handled = []
+
+    @set_ev_handler(_DatapathEvent)
+    def handler(self, ev):
+        self.handled.append(('begin', ev.datapath.id, ev.seq))
+        hub.sleep(0)
+        self.handled.append(('end', ev.datapath.id, ev.seq))
+
+
+class TestEventWorkers(unittest.TestCase):
+    def setUp(self):
+        self.app = _WorkerApp()
+        app_manager.register_app(self.app)
+
+    def tearDown(self):
+        app_manager.unregister_app(self.app)
+
+    def test_partition_key(self):
+        dp = _Datapath(1)
+        eq_(1, self.app.event_partition_key(_DatapathEvent(dp, 0)))
+        eq_(1, self.app.event_partition_key(ofp_event.EventOFPStateChange(dp)))
+        eq_(None, self.app.event_partition_key(_Event()))
+
+    def test_workers(self):
+        dps = [_Datapath(1), _Datapath(2)]
+        for seq in range(2):
+            for dp in dps:
+                self.app._send_event(_DatapathEvent(dp, seq), None)
+        self.app.start()
+        self.app.stop()
+
+        eq_(8, len(self.app.handled))
+        for dp in dps:
+            eq_([('begin', dp.id, 0), ('end', dp.id, 0),
+                 ('begin', dp.id, 1), ('end', dp.id, 1)],
+                [h for h in self.app.handled if h[1] == dp.id])
+        # the events of the other datapath are handled in the meantime
+        eq_(set([1, 2]), set(h[1] for h in self.app.handled[:2]))
+
+
+class TestHandlerProfile(unittest.TestCase):
+    def setUp(self):
+        self.app = _App()
+        app_manager.register_app(self.app)
+
+    def tearDown(self):
+        app_manager.unregister_app(self.app)
+
+    def test_disabled(self):
+        self.app._send_event(_Event(), MAIN_DISPATCHER)
+        self.app._handle_event(*self.app.events.get())
+        stats = self.app.get_handler_stats()
+        eq_(False, stats['enabled'])
+        eq_({}, stats['handlers'])
+
+    def test_enabled(self):
+        self.app.set_handler_profile(True)
+        self.app._send_event(_Event(), MAIN_DISPATCHER)
+        self.app._handle_event(*self.app.events.get())
+        stats = app_manager.get_handler_stats()[self.app.name]
+        eq_(True, stats['enabled'])
+        eq_(1, stats['handlers']['main_handler']['count'])
+        eq_(1, stats['handlers']['any_handler']['count'])
+        eq_(1, stats['queue_waits']['_Event']['count'])
+
+
+class _Request(event.EventRequestBase):
+    def __init__(self, dst, value):
+        super(_Request, self).__init__()
+        self.dst = dst
+        self.value = value
+
+
+class _Reply(event.EventReplyBase):
+    def __init__(self, dst, value):
+        super(_Reply, self).__init__(dst)
+        self.value = value
+
+
+class _Responder(app_manager.RyuApp):
+    def __init__(self, *args, **kwargs):
+        super(_Responder, self).__init__(*args, **kwargs)
+        self.received = []
+
+    @set_ev_handler(_Request)
+    def request_handler(self, req):
+        self.received.append(req)
+
+
+class TestRequest(unittest.TestCase):
+    def setUp(self):
+        self.app = _App()
+        self.responder = _Responder()
+        for app in (self.app, self.responder):
+            app_manager.register_app(app)
+            app.start()
+
+    def tearDown(self):
+        for app in (self.app, self.responder):
+            app.stop()
+            app_manager.unregister_app(app)
+
+    def _reply(self, req):
+        self.responder.reply_to_request(req, _Reply(req.src, req.value))
+
+    def test_concurrent(self):
+        results = {}
+
+        def request(value):
+            req = _Request(self.responder.name, value)
+            results[value] = self.app.send_request(req).value
+
+        threads = [hub.spawn(request, value) for value in (1, 2)]
+        hub.sleep(0)
+        hub.sleep(0)
+        eq_(2, len(self.responder.received))
+        # replied in the reverse order
+        for req in reversed(self.responder.received):
+            self._reply(req)
+        hub.joinall(threads)
+        eq_({1: 1, 2: 2}, results)
+        eq_({}, self.app.requests)
+
+    def test_timeout(self):
+        future = self.app.send_request_async(
+            _Request(self.responder.name, 1), timeout=0.01)
+        self.assertRaises(hub.Timeout, future.get)
+        eq_({}, self.app.requests)
+        # a late reply is dropped
+        self._reply(self.responder.received[0])
+
+    def test_reply_cancels_timeout(self):
+        future = self.app.send_request_async(
+            _Request(self.responder.name, 1), timeout=60)
+        timer = self.app._request_timers.values()[0]
+        hub.sleep(0)
+        self._reply(self.responder.received[0])
+        eq_(1, future.get().value)
+        ok_(timer.called)
+        eq_({}, self.app._request_timers)
+
+    def test_send_failure(self):
+        def _send_event(ev, state):
+            raise IOError()
+
+        self.responder._send_event = _send_event
+        self.assertRaises(IOError, self.app.send_request_async,
+                          _Request(self.responder.name, 1), timeout=60)
+        eq_({}, self.app.requests)
+        eq_({}, self.app._request_timers)
+
+
+class _Msg(object):
+    def __init__(self, dpid, eth_type, cookie=0):
+        self.datapath = _Datapath(dpid)
+        self.data = '\xff' * 12 + chr(eth_type >> 8) + chr(eth_type & 0xff)
+        self.cookie = cookie
+
+
+class _FilteredApp(app_manager.RyuApp):
+    def __init__(self, *args, **kwargs):
+        super(_FilteredApp, self).__init__(*args, **kwargs)
+        self.received = []
+
+    @set_ev_cls(ofp_event.EventOFPPacketIn, MAIN_DISPATCHER,
+                eth_type=0x88cc)
+    def lldp_handler(self, ev):
+        pass
+
+    @set_ev_cls(ofp_event.EventOFPPacketIn, MAIN_DISPATCHER,
+                dpid=[1, 2], cookie=3)
+    def cookie_handler(self, ev):
+        pass
+
+    def _send_event(self, ev, state):
+        self.received.append(ev)
+
+
+class TestEventFilter(unittest.TestCase):
+    def setUp(self):
+        self.app = _FilteredApp()
+        self.sender = _App()
+        for app in (self.app, self.sender):
+            app_manager.register_app(app)
+        self.sender.register_observer(ofp_event.EventOFPPacketIn,
+                                      self.app.name, [MAIN_DISPATCHER])
+
+    def tearDown(self):
+        for app in (self.app, self.sender):
+            app_manager.unregister_app(app)
+
+    def _ev(self, *args):
+        return ofp_event.EventOFPPacketIn(_Msg(*args))
+
+    def test_get_handlers(self):
+        eq_([self.app.lldp_handler],
+            self.app.get_handlers(self._ev(1, 0x88cc), MAIN_DISPATCHER))
+        eq_([self.app.cookie_handler],
+            self.app.get_handlers(self._ev(2, 0x0800, 3), MAIN_DISPATCHER))
+        eq_([], self.app.get_handlers(self._ev(3, 0x0800, 3),
+                                      MAIN_DISPATCHER))
+        # the event doesn't have msg
+        ev = ofp_event.EventOFPStateChange(_Datapath(1))
+        ok_(not self.app.lldp_handler.ev_filter(ev))
+
+    def test_send_event_to_observers(self):
+        evs = [self._ev(1, 0x88cc), self._ev(1, 0x0800),
+               self._ev(1, 0x0800, 3), self._ev(4, 0x0800, 3)]
+        for ev in evs:
+            self.sender.send_event_to_observers(ev, MAIN_DISPATCHER)
+        eq_([evs[0], evs[2]], self.app.received)
+
+    def test_unfiltered_handler(self):
+        def handler(ev):
+            pass
+        handler.dispatchers = []
+        self.app.register_handler(ofp_event.EventOFPPacketIn, handler)
+        ev = self._ev(4, 0x0800)
+        self.sender.send_event_to_observers(ev, MAIN_DISPATCHER)
+        eq_([ev], self.app.received)
+        eq_([handler], self.app.get_handlers(ev, MAIN_DISPATCHER))
@@ -0,0 +1,211 @@
+# Copyright (C) 2013 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import unittest
+from nose.tools import eq_, ok_
+
+from ryu.lib import hub
+hub.patch()
+
+from ryu.base import app_manager
+from ryu.base import remote_app
+from ryu.controller import event
+from ryu.controller import ofp_event
+from ryu.controller.handler import set_ev_cls, MAIN_DISPATCHER
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_3_parser
+from ryu.topology import event as topo_event
+from ryu.topology import switches
+
+
+class _Event(event.EventBase):
+    def __init__(self, datapath):
+        super(_Event, self).__init__()
+        self.datapath = datapath
+
+
+class _Ping(event.EventBase):
+    def __init__(self, value):
+        super(_Ping, self).__init__()
+        self.value = value
+
+
+class _Pong(_Ping):
+    pass
+
+
+class _Request(event.EventRequestBase):
+    def __init__(self, value):
+        super(_Request, self).__init__()
+        self.dst = '_Server'
+        self.value = value
+
+
+class _Reply(event.EventReplyBase):
+    def __init__(self, value):
+        super(_Reply, self).__init__(None)
+        self.value = value
+
+
+# the first RyuApp of this module, which the child process runs
+class _App(app_manager.RyuApp):
+    OFP_VERSIONS = [ofproto_v1_3.OFP_VERSION]
+
+    @set_ev_cls(ofp_event.EventOFPPacketIn, MAIN_DISPATCHER)
+    def packet_in_handler(self, ev):
+        pass
+
+    @set_ev_cls(topo_event.EventPortAdd)
+    def port_add_handler(self, ev):
+        self.send_event_to_observers(ev)
+
+    @set_ev_cls(ofp_event.EventOFPStateChange, MAIN_DISPATCHER)
+    def state_change_handler(self, ev):
+        self.send_event_to_observers(_Pong(ev.state))
+
+    @set_ev_cls(_Ping)
+    def ping_handler(self, ev):
+        rep = self.send_request(_Request(ev.value), timeout=10)
+        self.send_event_to_observers(_Pong(rep.value))
+
+
+class _Server(app_manager.RyuApp):
+    @set_ev_cls(_Request)
+    def request_handler(self, req):
+        self.reply_to_request(req, _Reply(req.value + 1))
+
+
+def _port(port_no):
+    ofpport = ofproto_v1_3_parser.OFPPort(
+        port_no, '\x00\x01\x02\x03\x04\x05', 'eth%d' % port_no, 0, 0, 0, 0,
+        0, 0, 0, 0)
+    return switches.Port(1, ofproto_v1_3, ofpport)
+
+
+class _Socket(object):
+    def __init__(self):
+        self.sent = []
+
+    def sendall(self, data):
+        self.sent.append(data)
+
+
+class TestRemoteApp(unittest.TestCase):
+    def setUp(self):
+        self.parent = remote_app._Channel(_Socket(), self._dispatch)
+        self.child = remote_app._Channel(
+            _Socket(), None,
+            lambda dpid, version: remote_app.DatapathProxy(self.child, dpid,
+                                                           version))
+        self.notified = []
+
+    def _dispatch(self, method, params):
+        self.notified.append((method, params))
+
+    def _receive(self, channel, data):
+        channel.encoder.get_and_dispatch_messages(data, channel.table)
+
+    def test_remote_app_cls(self):
+        cls = remote_app.remote_app_cls('ryu.app.test', _App)
+        eq_('_App', cls.__name__)
+        eq_(_App.OFP_VERSIONS, cls.OFP_VERSIONS)
+        app = cls()
+        handlers = app.event_handlers[ofp_event.EventOFPPacketIn]
+        eq_(1, len(handlers))
+        eq_([MAIN_DISPATCHER], handlers[0].dispatchers)
+        eq_(ofp_event.__name__, handlers[0].observer)
+
+    def test_pickled_datapath(self):
+        ev = self.child.loads(self.parent.dumps(_Event(None)))
+        eq_(None, ev.datapath)
+
+        dp = self.child.datapath(1, ofproto_v1_3.OFP_VERSION)
+        ok_(isinstance(dp, remote_app.DatapathProxy))
+        parent_dp = object()
+        self.parent.datapaths[1] = parent_dp
+        ev = self.parent.loads(self.child.dumps(_Event(dp)))
+        ok_(ev.datapath is parent_dp)
+
+    def test_pickled_module(self):
+        ev = self.child.loads(self.parent.dumps(
+            topo_event.EventPortAdd(_port(2))))
+        ok_(ev.port._ofproto is ofproto_v1_3)
+        eq_(2, ev.port.port_no)
+        ok_(ev.port.is_live())
+
+    def test_forward_unpicklable(self):
+        app = remote_app.remote_app_cls(__name__, _App)()
+        app.channel = self.parent
+        app._forward(_Event(lambda: None))
+        eq_([], self.parent.sock.sent)
+
+    def test_send_msg(self):
+        dp = self.child.datapath(1, ofproto_v1_3.OFP_VERSION)
+        dp.send_msg(dp.ofproto_parser.OFPBarrierRequest(dp))
+        eq_(1, len(self.child.sock.sent))
+        self._receive(self.parent, self.child.sock.sent[0])
+        method, (dpid, buf) = self.notified[0]
+        eq_(remote_app._SEND_MSG, method)
+        eq_(1, dpid)
+        eq_(ofproto_v1_3.OFP_HEADER_SIZE, len(buf))
+
+
+class TestChildProcess(unittest.TestCase):
+    """ Test case for an application in a child process
+    """
+
+    def setUp(self):
+        self.app = remote_app.remote_app_cls(__name__, _App)()
+        self.server = _Server()
+        self.observed = hub.Queue()
+        self.app.send_event_to_observers = \
+            lambda ev, state=None: self.observed.put(ev)
+        app_manager.register_app(self.app)
+        app_manager.register_app(self.server)
+        with mock.patch.object(remote_app, 'CONF') as conf:
+            conf.config_file = []
+            self.app.start()
+        self.server.start()
+
+    def tearDown(self):
+        self.app.stop()
+        self.server.stop()
+        app_manager.unregister_app(self.app)
+        app_manager.unregister_app(self.server)
+
+    def test_topology_event(self):
+        self.app._send_event(topo_event.EventPortAdd(_port(2)), None)
+        ev = self.observed.get(timeout=30)
+        ok_(isinstance(ev, topo_event.EventPortAdd))
+        ok_(ev.port._ofproto is ofproto_v1_3)
+        eq_(_port(2), ev.port)
+        eq_('eth2', ev.port.name)
+
+    def test_send_request(self):
+        self.app._send_event(_Ping(1), None)
+        ev = self.observed.get(timeout=30)
+        ok_(isinstance(ev, _Pong))
+        eq_(2, ev.value)
+        eq_({}, self.app.requests)
+
+    def test_state_change(self):
+        dp = mock.Mock(id=1, state=MAIN_DISPATCHER, ofproto=ofproto_v1_3)
+        ev = ofp_event.EventOFPStateChange(dp)
+        ev.state = MAIN_DISPATCHER
+        self.app._send_event(ev, MAIN_DISPATCHER)
+        ev = self.observed.get(timeout=30)
+        ok_(isinstance(ev, _Pong))
+        eq_(MAIN_DISPATCHER, ev.value)
@@ -0,0 +1,599 @@
+# Copyright (C) 2013 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import struct
+import unittest
+from nose.tools import eq_, ok_, raises
+
+from ryu import exception
+from ryu.base import app_manager
+from ryu.controller import controller
+from ryu.controller import ofp_event
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_3_parser
+
+
+class _Socket(object):
+    def __init__(self, data, chunk_size):
+        self.data = data
+        self.chunk_size = chunk_size
+        self.sent = []
+
+    def recv_into(self, buf, nbytes=0):
+        size = min(len(buf), self.chunk_size)
+        chunk = self.data[:size]
+        self.data = self.data[size:]
+        buf[:len(chunk)] = chunk
+        return len(chunk)
+
+    def sendall(self, data):
+        self.sent.append(str(data))
+
+
+class _OFPBrick(app_manager.RyuApp):
+    def __init__(self):
+        super(_OFPBrick, self).__init__()
+        self.name = 'ofp_event'
+        self.received = []
+
+    def send_event_to_observers(self, ev, state=None):
+        self.received.append(ev)
+
+
+def _echo_request(xid, data):
+    return struct.pack(ofproto_v1_3.OFP_HEADER_PACK_STR,
+                       ofproto_v1_3.OFP_VERSION,
+                       ofproto_v1_3.OFPT_ECHO_REQUEST,
+                       ofproto_v1_3.OFP_HEADER_SIZE + len(data), xid) + data
+
+
+def _get_config_reply(xid):
+    return struct.pack(ofproto_v1_3.OFP_HEADER_PACK_STR + 'HH',
+                       ofproto_v1_3.OFP_VERSION,
+                       ofproto_v1_3.OFPT_GET_CONFIG_REPLY,
+                       ofproto_v1_3.OFP_SWITCH_CONFIG_SIZE, xid, 0, 128)
+
+
+def _flow_stats_reply(xid, flags):
+    return struct.pack(ofproto_v1_3.OFP_HEADER_PACK_STR +
+                       ofproto_v1_3.OFP_MULTIPART_REPLY_PACK_STR[1:],
+                       ofproto_v1_3.OFP_VERSION,
+                       ofproto_v1_3.OFPT_MULTIPART_REPLY,
+                       ofproto_v1_3.OFP_MULTIPART_REPLY_SIZE, xid,
+                       ofproto_v1_3.OFPMP_FLOW, flags)
+
+
+def _error_msg(xid, type_, code):
+    return struct.pack(ofproto_v1_3.OFP_HEADER_PACK_STR +
+                       ofproto_v1_3.OFP_ERROR_MSG_PACK_STR[1:],
+                       ofproto_v1_3.OFP_VERSION, ofproto_v1_3.OFPT_ERROR,
+                       ofproto_v1_3.OFP_ERROR_MSG_SIZE, xid, type_, code)
+
+
+def _barrier_reply(xid):
+    return struct.pack(ofproto_v1_3.OFP_HEADER_PACK_STR,
+                       ofproto_v1_3.OFP_VERSION,
+                       ofproto_v1_3.OFPT_BARRIER_REPLY,
+                       ofproto_v1_3.OFP_HEADER_SIZE, xid)
+
+
+def _packet_in(xid, in_port):
+    match = bytearray()
+    ofproto_v1_3_parser.OFPMatch(in_port=in_port).serialize(match, 0)
+    data = 'p' * 60
+    msg_len = ofproto_v1_3.OFP_HEADER_SIZE + 16 + len(match) + 2 + len(data)
+    return (struct.pack(ofproto_v1_3.OFP_HEADER_PACK_STR +
+                        ofproto_v1_3.OFP_PACKET_IN_PACK_STR[1:],
+                        ofproto_v1_3.OFP_VERSION,
+                        ofproto_v1_3.OFPT_PACKET_IN, msg_len, xid,
+                        ofproto_v1_3.OFP_NO_BUFFER, len(data),
+                        ofproto_v1_3.OFPR_NO_MATCH, 0, 0) +
+            str(match) + '\x00\x00' + data)
+
+
+class TestDatapath(unittest.TestCase):
+    def setUp(self):
+        self.brick = _OFPBrick()
+        app_manager.register_app(self.brick)
+
+    def tearDown(self):
+        app_manager.unregister_app(self.brick)
+
+    def _datapath(self, data, chunk_size=0xffff):
+        dp = controller.Datapath(_Socket(data, chunk_size), ('test', 0))
+        dp.set_version(ofproto_v1_3.OFP_VERSION)
+        del self.brick.received[:]
+        return dp
+
+    def _echo_requests(self):
+        return [ev for ev in self.brick.received
+                if isinstance(ev, ofp_event.EventOFPEchoRequest)]
+
+    def _check_recv_loop(self, chunk_size):
+        payloads = ['x' * n for n in (0, 1, 7, 8, 100, 3000)]
+        data = ''.join(_echo_request(xid, payload)
+                       for xid, payload in enumerate(payloads))
+        dp = self._datapath(data, chunk_size)
+        dp._recv_loop()
+
+        evs = self._echo_requests()
+        eq_(len(payloads), len(evs))
+        for xid, (payload, ev) in enumerate(zip(payloads, evs)):
+            eq_(xid, ev.msg.xid)
+            eq_(payload, ev.msg.data)
+        ok_(not dp.is_active)
+
+    def test_recv_loop_large_reads(self):
+        self._check_recv_loop(0xffff)
+
+    def test_recv_loop_partial_reads(self):
+        for chunk_size in (1, 3, 8, 13):
+            self._check_recv_loop(chunk_size)
+
+    def test_recv_loop_wraps_buffer(self):
+        # more data than the receive buffer, with messages straddling
+        # the end of the buffer.
+        payload = 'y' * 1000
+        count = 3 * controller.CONF.ofp_recv_buffer_size / len(payload)
+        data = ''.join(_echo_request(xid, payload) for xid in range(count))
+        dp = self._datapath(data, 4097)
+        dp._recv_loop()
+
+        evs = self._echo_requests()
+        eq_(count, len(evs))
+        eq_(range(count), [ev.msg.xid for ev in evs])
+        ok_(all(ev.msg.data == payload for ev in evs))
+
+    def test_recv_loop_malformed_length(self):
+        data = struct.pack(ofproto_v1_3.OFP_HEADER_PACK_STR,
+                           ofproto_v1_3.OFP_VERSION,
+                           ofproto_v1_3.OFPT_ECHO_REQUEST, 4, 0)
+        dp = self._datapath(data + _echo_request(1, 'z'))
+        dp._recv_loop()
+        eq_([], self._echo_requests())
+        ok_(not dp.is_active)
+
+    def _send_all(self, dp, bufs):
+        total = sum(len(buf) for buf in bufs)
+
+        def _sendall(data):
+            dp.socket.sent.append(str(data))
+            if sum(len(sent) for sent in dp.socket.sent) == total:
+                dp.is_active = False
+
+        dp.socket.sendall = _sendall
+        for buf in bufs:
+            dp.send(buf)
+        dp._send_loop()
+        return dp.socket.sent
+
+    def test_send_loop_coalesces(self):
+        dp = self._datapath('')
+        bufs = [_echo_request(xid, 'a' * 10) for xid in range(10)]
+        sent = self._send_all(dp, bufs)
+
+        eq_([''.join(bufs)], sent)
+        stats = dp.get_send_stats()
+        eq_((180, 10, 1),
+            (stats['bytes'], stats['msgs'], stats['batches']))
+
+    def test_send_loop_batch_size(self):
+        controller.CONF.set_override('ofp_send_batch_size', 40)
+        try:
+            dp = self._datapath('')
+            bufs = [_echo_request(xid, 'a' * 10) for xid in range(5)]
+            bufs.append(_echo_request(5, 'b' * 100))
+            bufs.append(_echo_request(6, 'c' * 10))
+            sent = self._send_all(dp, bufs)
+        finally:
+            controller.CONF.clear_override('ofp_send_batch_size')
+
+        eq_([''.join(bufs[0:2]), ''.join(bufs[2:4]), bufs[4], bufs[5],
+             bufs[6]], sent)
+        stats = dp.get_send_stats()
+        eq_((216, 7, 5),
+            (stats['bytes'], stats['msgs'], stats['batches']))
+
+    def _congested_events(self):
+        return [ev for ev in self.brick.received
+                if isinstance(ev, ofp_event.EventOFPSendQueueCongested)]
+
+    def test_send_queue_drop_oldest(self):
+        dp = self._datapath('')
+        dp.set_send_queue_policy(controller.SEND_QUEUE_DROP_OLDEST,
+                                 maxsize=4)
+        for i in range(6):
+            dp.send(str(i))
+
+        eq_(['2', '3', '4', '5'], [dp.send_q.get() for _i in range(4)])
+        stats = dp.get_send_stats()
+        eq_((0, 4, 2), (stats['queue_len'], stats['queue_max'],
+                        stats['dropped']))
+
+    @raises(exception.OFPSendQueueFull)
+    def test_send_queue_fail_fast(self):
+        dp = self._datapath('')
+        dp.set_send_queue_policy(controller.SEND_QUEUE_FAIL_FAST,
+                                 maxsize=2)
+        for i in range(3):
+            dp.send(str(i))
+
+    def test_send_queue_fail_fast_recv_loop(self):
+        def echo_request_handler(ev):
+            dp.send_msg(dp.ofproto_parser.OFPEchoReply(dp, data=''))
+        echo_request_handler.dispatchers = []
+        self.brick.register_handler(ofp_event.EventOFPEchoRequest,
+                                    echo_request_handler)
+
+        dp = self._datapath(_echo_request(1, '') + _echo_request(2, ''))
+        dp.set_send_queue_policy(controller.SEND_QUEUE_FAIL_FAST,
+                                 maxsize=1)
+        dp.send('')
+        # the replies are dropped without ending the loop
+        dp._recv_loop()
+        eq_(2, len(self._echo_requests()))
+        stats = dp.get_send_stats()
+        eq_((2, 2), (stats['dropped'], stats['failures']))
+
+    def test_send_queue_congested(self):
+        dp = self._datapath('')
+        dp.set_send_queue_policy(maxsize=8, high_watermark=3)
+        for i in range(5):
+            dp.send(str(i))
+
+        evs = self._congested_events()
+        eq_(1, len(evs))
+        eq_(dp, evs[0].datapath)
+        eq_(3, evs[0].qsize)
+        eq_(1, dp.get_send_stats()['congestions'])
+
+        # the notification is re-armed once the queue is drained
+        dp.socket.sendall = lambda data: setattr(dp, 'is_active', False)
+        dp._send_loop()
+        dp.send_q = controller.hub.Queue(8)
+        for i in range(3):
+            dp.send(str(i))
+        eq_(2, len(self._congested_events()))
+
+    def test_recv_loop_msg_budget(self):
+        controller.CONF.set_override('ofp_recv_msg_budget', 3)
+        try:
+            # echo requests don't count against the budget
+            data = ''.join(_get_config_reply(xid) + _echo_request(xid, '')
+                           for xid in range(10))
+            dp = self._datapath(data)
+            with mock.patch.object(controller.hub, 'sleep') as sleep:
+                dp._recv_loop()
+        finally:
+            controller.CONF.clear_override('ofp_recv_msg_budget')
+        eq_(3, sleep.call_count)
+        eq_(10, len(self._echo_requests()))
+
+    def test_recv_loop_time_budget(self):
+        controller.CONF.set_override('ofp_recv_time_budget', 0)
+        try:
+            data = ''.join(_get_config_reply(xid) for xid in range(5))
+            dp = self._datapath(data)
+            with mock.patch.object(controller.hub, 'sleep') as sleep:
+                dp._recv_loop()
+        finally:
+            controller.CONF.clear_override('ofp_recv_time_budget')
+        eq_(5, sleep.call_count)
+
+    def test_recv_loop_time_budget_priority(self):
+        controller.CONF.set_override('ofp_recv_time_budget', 0)
+        try:
+            # a flood of echo requests yields, too
+            data = ''.join(_echo_request(xid, '') for xid in range(5))
+            dp = self._datapath(data)
+            with mock.patch.object(controller.hub, 'sleep') as sleep:
+                dp._recv_loop()
+        finally:
+            controller.CONF.clear_override('ofp_recv_time_budget')
+        eq_(5, sleep.call_count)
+        eq_(5, len(self._echo_requests()))
+
+    def _send_requests(self, dp, count, timeout=None):
+        dp.xid = 0
+        futures = []
+        for _i in range(count):
+            req = dp.ofproto_parser.OFPFlowStatsRequest(dp)
+            futures.append(dp.send_request(req, timeout))
+        eq_(range(1, count + 1), sorted(dp.requests.keys()))
+        return futures
+
+    def test_send_request_multipart(self):
+        dp = self._datapath('')
+        futures = self._send_requests(dp, 2, timeout=10)
+        more = ofproto_v1_3.OFPMPF_REPLY_MORE
+        dp.socket.data = (_flow_stats_reply(2, more) +
+                          _flow_stats_reply(1, more) +
+                          _flow_stats_reply(2, 0) +
+                          _get_config_reply(3) +
+                          _flow_stats_reply(1, 0))
+        dp._recv_loop()
+
+        for xid, future in enumerate(futures, 1):
+            ok_(future.successful())
+            replies = future.get()
+            eq_([xid, xid], [msg.xid for msg in replies])
+            eq_([more, 0], [msg.flags for msg in replies])
+        eq_({}, dp.requests)
+        # the replies are still delivered to the applications
+        eq_(5, len(self.brick.received))
+
+    def test_send_request_xid_collision(self):
+        dp = self._datapath('')
+        future, = self._send_requests(dp, 1, timeout=10)
+        # a packet-in isn't a reply even though its xid is the same
+        dp.socket.data = _packet_in(1, 1) + _flow_stats_reply(1, 0)
+        dp._recv_loop()
+
+        ok_(future.successful())
+        eq_([ofproto_v1_3.OFPT_MULTIPART_REPLY],
+            [msg.msg_type for msg in future.get()])
+        eq_(2, len(self.brick.received))
+
+    @raises(exception.OFPRequestError)
+    def test_send_request_error(self):
+        dp = self._datapath('')
+        future, = self._send_requests(dp, 1)
+        dp.socket.data = _error_msg(1, ofproto_v1_3.OFPET_BAD_REQUEST,
+                                    ofproto_v1_3.OFPBRC_BAD_MULTIPART)
+        dp._recv_loop()
+
+        eq_({}, dp.requests)
+        ok_(future.ready() and not future.successful())
+        future.get()
+
+    @raises(controller.hub.Timeout)
+    def test_send_request_timeout(self):
+        dp = self._datapath('')
+        future, = self._send_requests(dp, 1, timeout=0.01)
+        try:
+            future.get()
+        finally:
+            eq_({}, dp.requests)
+
+    @raises(exception.OFPRequestAborted)
+    def test_send_request_aborted(self):
+        dp = self._datapath('')
+        future, = self._send_requests(dp, 1, timeout=10)
+        with mock.patch.multiple(controller.hub, spawn=mock.DEFAULT,
+                                 kill=mock.DEFAULT, joinall=mock.DEFAULT):
+            with mock.patch.object(dp, '_recv_loop'):
+                dp.serve()
+
+        eq_({}, dp.requests)
+        future.get(block=False)
+
+    def test_send_stream_request(self):
+        dp = self._datapath('')
+        dp.xid = 0
+        req = dp.ofproto_parser.OFPFlowStatsRequest(dp)
+        replies = dp.send_stream_request(req, timeout=10)
+        eq_([1], dp.requests.keys())
+        more = ofproto_v1_3.OFPMPF_REPLY_MORE
+        dp.socket.data = (_flow_stats_reply(1, more) +
+                          _flow_stats_reply(1, more) +
+                          _flow_stats_reply(1, 0))
+        dp._recv_loop()
+
+        eq_({}, dp.requests)
+        eq_([more, more, 0], [msg.flags for msg in replies])
+
+    @raises(exception.OFPRequestError)
+    def test_send_stream_request_error(self):
+        dp = self._datapath('')
+        dp.xid = 0
+        req = dp.ofproto_parser.OFPFlowStatsRequest(dp)
+        replies = dp.send_stream_request(req, timeout=10)
+        dp.socket.data = (_flow_stats_reply(1,
+                                            ofproto_v1_3.OFPMPF_REPLY_MORE) +
+                          _error_msg(1, ofproto_v1_3.OFPET_BAD_REQUEST,
+                                     ofproto_v1_3.OFPBRC_BAD_MULTIPART))
+        dp._recv_loop()
+
+        eq_({}, dp.requests)
+        eq_(1, replies.next().xid)
+        replies.next()
+
+    def _flow_batch(self, dp, count):
+        parser = dp.ofproto_parser
+        dp.xid = 0
+        with dp.flow_batch() as batch:
+            for port in range(count):
+                match = parser.OFPMatch(in_port=port)
+                batch.add(parser.OFPFlowMod(dp, match=match))
+        eq_(count, len(batch))
+        return batch
+
+    def test_flow_batch(self):
+        dp = self._datapath('')
+        batch = self._flow_batch(dp, 3)
+
+        # the mods and the barrier are queued as one buffer
+        eq_(1, dp.send_q.qsize())
+        buf = dp.send_q.get()
+        eq_(''.join(str(msg.buf) for msg in batch.msgs) +
+            struct.pack(ofproto_v1_3.OFP_HEADER_PACK_STR,
+                        ofproto_v1_3.OFP_VERSION,
+                        ofproto_v1_3.OFPT_BARRIER_REQUEST,
+                        ofproto_v1_3.OFP_HEADER_SIZE, 4), str(buf))
+        eq_(range(1, 5), sorted(dp.requests.keys()))
+        ok_(not batch.future.ready())
+
+        dp.socket.data = _barrier_reply(4)
+        dp._recv_loop()
+        eq_([], batch.future.get(block=False))
+        eq_({}, dp.requests)
+
+    def test_flow_batch_errors(self):
+        dp = self._datapath('')
+        batch = self._flow_batch(dp, 3)
+        dp.socket.data = (_error_msg(2, ofproto_v1_3.OFPET_FLOW_MOD_FAILED,
+                                     ofproto_v1_3.OFPFMFC_TABLES_FULL) +
+                          _barrier_reply(4))
+        dp._recv_loop()
+
+        errors = batch.future.get(block=False)
+        eq_([2], [msg.xid for msg in errors])
+        eq_(ofproto_v1_3.OFPFMFC_TABLES_FULL, errors[0].code)
+        eq_({}, dp.requests)
+
+    def test_flow_batch_barrier_error(self):
+        dp = self._datapath('')
+        batch = self._flow_batch(dp, 3)
+        dp.socket.data = _error_msg(4, ofproto_v1_3.OFPET_BAD_REQUEST,
+                                    ofproto_v1_3.OFPBRC_BAD_TYPE)
+        dp._recv_loop()
+
+        errors = batch.future.get(block=False)
+        eq_([4], [msg.xid for msg in errors])
+        eq_({}, dp.requests)
+
+    def test_flow_batch_send_failure(self):
+        dp = self._datapath('')
+        dp.set_send_queue_policy(controller.SEND_QUEUE_FAIL_FAST,
+                                 maxsize=1)
+        dp.send('')
+        batch = dp.flow_batch()
+        batch.add(dp.ofproto_parser.OFPFlowMod(dp))
+        try:
+            batch.send()
+        except exception.OFPSendQueueFull:
+            pass
+        else:
+            ok_(False)
+        eq_({}, dp.requests)
+
+        # the waiters on the future see the failure, too
+        ok_(batch.future.ready())
+        try:
+            batch.future.get(block=False)
+        except exception.OFPSendQueueFull:
+            pass
+        else:
+            ok_(False)
+
+    def test_flow_batch_not_sent_on_exception(self):
+        dp = self._datapath('')
+        try:
+            with dp.flow_batch() as batch:
+                batch.add(dp.ofproto_parser.OFPFlowMod(dp))
+                raise ValueError()
+        except ValueError:
+            pass
+        eq_(0, dp.send_q.qsize())
+        eq_({}, dp.requests)
+
+    @raises(AssertionError)
+    def test_flow_batch_rejects_requests(self):
+        dp = self._datapath('')
+        dp.flow_batch().add(dp.ofproto_parser.OFPBarrierRequest(dp))
+
+    def _packet_ins(self):
+        return [ev for ev in self.brick.received
+                if isinstance(ev, ofp_event.EventOFPPacketIn)]
+
+    def _recv_packet_ins(self, dp, in_ports):
+        dp.socket.data = ''.join(_packet_in(xid, in_port)
+                                 for xid, in_port in enumerate(in_ports))
+        with mock.patch('time.time', return_value=100.0):
+            dp._recv_loop()
+        return [ev.msg.match['in_port'] for ev in self._packet_ins()]
+
+    def test_packet_in_unlimited(self):
+        dp = self._datapath('')
+        ok_(not dp.packet_in_limited)
+        eq_([1] * 100, self._recv_packet_ins(dp, [1] * 100))
+        stats = dp.get_packet_in_stats()
+        eq_((0, {}), (stats['dropped'], stats['port_dropped']))
+
+    def test_packet_in_limit(self):
+        dp = self._datapath('')
+        with mock.patch('time.time', return_value=100.0):
+            dp.set_packet_in_limit(rate=10, burst=5)
+        eq_([1] * 5, self._recv_packet_ins(dp, [1] * 8))
+        stats = dp.get_packet_in_stats()
+        eq_((3, {}), (stats['dropped'], stats['port_dropped']))
+
+    def test_packet_in_port_limit(self):
+        # a flooding port doesn't use up the tokens of the other ports
+        dp = self._datapath('')
+        with mock.patch('time.time', return_value=100.0):
+            dp.set_packet_in_limit(rate=10, port_rate=3)
+        in_ports = [1] * 20 + [2, 3, 2, 3]
+        eq_([1] * 3 + [2, 3, 2, 3], self._recv_packet_ins(dp, in_ports))
+        stats = dp.get_packet_in_stats()
+        eq_((17, {1: 17}), (stats['dropped'], stats['port_dropped']))
+
+    def test_packet_in_limit_conf(self):
+        controller.CONF.set_override('ofp_packet_in_port_rate', 2)
+        try:
+            dp = self._datapath('')
+        finally:
+            controller.CONF.clear_override('ofp_packet_in_port_rate')
+        ok_(dp.packet_in_limited)
+        eq_(None, dp.packet_in_bucket)
+        eq_(2, dp.packet_in_port_rate)
+
+    def test_packet_in_coalesce(self):
+        dp = self._datapath('')
+        dp.set_packet_in_coalesce_window(1)
+        ok_(dp.packet_in_filtered)
+        with mock.patch.object(controller.hub, 'spawn'):
+            eq_([1, 2], self._recv_packet_ins(dp, [1, 1, 2, 1, 2]))
+        stats = dp.get_packet_in_stats()
+        eq_((3, 2), (stats['coalesced'], stats['coalesce_misses']))
+
+        dp.set_packet_in_coalesce_window(0)
+        ok_(not dp.packet_in_filtered)
+
+    def test_flow_mod_cache(self):
+        dp = self._datapath('')
+        dp.set_flow_mod_cache_size(10)
+        parser = dp.ofproto_parser
+        for _i in range(3):
+            dp.send_msg(parser.OFPFlowMod(dp, match=parser.OFPMatch()))
+        eq_(1, dp.send_q.qsize())
+        stats = dp.get_flow_mod_cache_stats()
+        eq_((2, 1), (stats['hits'], stats['misses']))
+
+        # the duplicates in a batch are suppressed as well
+        with dp.flow_batch() as batch:
+            batch.add(parser.OFPFlowMod(dp, match=parser.OFPMatch()))
+            batch.add(parser.OFPFlowMod(dp, match=parser.OFPMatch(),
+                                        priority=2))
+        eq_(2, len(batch.xids))
+
+    def test_flow_mod_cache_error(self):
+        dp = self._datapath('')
+        dp.set_flow_mod_cache_size(10)
+        dp.xid = 0
+        parser = dp.ofproto_parser
+        dp.send_msg(parser.OFPFlowMod(dp, match=parser.OFPMatch()))
+        eq_(1, dp.send_q.qsize())
+
+        # the switch rejects the flow mod
+        dp.socket.data = _error_msg(1, ofproto_v1_3.OFPET_FLOW_MOD_FAILED,
+                                    ofproto_v1_3.OFPFMFC_TABLES_FULL)
+        dp._recv_loop()
+        eq_(0, dp.get_flow_mod_cache_stats()['size'])
+
+        # so the same flow mod is sent again
+        dp.send_msg(parser.OFPFlowMod(dp, match=parser.OFPMatch()))
+        eq_(2, dp.send_q.qsize())
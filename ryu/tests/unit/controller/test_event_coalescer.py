@@ -0,0 +1,99 @@
+# Copyright (C) 2013 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import unittest
+from nose.tools import eq_
+
+from ryu.controller import event_coalescer
+from ryu.controller.event_coalescer import ADD, DELETE, MODIFY
+
+
+class Test_EventCoalescer(unittest.TestCase):
+    """ Test case for event_coalescer.EventCoalescer
+    """
+
+    def setUp(self):
+        self.now = 1000.0
+        self.spawned = []
+        for patcher in [
+                mock.patch.object(event_coalescer.time, 'time',
+                                  side_effect=lambda: self.now),
+                mock.patch.object(event_coalescer.hub, 'spawn',
+                                  side_effect=self._spawn),
+                mock.patch.object(event_coalescer.hub, 'sleep')]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.sent = []
+        self.coalescer = event_coalescer.EventCoalescer(
+            lambda kind, obj: (kind, obj), self.sent.append, 0.5)
+
+    def _spawn(self, func, *args):
+        self.spawned.append((func, args))
+
+    def _close(self):
+        func, args = self.spawned.pop(0)
+        func(*args)
+
+    def test_no_window(self):
+        coalescer = event_coalescer.EventCoalescer(
+            lambda kind, obj: (kind, obj), self.sent.append)
+        coalescer.put(1, ADD, 'a')
+        coalescer.put(1, DELETE, 'a')
+        eq_([(ADD, 'a'), (DELETE, 'a')], self.sent)
+        eq_([], self.spawned)
+
+    def test_flap(self):
+        self.coalescer.put(1, MODIFY, 'up')
+        for _i in range(3):
+            self.coalescer.put(1, MODIFY, 'down')
+            self.coalescer.put(1, MODIFY, 'up')
+        # another key isn't affected
+        self.coalescer.put(2, ADD, 'b')
+        eq_([(MODIFY, 'up'), (ADD, 'b')], self.sent)
+
+        # back to the first state, nothing has changed
+        self._close()
+        self._close()
+        eq_(2, len(self.sent))
+        eq_({}, self.coalescer.pending)
+        eq_({'received': 8, 'sent': 2, 'coalesced': 6},
+            self.coalescer.get_stats())
+
+    def test_net_change(self):
+        self.coalescer.put(1, ADD, 'a')
+        self.coalescer.put(1, DELETE, 'a')
+        self.coalescer.put(1, ADD, 'b')
+        self.coalescer.put(1, MODIFY, 'c')
+        self._close()
+        eq_([(ADD, 'a'), (MODIFY, 'c')], self.sent)
+
+        self.coalescer.put(1, DELETE, 'c')
+        self.coalescer.put(1, ADD, 'c')
+        self.coalescer.put(1, DELETE, 'c')
+        self._close()
+        eq_([(ADD, 'a'), (MODIFY, 'c'), (DELETE, 'c')], self.sent)
+
+    def test_deleted_then_added(self):
+        self.coalescer.put(1, DELETE, 'a')
+        self.coalescer.put(1, ADD, 'a')
+        self._close()
+        eq_([(DELETE, 'a'), (ADD, 'a')], self.sent)
+
+    def test_state(self):
+        self.coalescer.put(1, MODIFY, 'port', 'up')
+        self.coalescer.put(1, MODIFY, 'port', 'down')
+        self._close()
+        eq_([(MODIFY, 'port'), (MODIFY, 'port')], self.sent)
@@ -0,0 +1,188 @@
+# Copyright (C) 2013 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import unittest
+from nose.tools import eq_, ok_
+
+from ryu.controller import flow_mod_cache
+from ryu.ofproto import ofproto_v1_0
+from ryu.ofproto import ofproto_v1_0_parser
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_3_parser
+
+
+class _Datapath(object):
+    def __init__(self, ofproto, ofproto_parser):
+        self.ofproto = ofproto
+        self.ofproto_parser = ofproto_parser
+        self.xid = 0
+
+    def set_xid(self, msg):
+        self.xid += 1
+        msg.set_xid(self.xid)
+
+
+class Test_FlowModCache(unittest.TestCase):
+    """ Test case for flow_mod_cache.FlowModCache
+    """
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch.object(flow_mod_cache.time, 'time',
+                                    side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.dp = _Datapath(ofproto_v1_3, ofproto_v1_3_parser)
+        self.cache = flow_mod_cache.FlowModCache(self.dp, 4)
+
+    def _serialize(self, msg):
+        self.dp.set_xid(msg)
+        msg.serialize()
+        return msg
+
+    def _flow_mod(self, eth_dst='00:00:00:00:00:01', out_port=1,
+                  priority=1, table_id=0, **kwargs):
+        parser = self.dp.ofproto_parser
+        match = parser.OFPMatch(eth_dst=eth_dst)
+        actions = [parser.OFPActionOutput(out_port)]
+        inst = [parser.OFPInstructionActions(
+            ofproto_v1_3.OFPIT_APPLY_ACTIONS, actions)]
+        return self._serialize(parser.OFPFlowMod(
+            self.dp, priority=priority, table_id=table_id, match=match,
+            instructions=inst, **kwargs))
+
+    def _suppress(self, **kwargs):
+        return self.cache.suppress(self._flow_mod(**kwargs))
+
+    def _counts(self):
+        stats = self.cache.get_stats()
+        return (stats['hits'], stats['misses'], stats['size'])
+
+    def test_duplicate(self):
+        ok_(not self._suppress())
+        ok_(self._suppress())
+        ok_(self._suppress())
+        eq_((2, 1, 1), self._counts())
+
+    def test_different_flow_mods(self):
+        ok_(not self._suppress())
+        ok_(not self._suppress(eth_dst='00:00:00:00:00:02'))
+        ok_(not self._suppress(priority=2))
+        ok_(not self._suppress(table_id=1))
+        eq_((0, 4, 4), self._counts())
+
+    def test_changed_actions(self):
+        ok_(not self._suppress())
+        ok_(not self._suppress(out_port=2))
+        # the flow entry has been overwritten
+        ok_(not self._suppress())
+        ok_(self._suppress())
+        eq_((1, 3, 1), self._counts())
+
+    def test_lru(self):
+        macs = ['00:00:00:00:00:0%d' % i for i in range(6)]
+        for mac in macs[:4]:
+            ok_(not self._suppress(eth_dst=mac))
+        ok_(self._suppress(eth_dst=macs[0]))
+        ok_(not self._suppress(eth_dst=macs[4]))
+        ok_(self._suppress(eth_dst=macs[0]))
+        ok_(not self._suppress(eth_dst=macs[1]))
+        eq_(2, self.cache.get_stats()['evictions'])
+
+        self.cache.resize(0)
+        eq_(0, self.cache.get_stats()['size'])
+
+    def test_flow_removed(self):
+        ok_(not self._suppress())
+        ok_(not self._suppress(priority=2))
+        removed = mock.Mock(table_id=0, priority=1)
+        self.cache.flow_removed(removed)
+        ok_(not self._suppress())
+        ok_(self._suppress(priority=2))
+        eq_(1, self.cache.get_stats()['invalidations'])
+
+    def test_error(self):
+        msg = self._flow_mod()
+        ok_(not self.cache.suppress(msg))
+        ok_(not self._suppress(priority=2))
+        # an error of another message doesn't matter
+        self.cache.error(mock.Mock(xid=msg.xid + 100))
+        eq_(2, self.cache.get_stats()['size'])
+
+        self.cache.error(mock.Mock(xid=msg.xid))
+        ok_(not self._suppress())
+        ok_(self._suppress(priority=2))
+        eq_(1, self.cache.get_stats()['invalidations'])
+
+    def test_delete(self):
+        ok_(not self._suppress())
+        ok_(not self._suppress(priority=2))
+        self._suppress(priority=2, command=ofproto_v1_3.OFPFC_DELETE_STRICT)
+        ok_(self._suppress())
+        ok_(not self._suppress(priority=2))
+
+        self._suppress(command=ofproto_v1_3.OFPFC_DELETE)
+        eq_(0, self.cache.get_stats()['size'])
+
+    def test_group_delete(self):
+        ok_(not self._suppress())
+        parser = self.dp.ofproto_parser
+        self.cache.suppress(self._serialize(parser.OFPGroupMod(
+            self.dp, ofproto_v1_3.OFPGC_ADD, ofproto_v1_3.OFPGT_ALL, 1, [])))
+        ok_(self._suppress())
+        self.cache.suppress(self._serialize(parser.OFPGroupMod(
+            self.dp, ofproto_v1_3.OFPGC_DELETE, ofproto_v1_3.OFPGT_ALL, 1,
+            [])))
+        ok_(not self._suppress())
+
+    def test_timeouts(self):
+        ok_(not self._suppress(idle_timeout=10))
+        ok_(not self._suppress(idle_timeout=10))
+        eq_(0, self.cache.get_stats()['size'])
+
+        flags = ofproto_v1_3.OFPFF_SEND_FLOW_REM
+        ok_(not self._suppress(idle_timeout=10, flags=flags))
+        ok_(self._suppress(idle_timeout=10, flags=flags))
+
+        ok_(not self._suppress(priority=2, hard_timeout=10))
+        self.now += 9
+        ok_(self._suppress(priority=2, hard_timeout=10))
+        self.now += 1
+        ok_(not self._suppress(priority=2, hard_timeout=10))
+
+    def test_buffered(self):
+        ok_(not self._suppress())
+        ok_(not self._suppress(buffer_id=1))
+        ok_(not self._suppress(buffer_id=1))
+
+    def test_of10(self):
+        self.dp = _Datapath(ofproto_v1_0, ofproto_v1_0_parser)
+        self.cache = flow_mod_cache.FlowModCache(self.dp, 4)
+
+        def _flow_mod(dl_dst, priority=1):
+            parser = self.dp.ofproto_parser
+            match = parser.OFPMatch(ofproto_v1_0.OFPFW_ALL &
+                                    ~ofproto_v1_0.OFPFW_DL_DST,
+                                    0, 0, dl_dst, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+            return self._serialize(parser.OFPFlowMod(
+                self.dp, match, 0, ofproto_v1_0.OFPFC_ADD,
+                priority=priority, actions=[parser.OFPActionOutput(1)]))
+
+        ok_(not self.cache.suppress(_flow_mod('\x00' * 5 + '\x01')))
+        ok_(not self.cache.suppress(_flow_mod('\x00' * 5 + '\x02')))
+        ok_(self.cache.suppress(_flow_mod('\x00' * 5 + '\x01')))
+        self.cache.flow_removed(mock.Mock(spec=['priority'], priority=1))
+        ok_(not self.cache.suppress(_flow_mod('\x00' * 5 + '\x02')))
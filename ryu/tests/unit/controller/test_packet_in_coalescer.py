@@ -0,0 +1,198 @@
+# Copyright (C) 2013 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import unittest
+from nose.tools import eq_, ok_
+
+from ryu import exception
+from ryu.controller import packet_in_coalescer
+from ryu.lib.packet import ethernet
+from ryu.lib.packet import ipv4
+from ryu.lib.packet import ipv6
+from ryu.lib.packet import packet
+from ryu.lib.packet import tcp
+from ryu.lib.packet import udp
+from ryu.lib.packet import vlan
+from ryu.ofproto import ether
+from ryu.ofproto import inet
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_3_parser
+
+
+def _packet(*protocols):
+    pkt = packet.Packet()
+    for p in protocols:
+        pkt.add_protocol(p)
+    pkt.serialize()
+    return str(pkt.data)
+
+
+def _tcp4(src_port, payload='', dst='10.0.0.2'):
+    return _packet(ethernet.ethernet('00:00:00:00:00:02', '00:00:00:00:00:01',
+                                     ether.ETH_TYPE_IP),
+                   ipv4.ipv4(proto=inet.IPPROTO_TCP, src='10.0.0.1',
+                             dst=dst),
+                   tcp.tcp(src_port=src_port, dst_port=80), payload)
+
+
+class _Datapath(object):
+    ofproto = ofproto_v1_3
+    ofproto_parser = ofproto_v1_3_parser
+
+    def __init__(self):
+        self.is_active = True
+        self.sent = []
+        self.failed = []
+
+    def send_msg(self, msg):
+        self.sent.append(msg)
+
+    def _send_q_failed(self, exc, what):
+        self.failed.append(what)
+
+
+class _PacketIn(object):
+    def __init__(self, data, reason=ofproto_v1_3.OFPR_NO_MATCH,
+                 buffer_id=ofproto_v1_3.OFP_NO_BUFFER):
+        self.data = data
+        self.reason = reason
+        self.buffer_id = buffer_id
+
+
+class Test_flow_key(unittest.TestCase):
+    """ Test case for packet_in_coalescer.flow_key
+    """
+
+    def test_tcp4(self):
+        key = packet_in_coalescer.flow_key(_tcp4(1000))
+        eq_(key, packet_in_coalescer.flow_key(_tcp4(1000, 'payload')))
+        ok_(key != packet_in_coalescer.flow_key(_tcp4(1001)))
+        ok_(key != packet_in_coalescer.flow_key(_tcp4(1000,
+                                                      dst='10.0.0.3')))
+
+    def test_vlan_udp6(self):
+        def _udp6(vid, src_port):
+            return _packet(
+                ethernet.ethernet('00:00:00:00:00:02', '00:00:00:00:00:01',
+                                  ether.ETH_TYPE_8021Q),
+                vlan.vlan(vid=vid, ethertype=ether.ETH_TYPE_IPV6),
+                ipv6.ipv6(nxt=inet.IPPROTO_UDP, src='::1', dst='::2'),
+                udp.udp(src_port=src_port, dst_port=53))
+
+        key = packet_in_coalescer.flow_key(_udp6(10, 1000))
+        eq_(18 + 1 + 32 + 4, len(key))
+        ok_(key != packet_in_coalescer.flow_key(_udp6(11, 1000)))
+        ok_(key != packet_in_coalescer.flow_key(_udp6(10, 1001)))
+
+    def test_l2(self):
+        data = _packet(ethernet.ethernet('00:00:00:00:00:02',
+                                         '00:00:00:00:00:01', 0x1234),
+                       'x' * 50)
+        eq_(data[:14], packet_in_coalescer.flow_key(data))
+
+    def test_truncated(self):
+        eq_(None, packet_in_coalescer.flow_key(_tcp4(1000)[:20]))
+
+
+class Test_PacketInCoalescer(unittest.TestCase):
+    """ Test case for packet_in_coalescer.PacketInCoalescer
+    """
+
+    def setUp(self):
+        self.now = 1000.0
+        self.spawned = []
+        for patcher in [
+                mock.patch.object(packet_in_coalescer.time, 'time',
+                                  side_effect=lambda: self.now),
+                mock.patch.object(packet_in_coalescer.hub, 'spawn',
+                                  side_effect=self._spawn),
+                mock.patch.object(packet_in_coalescer.hub, 'sleep')]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.dp = _Datapath()
+        self.coalescer = packet_in_coalescer.PacketInCoalescer(self.dp, 0.1)
+
+    def _spawn(self, func, *args):
+        self.spawned.append((func, args))
+
+    def _hold(self, data, in_port=1, **kwargs):
+        return self.coalescer.hold(_PacketIn(data, **kwargs), in_port)
+
+    def test_coalesce(self):
+        ok_(not self._hold(_tcp4(1000)))
+        ok_(not self._hold(_tcp4(1001)))
+        ok_(not self._hold(_tcp4(1000), in_port=2))
+        ok_(self._hold(_tcp4(1000, 'a')))
+        ok_(self._hold(_tcp4(1000, 'b')))
+        # packet-ins not caused by a table miss are never held
+        ok_(not self._hold(_tcp4(1000),
+                           reason=ofproto_v1_3.OFPR_ACTION))
+        eq_(1, len(self.spawned))
+
+        # the held ones are returned to the flow table
+        func, args = self.spawned[0]
+        func(*args)
+        eq_(2, len(self.dp.sent))
+        for out, payload in zip(self.dp.sent, ['a', 'b']):
+            eq_(1, out.in_port)
+            eq_(_tcp4(1000, payload), out.data)
+            eq_(ofproto_v1_3.OFPP_TABLE, out.actions[0].port)
+
+        eq_({'coalesced': 2, 'coalesce_misses': 3, 'coalesce_released': 2,
+             'coalesce_dropped': 0}, self.coalescer.get_stats())
+
+    def test_buffered(self):
+        self._hold(_tcp4(1000))
+        self._hold(_tcp4(1000), buffer_id=5)
+        func, args = self.spawned[0]
+        func(*args)
+        eq_(5, self.dp.sent[0].buffer_id)
+        eq_(None, self.dp.sent[0].data)
+
+    def test_window(self):
+        ok_(not self._hold(_tcp4(1000)))
+        self.now += 0.05
+        ok_(self._hold(_tcp4(1000)))
+        self.now += 0.06
+        ok_(not self._hold(_tcp4(1000)))
+        eq_(1, len(self.coalescer.flows))
+
+    def test_max_held(self):
+        self._hold(_tcp4(1000))
+        for _i in range(packet_in_coalescer.MAX_HELD + 3):
+            ok_(self._hold(_tcp4(1000)))
+        eq_(3, self.coalescer.get_stats()['coalesce_dropped'])
+        func, args = self.spawned[0]
+        func(*args)
+        eq_(packet_in_coalescer.MAX_HELD, len(self.dp.sent))
+
+    def test_inactive_datapath(self):
+        self._hold(_tcp4(1000))
+        self._hold(_tcp4(1000))
+        self.dp.is_active = False
+        func, args = self.spawned[0]
+        func(*args)
+        eq_([], self.dp.sent)
+
+    def test_send_queue_full(self):
+        self._hold(_tcp4(1000))
+        self._hold(_tcp4(1000))
+        self._hold(_tcp4(1000))
+        self.dp.send_msg = mock.Mock(
+            side_effect=exception.OFPSendQueueFull(dpid=1))
+        func, args = self.spawned[0]
+        func(*args)
+        eq_(2, len(self.dp.failed))
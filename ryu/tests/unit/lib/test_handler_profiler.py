@@ -0,0 +1,73 @@
+# Copyright (C) 2013 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import unittest
+from nose.tools import eq_, ok_
+
+from ryu.lib import handler_profiler
+
+
+class _Event(object):
+    pass
+
+
+class Test_HandlerProfiler(unittest.TestCase):
+    """ Test case for ryu.lib.handler_profiler
+    """
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch.object(handler_profiler.time, 'time',
+                                    side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.profiler = handler_profiler.HandlerProfiler('app', 0.5)
+
+    def _handler(self, latency):
+        def packet_in_handler(ev):
+            self.now += latency
+        return packet_in_handler
+
+    def test_call(self):
+        for latency in (0.00005, 0.005, 0.005, 2.0):
+            self.profiler.call(self._handler(latency), _Event())
+        stats = self.profiler.to_dict()['handlers']['packet_in_handler']
+        eq_(4, stats['count'])
+        ok_(abs(stats['total'] - 2.01005) < 1e-6)
+        eq_(2.0, stats['max'])
+        eq_([1, 0, 2, 0, 0, 1], stats['histogram'])
+
+    def test_slow_handler(self):
+        with mock.patch.object(handler_profiler.LOG, 'warning') as warning:
+            self.profiler.call(self._handler(0.1), _Event())
+            eq_(0, warning.call_count)
+            self.profiler.call(self._handler(1.0), _Event())
+            eq_(1, warning.call_count)
+
+    def test_call_raise(self):
+        def handler(ev):
+            raise ValueError()
+        self.assertRaises(ValueError, self.profiler.call, handler, _Event())
+        eq_(1, self.profiler.to_dict()['handlers']['handler']['count'])
+
+    def test_queue_wait(self):
+        self.profiler.queue_wait(_Event(), self.now - 0.05)
+        stats = self.profiler.to_dict()['queue_waits']['_Event']
+        eq_(1, stats['count'])
+        eq_([0, 0, 0, 1, 0, 0], stats['histogram'])
+
+        self.profiler.reset()
+        eq_({}, self.profiler.to_dict()['queue_waits'])
@@ -237,3 +237,35 @@ class Test_hub(unittest.TestCase):
         # allow multiple sets unlike eventlet Event
         ev.set()
         ev.set()
+
+    def test_async_result1(self):
+        def _child(result):
+            hub.sleep(0.5)
+            result.set(1)
+
+        result = hub.AsyncResult()
+        with hub.Timeout(2):
+            hub.spawn(_child, result)
+            assert not result.ready()
+            assert result.get() == 1
+        assert result.ready()
+        assert result.successful()
+
+    @raises(MyException)
+    def test_async_result2(self):
+        result = hub.AsyncResult()
+        hub.call_after(0.5, result.set_exception, MyException())
+        with hub.Timeout(2):
+            result.get()
+
+    @raises(hub.Timeout)
+    def test_async_result3(self):
+        result = hub.AsyncResult()
+        result.get(timeout=0.1)
+
+    def test_call_after_cancel(self):
+        result = []
+        timer = hub.call_after(0.1, result.append, 1)
+        timer.cancel()
+        hub.sleep(0.5)
+        assert len(result) == 0
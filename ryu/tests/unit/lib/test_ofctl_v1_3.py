@@ -15,10 +15,12 @@
 
 # vim: tabstop=4 shiftwidth=4 softtabstop=4
 
+import mock
 import unittest
 import logging
 from nose.tools import *
 
+from ryu.lib import hub
 from ryu.lib import ofctl_v1_3
 from ryu.ofproto import ofproto_v1_3, ofproto_v1_3_parser
 from ryu.ofproto.ofproto_v1_3_parser import OFPActionPopMpls
@@ -29,6 +31,15 @@ LOG = logging.getLogger('test_ofctl_v1_3')
 class _Datapath(object):
     ofproto = ofproto_v1_3
     ofproto_parser = ofproto_v1_3_parser
+    id = 1
+
+    def __init__(self, replies=None):
+        self.replies = replies
+
+    def send_request(self, msg, timeout=None):
+        future = hub.AsyncResult()
+        future.set(self.replies)
+        return future
 
 
 class Test_ofctl_v1_3(unittest.TestCase):
@@ -56,3 +67,13 @@ class Test_ofctl_v1_3(unittest.TestCase):
         act = insts.actions[0]
         ok_(isinstance(act, OFPActionPopMpls))
         eq_(act.ethertype, 0x0800)
+
+    def test_get_desc_stats_waiters(self):
+        body = mock.Mock(mfr_desc='mfr', hw_desc='hw', sw_desc='sw',
+                         serial_num='1', dp_desc='dp')
+        dp = _Datapath([mock.Mock(body=body)])
+
+        # the waiters of the older callers are accepted and ignored
+        desc = ofctl_v1_3.get_desc_stats(dp, {})
+        eq_(desc, ofctl_v1_3.get_desc_stats(dp))
+        eq_('mfr', desc['1']['mfr_desc'])
@@ -98,3 +98,20 @@ class Test_packet_in_filter(unittest.TestCase):
                                                  data=truncated_data)
         ev = ofp_event.EventOFPPacketIn(pkt_in)
         ok_(not self.app.packet_in_handler(ev))
+
+    def test_pkt_in_filter_shared_packet(self):
+        datapath = _Datapath()
+        e = ethernet.ethernet(mac.BROADCAST_STR,
+                              mac.BROADCAST_STR,
+                              ether.ETH_TYPE_8021Q)
+        v = vlan.vlan()
+        pkt = (e / v)
+        pkt.serialize()
+        pkt_in = ofproto_v1_3_parser.OFPPacketIn(datapath,
+                                                 data=buffer(pkt.data))
+        ev = ofp_event.EventOFPPacketIn(pkt_in)
+        ok_(self.app.packet_in_handler(ev))
+        # the packet decoded by the filter is reused
+        decoded = ev.packet
+        ok_(vlan.vlan in decoded)
+        ok_(decoded is ev.packet)
@@ -0,0 +1,157 @@
+# Copyright (C) 2013 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import unittest
+from nose.plugins.skip import SkipTest
+from nose.tools import eq_, ok_
+
+from ryu.lib import ofstats_array
+from ryu.ofproto import ofproto_parser
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_3_parser
+
+PACKET_DATA_DIR = os.path.join(os.path.dirname(__file__),
+                               os.pardir, os.pardir, 'packet_data', 'of13')
+
+
+def _parse(name):
+    buf = open(os.path.join(PACKET_DATA_DIR, name), 'rb').read()
+    (version, msg_type, msg_len, xid) = ofproto_parser.header(buf)
+    return ofproto_parser.msg(None, version, msg_type, msg_len, xid, buf)
+
+
+def _port_stats_reply(entries):
+    # entries: [(port_no, tx_bytes, duration_sec, duration_nsec), ...]
+    body = ''.join(ofproto_v1_3.OFP_PORT_STATS_STRUCT.pack(
+        port_no, 0, 0, 0, tx_bytes, 0, 0, 0, 0, 0, 0, 0, 0,
+        duration_sec, duration_nsec)
+        for port_no, tx_bytes, duration_sec, duration_nsec in entries)
+    msg_len = ofproto_v1_3.OFP_MULTIPART_REPLY_SIZE + len(body)
+    buf = (ofproto_v1_3.OFP_HEADER_STRUCT.pack(
+        ofproto_v1_3.OFP_VERSION, ofproto_v1_3.OFPT_MULTIPART_REPLY,
+        msg_len, 0) +
+        ofproto_v1_3.OFP_MULTIPART_REPLY_STRUCT.pack(
+            ofproto_v1_3.OFPMP_PORT_STATS, 0) +
+        body)
+    return ofproto_parser.msg(None, ofproto_v1_3.OFP_VERSION,
+                              ofproto_v1_3.OFPT_MULTIPART_REPLY, msg_len, 0,
+                              buf)
+
+
+def _flow_stats_reply(entries):
+    # entries: [(in_port, packet_count, duration_sec), ...]
+    # the flows differ only in their match
+    body = ''
+    for in_port, packet_count, duration_sec in entries:
+        match = ofproto_v1_3_parser.OFPMatch(in_port=in_port)
+        buf = bytearray()
+        match_len = match.serialize(buf, 0)
+        length = ofproto_v1_3.OFP_FLOW_STATS_0_SIZE + match_len
+        body += ofproto_v1_3.OFP_FLOW_STATS_0_STRUCT.pack(
+            length, 0, duration_sec, 0, 100, 0, 0, 0, 0,
+            packet_count, 0) + str(buf)
+    msg_len = ofproto_v1_3.OFP_MULTIPART_REPLY_SIZE + len(body)
+    buf = (ofproto_v1_3.OFP_HEADER_STRUCT.pack(
+        ofproto_v1_3.OFP_VERSION, ofproto_v1_3.OFPT_MULTIPART_REPLY,
+        msg_len, 0) +
+        ofproto_v1_3.OFP_MULTIPART_REPLY_STRUCT.pack(
+            ofproto_v1_3.OFPMP_FLOW, 0) +
+        body)
+    return ofproto_parser.msg(None, ofproto_v1_3.OFP_VERSION,
+                              ofproto_v1_3.OFPT_MULTIPART_REPLY, msg_len, 0,
+                              buf)
+
+
+class Test_ofstats_array(unittest.TestCase):
+    """ Test case for ryu.lib.ofstats_array
+    """
+
+    def setUp(self):
+        if ofstats_array.np is None:
+            raise SkipTest('numpy is not installed')
+
+    def _check(self, name, fields):
+        msg = _parse(name)
+        a = ofstats_array.to_array(msg)
+        eq_(len(msg.body), len(a))
+        for stats, row in zip(msg.body, a):
+            for field in fields:
+                eq_(getattr(stats, field), row[field])
+
+    def test_port_stats(self):
+        self._check('4-30-ofp_port_stats_reply.packet',
+                    ofproto_v1_3_parser.OFPPortStats._fields)
+
+    def test_queue_stats(self):
+        self._check('4-38-ofp_queue_stats_reply.packet',
+                    ofproto_v1_3_parser.OFPQueueStats._fields)
+
+    def test_table_stats(self):
+        self._check('4-28-ofp_table_stats_reply.packet',
+                    ofproto_v1_3_parser.OFPTableStats._fields)
+
+    def test_flow_stats(self):
+        self._check('4-12-ofp_flow_stats_reply.packet',
+                    ofstats_array._FLOW_STATS_0_FIELDS)
+
+    def test_from_replies(self):
+        msg = _parse('4-30-ofp_port_stats_reply.packet')
+        a = ofstats_array.from_replies({2: [msg], 1: [msg, msg]})
+        eq_(3 * len(msg.body), len(a))
+        eq_([1] * 2 * len(msg.body) + [2] * len(msg.body),
+            list(a['dpid']))
+        eq_([s.port_no for s in msg.body] * 3, list(a['port_no']))
+
+    def test_rate(self):
+        prev = ofstats_array.from_replies({1: [_port_stats_reply([
+            (1, 1000, 10, 0),
+            (2, 2 ** 64 - 100, 10, 0),
+            (3, 0, 10, 0),
+        ])]})
+        cur = ofstats_array.from_replies({1: [_port_stats_reply([
+            (4, 0, 1, 0),
+            (2, 100, 12, 0),
+            (1, 3000, 10, 500000000),
+            (3, 0, 1, 0),
+        ])]})
+        prev, cur = ofstats_array.align(prev, cur, ofstats_array.PORT_KEYS)
+        eq_([2, 1, 3], list(prev['port_no']))
+        eq_([2, 1, 3], list(cur['port_no']))
+        eq_([200, 2000, 0],
+            list(ofstats_array.delta(prev, cur, 'tx_bytes')))
+
+        r = ofstats_array.rate(prev, cur, 'tx_bytes')
+        eq_([100.0, 4000.0], list(r[:2]))
+        # port 3 has been recreated
+        ok_(ofstats_array.np.isnan(r[2]))
+
+        eq_([100.0, 1000.0, 0.0],
+            list(ofstats_array.rate(prev, cur, 'tx_bytes', 2)))
+
+    def test_flow_keys(self):
+        prev = ofstats_array.from_replies({1: [_flow_stats_reply([
+            (1, 10, 10),
+            (2, 20, 10),
+        ])]})
+        cur = ofstats_array.from_replies({1: [_flow_stats_reply([
+            (2, 60, 12),
+            (1, 30, 12),
+        ])]})
+        eq_(2, len(set(prev['match_hash'])))
+        prev, cur = ofstats_array.align(prev, cur, ofstats_array.FLOW_KEYS)
+        eq_(list(prev['match_hash']), list(cur['match_hash']))
+        eq_([20, 10], list(prev['packet_count']))
+        eq_([40, 20], list(ofstats_array.delta(prev, cur, 'packet_count')))
@@ -18,7 +18,7 @@
 
 import base64
 import unittest
-from nose.tools import eq_
+from nose.tools import eq_, ok_
 
 from ryu.lib import stringify
 
@@ -31,6 +31,16 @@ class C1(stringify.StringifyMixin):
         self.c = c
 
 
+class C2(stringify.StringifyMixin):
+    __slots__ = ('a', '_b', 'c')
+
+    def __init__(self, a, c=None):
+        self.a = a
+        self._b = 'B'
+        if c is not None:
+            self.c = c
+
+
 class Test_stringify(unittest.TestCase):
     """ Test case for ryu.lib.stringify
     """
@@ -68,3 +78,15 @@ class Test_stringify(unittest.TestCase):
         eq_(c.__class__, c2.__class__)
         eq_(c.__dict__, c2.__dict__)
         eq_(j, c.to_jsondict(encode_string=my_encode))
+
+    def test_jsondict_slots(self):
+        j = {'C2': {'a': 'QUFB', 'c': 'Q0ND'}}
+        c = C2(a='AAA', c='CCC')
+        ok_(not hasattr(c, '__dict__'))
+        eq_(j, c.to_jsondict())
+        c2 = C2.from_jsondict(j['C2'])
+        eq_(('AAA', 'CCC'), (c2.a, c2.c))
+        eq_("C2(a='AAA',c='CCC')", str(c))
+
+        # an unset slot isn't an attribute
+        eq_({'C2': {'a': 'QUFB'}}, C2(a='AAA').to_jsondict())
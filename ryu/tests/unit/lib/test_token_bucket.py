@@ -0,0 +1,58 @@
+# Copyright (C) 2013 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import unittest
+from nose.tools import eq_, ok_
+
+from ryu.lib import token_bucket
+
+
+class Test_TokenBucket(unittest.TestCase):
+    """ Test case for ryu.lib.token_bucket
+    """
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch.object(token_bucket.time, 'time',
+                                    side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _consume(self, bucket, count):
+        return sum(bucket.consume() for _i in range(count))
+
+    def test_burst(self):
+        bucket = token_bucket.TokenBucket(10, 4)
+        eq_(4, self._consume(bucket, 10))
+
+    def test_default_burst(self):
+        bucket = token_bucket.TokenBucket(10)
+        eq_(10, self._consume(bucket, 20))
+
+    def test_refill(self):
+        bucket = token_bucket.TokenBucket(10, 4)
+        eq_(4, self._consume(bucket, 4))
+        self.now += 0.25
+        eq_(2, self._consume(bucket, 10))
+        # never more than the burst
+        self.now += 60
+        eq_(4, self._consume(bucket, 10))
+
+    def test_consume_many(self):
+        bucket = token_bucket.TokenBucket(10)
+        ok_(bucket.consume(8))
+        ok_(not bucket.consume(3))
+        ok_(bucket.consume(2))
@@ -62,3 +62,13 @@ class TestOfprotCommon(unittest.TestCase):
                               ryu.ofproto.ofproto_v1_2_parser,
                               ryu.ofproto.ofproto_v1_3_parser,
                               ]))
+
+    def test_get_ofp_cls(self):
+        import ryu.ofproto
+        import ryu.ofproto.ofproto_v1_3
+        import ryu.ofproto.ofproto_v1_3_parser
+        version = ryu.ofproto.ofproto_v1_3.OFP_VERSION
+        eq_(ryu.ofproto.ofproto_v1_3_parser.OFPPacketIn,
+            ryu.ofproto.get_ofp_cls(version, 'OFPPacketIn'))
+        eq_(None, ryu.ofproto.get_ofp_cls(version, 'OFP_VERSION'))
+        eq_(None, ryu.ofproto.get_ofp_cls(version, 'NoSuchClass'))
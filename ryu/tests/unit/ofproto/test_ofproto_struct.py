@@ -0,0 +1,42 @@
+# Copyright (C) 2013 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from nose.tools import eq_, ok_
+
+from ryu.ofproto import ofproto_struct
+from ryu.ofproto import ofproto_v1_0
+
+
+class TestStructs(unittest.TestCase):
+    """ Test case for ryu.ofproto.ofproto_struct
+    """
+
+    def test_get_struct(self):
+        s = ofproto_struct.get_struct('!HI')
+        eq_('!HI', s.format)
+        eq_(6, s.size)
+        ok_(s is ofproto_struct.get_struct('!HI'))
+
+    def test_generate_structs(self):
+        eq_(ofproto_v1_0.OFP_MATCH_PACK_STR,
+            ofproto_v1_0.OFP_MATCH_STRUCT.format)
+        eq_(ofproto_v1_0.OFP_MATCH_SIZE, ofproto_v1_0.OFP_MATCH_STRUCT.size)
+        eq_(ofproto_v1_0.OFP_FLOW_STATS_0_PACK_STR,
+            ofproto_v1_0.OFP_FLOW_STATS_0_STRUCT.format)
+        for k, v in vars(ofproto_v1_0).items():
+            if k.endswith('_PACK_STR') and not k.startswith('_'):
+                s = getattr(ofproto_v1_0, k[:-len('_PACK_STR')] + '_STRUCT')
+                eq_(v, s.format)
@@ -0,0 +1,105 @@
+# Copyright (C) 2013 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+import os
+import unittest
+from nose.tools import eq_, ok_
+
+from ryu.ofproto import ofproto_parser
+from ryu.ofproto import ofproto_v1_3_parser
+
+PACKET_DATA_DIR = os.path.join(os.path.dirname(__file__),
+                               os.pardir, os.pardir, 'packet_data')
+
+
+def _parse(version_dir, name):
+    buf = open(os.path.join(PACKET_DATA_DIR, version_dir, name), 'rb').read()
+    (version, msg_type, msg_len, xid) = ofproto_parser.header(buf)
+    return ofproto_parser.msg(None, version, msg_type, msg_len, xid, buf)
+
+
+class TestLazyAttrs(unittest.TestCase):
+    """ Test case for the attributes decoded on first access
+    """
+
+    def _check_lazy(self, version_dir, name, attrs):
+        msg = _parse(version_dir, name)
+        for attr in attrs:
+            ok_(attr not in msg.__dict__)
+
+        jsondict = msg.to_jsondict()
+        for attr in attrs:
+            ok_(attr in msg.__dict__)
+
+        # decoding everything up front gives the same result
+        msg = _parse(version_dir, name)
+        for attr in attrs:
+            getattr(msg, attr)
+        eq_(jsondict, msg.to_jsondict())
+
+    def test_packet_in_v13(self):
+        self._check_lazy('of13', '4-4-ofp_packet_in.packet',
+                         ['match', 'data'])
+
+    def test_packet_in_v12(self):
+        self._check_lazy('of12', '3-4-ofp_packet_in.packet',
+                         ['match', 'data'])
+
+    def test_flow_removed_v13(self):
+        self._check_lazy('of13', '4-40-ofp_flow_removed.packet', ['match'])
+
+    def test_flow_removed_v12(self):
+        self._check_lazy('of12', '3-40-ofp_flow_removed.packet', ['match'])
+
+    def test_stats_reply(self):
+        self._check_lazy('of13', '4-12-ofp_flow_stats_reply.packet',
+                         ['body'])
+        self._check_lazy('of12', '3-12-ofp_flow_stats_reply.packet',
+                         ['body'])
+
+    def test_data(self):
+        msg = _parse('of13', '4-4-ofp_packet_in.packet')
+        eq_(msg.total_len, len(msg.data))
+        ok_(isinstance(msg.match, ofproto_v1_3_parser.OFPMatch))
+
+    def test_overwrite(self):
+        msg = _parse('of13', '4-4-ofp_packet_in.packet')
+        msg.data = 'overwritten'
+        eq_('overwritten', msg.data)
+        msg.to_jsondict()
+        eq_('overwritten', msg.data)
+
+    def test_attribute_error(self):
+        msg = _parse('of13', '4-4-ofp_packet_in.packet')
+        ok_(not hasattr(msg, 'no_such_attribute'))
+
+    def test_iter_body(self):
+        for name in ('4-12-ofp_flow_stats_reply.packet',
+                     '4-30-ofp_port_stats_reply.packet',
+                     '4-58-ofp_group_stats_reply.packet'):
+            msg = _parse('of13', name)
+            entries = list(msg.iter_body())
+            # iterating doesn't decode the body into the message
+            ok_('body' not in msg.__dict__)
+            eq_([e.to_jsondict() for e in msg.body],
+                [e.to_jsondict() for e in entries])
+            # and it iterates over the decoded body once it's there
+            eq_(msg.body, list(msg.iter_body()))
+
+    def test_iter_body_single_struct(self):
+        msg = _parse('of13', '4-0-ofp_desc_reply.packet')
+        eq_([msg.body], list(msg.iter_body()))
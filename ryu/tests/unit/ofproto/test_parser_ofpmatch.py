@@ -59,6 +59,10 @@ class Test_Parser_OFPMatch(unittest.TestCase):
         for k, v in match2.iteritems():
             ok_(k in d)
             eq_(d[k], v)
+        # the old API fields are parsed on the first access
+        ok_(match2._old_fields_buf is not None)
+        eq_(len(d), len(match2.fields))
+        ok_(match2._old_fields_buf is None)
 
 
 def _add_tests():
@@ -0,0 +1,83 @@
+# Copyright (C) 2013 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+import os
+import unittest
+from nose.tools import eq_, ok_, assert_raises
+
+from ryu.ofproto import ofproto_parser
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_3_parser
+
+PACKET_DATA_DIR = os.path.join(os.path.dirname(__file__),
+                               os.pardir, os.pardir, 'packet_data', 'of13')
+
+
+def _parse(name):
+    buf = open(os.path.join(PACKET_DATA_DIR, name), 'rb').read()
+    (version, msg_type, msg_len, xid) = ofproto_parser.header(buf)
+    return ofproto_parser.msg(None, version, msg_type, msg_len, xid, buf)
+
+
+class TestSlots(unittest.TestCase):
+    """ Test case for the parser classes with __slots__
+    """
+
+    def test_flow_stats(self):
+        msg = _parse('4-12-ofp_flow_stats_reply.packet')
+        for stats in msg.body:
+            ok_(not hasattr(stats, '__dict__'))
+            ok_(not hasattr(stats.match, '__dict__'))
+            # the old api isn't used
+            eq_(None, stats.match._old_wc)
+            eq_(None, stats.match._old_flow)
+            for inst in stats.instructions:
+                if isinstance(inst, ofproto_v1_3_parser.OFPInstructionActions):
+                    ok_(not hasattr(inst, '__dict__'))
+
+        stats = msg.body[0]
+        jsondict = stats.to_jsondict()['OFPFlowStats']
+        eq_(set(ofproto_v1_3_parser.OFPFlowStats.__slots__),
+            set(jsondict.keys()))
+        eq_(stats.length, jsondict['length'])
+
+    def test_port(self):
+        msg = _parse('4-54-ofp_port_desc_reply.packet')
+        for port in msg.body:
+            # __dict__ of a namedtuple is a property returning _asdict()
+            assert_raises(AttributeError, setattr, port, 'foo', 1)
+            eq_(ofproto_v1_3.OFP_PORT_SIZE, port.length)
+
+    def test_action_output(self):
+        a = ofproto_v1_3_parser.OFPActionOutput(1, 128)
+        ok_(not hasattr(a, '__dict__'))
+        eq_({'OFPActionOutput': {'type': ofproto_v1_3.OFPAT_OUTPUT,
+                                 'len': ofproto_v1_3.OFP_ACTION_OUTPUT_SIZE,
+                                 'port': 1, 'max_len': 128}},
+            a.to_jsondict())
+
+    def test_match_old_api(self):
+        match = ofproto_v1_3_parser.OFPMatch()
+        eq_(None, match._old_wc)
+        match.set_in_port(1)
+        ok_(match._old_wc is not None)
+        buf = bytearray()
+        match.serialize(buf, 0)
+        match2 = ofproto_v1_3_parser.OFPMatch.parser(str(buf), 0)
+        eq_(1, match2['in_port'])
+        # serialize_old() adds the fields only once
+        assert_raises(Exception, match.serialize, bytearray(), 0)
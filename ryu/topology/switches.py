@@ -21,6 +21,7 @@ from oslo.config import cfg
 
 from ryu.topology import event
 from ryu.base import app_manager
+from ryu.controller import event_coalescer
 from ryu.controller import ofp_event
 from ryu.controller.handler import set_ev_cls
 from ryu.controller.handler import MAIN_DISPATCHER, DEAD_DISPATCHER
@@ -392,8 +393,9 @@ class LLDPPacket(object):
         return pkt.data
 
     @staticmethod
-    def lldp_parse(data):
-        pkt = packet.Packet(data)
+    def lldp_parse(data, pkt=None):
+        if pkt is None:
+            pkt = packet.Packet(data)
         i = iter(pkt)
         eth_pkt = i.next()
         assert type(eth_pkt) == ethernet.ethernet
@@ -449,6 +451,13 @@ class Switches(app_manager.RyuApp):
         self.ports = PortDataState()  # Port class -> PortData class
         self.links = LinkState()      # Link class -> timestamp
         self.is_active = True
+        # the events of a flapping port or link are coalesced if
+        # --port-event-coalesce-window is set
+        window = CONF.port_event_coalesce_window
+        self.port_events = event_coalescer.EventCoalescer(
+            self._make_port_event, self.send_event_to_observers, window)
+        self.link_events = event_coalescer.EventCoalescer(
+            self._make_link_event, self.send_event_to_observers, window)
 
         self.link_discovery = CONF.observe_links
         if self.link_discovery:
@@ -494,6 +503,43 @@ class Switches(app_manager.RyuApp):
                 if p.port_no == port_no:
                     return p
 
+    def get_event_stats(self):
+        """
+        Return a dict of the counters of the port and link events.
+        See ryu.controller.event_coalescer.EventCoalescer.get_stats.
+        """
+        return {
+            'port': self.port_events.get_stats(),
+            'link': self.link_events.get_stats(),
+        }
+
+    _PORT_EVENTS = {
+        event_coalescer.ADD: event.EventPortAdd,
+        event_coalescer.DELETE: event.EventPortDelete,
+        event_coalescer.MODIFY: event.EventPortModify,
+    }
+
+    _LINK_EVENTS = {
+        event_coalescer.ADD: event.EventLinkAdd,
+        event_coalescer.DELETE: event.EventLinkDelete,
+    }
+
+    def _make_port_event(self, kind, port):
+        if port.dpid not in self.dps:
+            # the switch has left while the event was held
+            return None
+        return self._PORT_EVENTS[kind](port)
+
+    def _make_link_event(self, kind, link):
+        return self._LINK_EVENTS[kind](link)
+
+    def _send_port_event(self, kind, dp, ofpport):
+        port = Port(dp.id, dp.ofproto, ofpport)
+        self.port_events.put((dp.id, ofpport.port_no), kind, port, ofpport)
+
+    def _send_link_event(self, kind, link):
+        self.link_events.put(link, kind, link)
+
     def _port_added(self, port):
         lldp_data = LLDPPacket.lldp_packet(
             port.dpid, port.port_no, port.hw_addr, self.DEFAULT_TTL)
@@ -509,10 +555,10 @@ class Switches(app_manager.RyuApp):
             #           port, self.links.get_peer(port))
             return
         link = Link(port, dst)
-        self.send_event_to_observers(event.EventLinkDelete(link))
+        self._send_link_event(event_coalescer.DELETE, link)
         if rev_link_dst:
             rev_link = Link(dst, rev_link_dst)
-            self.send_event_to_observers(event.EventLinkDelete(rev_link))
+            self._send_link_event(event_coalescer.DELETE, rev_link)
         self.ports.move_front(dst)
 
     @set_ev_cls(ofp_event.EventOFPStateChange,
@@ -585,8 +631,7 @@ class Switches(app_manager.RyuApp):
             #          '(datapath id = %s, port number = %s)',
             #          dp.id, ofpport.port_no)
             self.port_state[dp.id].add(ofpport.port_no, ofpport)
-            self.send_event_to_observers(
-                event.EventPortAdd(Port(dp.id, dp.ofproto, ofpport)))
+            self._send_port_event(event_coalescer.ADD, dp, ofpport)
 
             if not self.link_discovery:
                 return
@@ -601,8 +646,7 @@ class Switches(app_manager.RyuApp):
             #          '(datapath id = %s, port number = %s)',
             #          dp.id, ofpport.port_no)
             self.port_state[dp.id].remove(ofpport.port_no)
-            self.send_event_to_observers(
-                event.EventPortDelete(Port(dp.id, dp.ofproto, ofpport)))
+            self._send_port_event(event_coalescer.DELETE, dp, ofpport)
 
             if not self.link_discovery:
                 return
@@ -619,8 +663,7 @@ class Switches(app_manager.RyuApp):
             #          '(datapath id = %s, port number = %s)',
             #          dp.id, ofpport.port_no)
             self.port_state[dp.id].modify(ofpport.port_no, ofpport)
-            self.send_event_to_observers(
-                event.EventPortModify(Port(dp.id, dp.ofproto, ofpport)))
+            self._send_port_event(event_coalescer.MODIFY, dp, ofpport)
 
             if not self.link_discovery:
                 return
@@ -645,14 +688,15 @@ class Switches(app_manager.RyuApp):
             LOG.error('cannot drop_packet. unsupported version. %x',
                       dp.ofproto.OFP_VERSION)
 
-    @set_ev_cls(ofp_event.EventOFPPacketIn, MAIN_DISPATCHER)
+    @set_ev_cls(ofp_event.EventOFPPacketIn, MAIN_DISPATCHER,
+                eth_type=ETH_TYPE_LLDP)
     def packet_in_handler(self, ev):
         if not self.link_discovery:
             return
 
         msg = ev.msg
         try:
-            src_dpid, src_port_no = LLDPPacket.lldp_parse(msg.data)
+            src_dpid, src_port_no = LLDPPacket.lldp_parse(msg.data, ev.packet)
         except LLDPPacket.LLDPUnknownFormat as e:
             # This handler can receive all the packtes which can be
             # not-LLDP packet. Ignore it silently
@@ -684,11 +728,11 @@ class Switches(app_manager.RyuApp):
         # LOG.debug("  old_peer=%s", old_peer)
         if old_peer and old_peer != dst:
             old_link = Link(src, old_peer)
-            self.send_event_to_observers(event.EventLinkDelete(old_link))
+            self._send_link_event(event_coalescer.DELETE, old_link)
 
         link = Link(src, dst)
         if not link in self.links:
-            self.send_event_to_observers(event.EventLinkAdd(link))
+            self._send_link_event(event_coalescer.ADD, link)
 
         if not self.links.update_link(src, dst):
             # reverse link is not detected yet.
@@ -773,7 +817,7 @@ class Switches(app_manager.RyuApp):
             for link in deleted:
                 self.links.link_down(link)
                 # LOG.debug('delete %s', link)
-                self.send_event_to_observers(event.EventLinkDelete(link))
+                self._send_link_event(event_coalescer.DELETE, link)
 
                 dst = link.dst
                 rev_link = Link(dst, link.src)